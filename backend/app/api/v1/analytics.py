@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_async_db
 from app import models
 from pydantic import BaseModel
 from uuid import UUID
@@ -33,23 +33,24 @@ class StatsResponse(BaseModel):
     averageRating: float
 
 @router.get("/stats", response_model=StatsResponse)
-def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
     """관리자 대시보드 통계 조회"""
-    # 전체 세션 수
-    total_sessions = db.query(func.count(models.NavigationSession.id)).scalar() or 0
-    
-    # 활성 세션 수
-    active_sessions = db.query(func.count(models.NavigationSession.id)).filter(
-        models.NavigationSession.status == models.SessionStatus.ACTIVE
-    ).scalar() or 0
-    
-    # 완료된 세션 수
-    completed_sessions = db.query(func.count(models.NavigationSession.id)).filter(
-        models.NavigationSession.status == models.SessionStatus.COMPLETED
-    ).scalar() or 0
+    # 전체 / 활성 / 완료 세션 수 (한 번의 쿼리로 집계)
+    counts = (await db.execute(
+        select(
+            func.count(models.NavigationSession.id),
+            func.count(models.NavigationSession.id).filter(
+                models.NavigationSession.status == models.SessionStatus.ACTIVE
+            ),
+            func.count(models.NavigationSession.id).filter(
+                models.NavigationSession.status == models.SessionStatus.COMPLETED
+            )
+        )
+    )).one()
+    total_sessions, active_sessions, completed_sessions = (count or 0 for count in counts)
     
     # 평균 평점 계산
-    avg_rating_result = db.query(func.avg(models.Feedback.rating)).scalar()
+    avg_rating_result = await db.scalar(select(func.avg(models.Feedback.rating)))
     average_rating = float(avg_rating_result) if avg_rating_result else 0.0
     
     return StatsResponse(
@@ -60,22 +61,24 @@ def get_stats(db: Session = Depends(get_db)):
     )
 
 @router.post("/", response_model=AnalyticsEventResponse)
-def create_analytics_event(
+async def create_analytics_event(
     event_data: AnalyticsEventCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """분석 이벤트 생성"""
     db_event = models.AnalyticsEvent(**event_data.dict())
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
     return db_event
 
 @router.get("/session/{session_id}", response_model=List[AnalyticsEventResponse])
-def get_session_events(session_id: str, db: Session = Depends(get_db)):
+async def get_session_events(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """세션별 분석 이벤트 조회"""
-    events = db.query(models.AnalyticsEvent).filter(
-        models.AnalyticsEvent.session_id == session_id
-    ).order_by(models.AnalyticsEvent.recorded_at).all()
-    return events
+    result = await db.execute(
+        select(models.AnalyticsEvent).filter(
+            models.AnalyticsEvent.session_id == session_id
+        ).order_by(models.AnalyticsEvent.recorded_at)
+    )
+    return result.scalars().all()
 
@@ -1,11 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, text
-from app.database import get_db
+from app.database import get_db, engine, DriverError, table_exists
 from app import models
 from app.schemas import user, auth
-from app.config import settings
-import psycopg2
 import logging
 import uuid
 from datetime import datetime
@@ -14,10 +11,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 def get_direct_db_connection():
-    """직접 psycopg2 연결 사용 (SQLAlchemy 우회)"""
+    """풀에서 DBAPI 연결 가져오기 (close() 시 풀에 반납)"""
     try:
-        conn = psycopg2.connect(settings.database_url)
-        return conn
+        return engine.raw_connection()
     except Exception as e:
         logger.error(f"Direct database connection failed: {e}")
         raise HTTPException(status_code=503, detail=f"데이터베이스 연결 실패: {str(e)}")
@@ -29,7 +25,7 @@ def sync_user_from_google(
     """
     Google 로그인 후 사용자 정보 동기화
     Google ID로 사용자를 찾거나 생성
-    직접 psycopg2 연결 사용 (SQLAlchemy 연결 문제 우회)
+    풀에서 가져온 DBAPI 연결로 SQL을 직접 실행
     """
     conn = None
     cursor = None
@@ -37,27 +33,18 @@ def sync_user_from_google(
     try:
         logger.info(f"사용자 동기화 시작: {user_data.email} (Google ID: {user_data.google_id})")
         
-        # 데이터베이스 연결
-        conn = get_direct_db_connection()
-        cursor = conn.cursor()
-        
-        # 테이블 존재 확인
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name = 'users'
-            );
-        """)
-        table_exists = cursor.fetchone()[0]
-        
-        if not table_exists:
+        # 테이블 존재 확인 (확인되면 프로세스 동안 캐시)
+        if not table_exists("users"):
             logger.error("users 테이블이 존재하지 않습니다.")
             raise HTTPException(
                 status_code=503, 
                 detail="데이터베이스 테이블이 초기화되지 않았습니다. 마이그레이션을 실행해주세요."
             )
         
+        # 데이터베이스 연결
+        conn = get_direct_db_connection()
+        cursor = conn.cursor()
+        
         # Google ID로 기존 사용자 찾기
         logger.debug(f"Google ID로 사용자 검색: {user_data.google_id}")
         cursor.execute(
@@ -130,7 +117,7 @@ def sync_user_from_google(
     except HTTPException:
         # HTTPException은 그대로 전달
         raise
-    except psycopg2.Error as e:
+    except DriverError as e:
         # PostgreSQL 관련 에러
         error_msg = str(e)
         logger.error(f"PostgreSQL 에러: {error_msg}")
@@ -173,7 +160,7 @@ def sync_user_from_google(
             detail=f"사용자 동기화 실패: {error_msg}"
         )
     finally:
-        # 리소스 정리
+        # 리소스 정리 (연결은 풀에 반납)
         if cursor:
             cursor.close()
         if conn:
@@ -193,17 +180,19 @@ def create_user_response(user_row):
 
 @router.get("/user/{user_id}", response_model=user.UserResponse)
 def get_user_by_id(user_id: str):
-    """사용자 ID로 조회 - 직접 psycopg2 연결 사용"""
+    """사용자 ID로 조회 - 풀에서 가져온 DBAPI 연결 사용"""
     try:
         conn = get_direct_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, email, name, google_id, avatar_url, created_at, updated_at FROM users WHERE id = %s",
-            (user_id,)
-        )
-        user_row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, email, name, google_id, avatar_url, created_at, updated_at FROM users WHERE id = %s",
+                (user_id,)
+            )
+            user_row = cursor.fetchone()
+            cursor.close()
+        finally:
+            conn.close()
         
         if not user_row:
             raise HTTPException(status_code=404, detail="User not found")
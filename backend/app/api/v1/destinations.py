@@ -5,6 +5,7 @@ from typing import List, Optional
 from app.database import get_db
 from app import models
 from app.schemas import destination
+from app.services.spatial_query import has_postgis, nearby
 
 router = APIRouter()
 
@@ -13,9 +14,12 @@ def get_destinations(
     skip: int = 0, 
     limit: int = 100,
     search: Optional[str] = Query(None, description="검색어 (이름, 주소, 설명에서 검색)"),
+    lat: Optional[float] = Query(None, description="위도 (근처 목적지 검색)"),
+    lng: Optional[float] = Query(None, description="경도 (근처 목적지 검색)"),
+    radius: float = Query(5000, description="검색 반경 (미터)", ge=0, le=50000),
     db: Session = Depends(get_db)
 ):
-    """목적지 목록 조회 (검색 기능 포함)"""
+    """목적지 목록 조회 (검색 기능 포함, 위치가 주어지면 반경 내 가까운 순)"""
     try:
         query = db.query(models.Destination).filter(
             models.Destination.is_active == True
@@ -32,6 +36,14 @@ def get_destinations(
                 )
             )
         
+        # 위치 기반 필터링: 반경 필터와 페이지네이션을 DB에서 수행
+        if lat is not None and lng is not None:
+            spatial = nearby(
+                models.Destination.latitude, models.Destination.longitude, lat, lng, radius,
+                postgis=has_postgis(db.connection())
+            )
+            query = query.filter(*spatial.where).order_by(spatial.distance)
+        
         destinations = query.offset(skip).limit(limit).all()
         return destinations
     except Exception as e:
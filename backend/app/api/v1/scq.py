@@ -1,12 +1,21 @@
 """
 SCQ Intelligence Layer API 엔드포인트
 """
-from fastapi import APIRouter, Depends, HTTPException, Body
+import base64
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
+from uuid import UUID
 from pydantic import BaseModel
+from app.config import settings
 from app.database import get_db
 from app import models
+from app.services.geo import planar_distance
+from app.services.relocalization import get_relocalization_engine, query_vector_from_frame
+from app.services.scq_inference import ModelUnavailableError, get_scq_service, reload_scq_model
+from app.services.vector_index import extract_feature_vector, get_feature_index
 
 router = APIRouter()
 
@@ -86,10 +95,93 @@ class POIRecognitionOutput(BaseModel):
     cta: Optional[List[Dict[str, str]]] = None
 
 
+# SCQ 프레임 인코딩 출력 모델
+class SCQEncodeOutput(BaseModel):
+    codes: str  # base64 인코딩된 SCQL 컨테이너 (app.scq.codec)
+    payload_bytes: int
+    height: int
+    width: int
+    num_candidates: int
+    num_codes: int
+    latent_dim: int
+    model_version: Optional[str] = None
+
+
+class SCQModelInfo(BaseModel):
+    loaded: bool
+    version: Optional[str] = None
+
+
+class SCQModelReloadInput(BaseModel):
+    version: Optional[str] = None  # None이면 SCQ_MODEL_VERSION 또는 레지스트리 CURRENT
+
+
+@router.post("/encode", response_model=SCQEncodeOutput)
+async def scq_encode_frame(request: Request):
+    """
+    카메라 프레임 SCQ 인코딩
+    
+    요청 본문은 이미지 바이트열(JPEG/PNG 등)이며, 동시 요청은 서버에서 마이크로배치로 묶여
+    한 번의 encode/quantize로 처리된다.
+    """
+    service = get_scq_service()
+    if service is None:
+        raise HTTPException(status_code=503, detail="SCQ 모델이 로드되지 않았습니다.")
+    
+    data = await request.body()
+    if not data:
+        raise HTTPException(status_code=400, detail="이미지 데이터가 비어 있습니다.")
+    
+    try:
+        encoded = await service.encode(data)
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"SCQ encode error: {str(e)}")
+    
+    return SCQEncodeOutput(
+        codes=base64.b64encode(encoded.payload).decode("ascii"),
+        payload_bytes=len(encoded.payload),
+        height=encoded.height,
+        width=encoded.width,
+        num_candidates=encoded.num_candidates,
+        num_codes=encoded.num_codes,
+        latent_dim=encoded.latent_dim,
+        model_version=encoded.model_version,
+    )
+
+
+@router.get("/model", response_model=SCQModelInfo)
+async def scq_model_info():
+    """서비스 중인 SCQ 모델 정보 (로드를 유발하지 않음)"""
+    service = get_scq_service()
+    if service is None:
+        raise HTTPException(status_code=503, detail="SCQ 모델이 설정되지 않았습니다.")
+    model, version = service.loaded_state
+    return SCQModelInfo(loaded=model is not None, version=version)
+
+
+@router.post("/model/reload", response_model=SCQModelInfo)
+async def scq_model_reload(input_data: SCQModelReloadInput = Body(default=SCQModelReloadInput())):
+    """
+    SCQ 모델 핫스왑
+    
+    새 버전을 로드한 뒤 원자적으로 교체한다. 로드 중에 들어온 요청은 이전 모델로 처리된다.
+    """
+    try:
+        version = await reload_scq_model(settings, input_data.version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]) if e.args else str(e))
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return SCQModelInfo(loaded=True, version=version)
+
+
 @router.post("/unit1/indoor-outdoor", response_model=IndoorOutdoorOutput)
 async def scq_unit1_indoor_outdoor(
-    input_data: IndoorOutdoorInput,
-    db: Session = Depends(get_db)
+    input_data: IndoorOutdoorInput
 ):
     """
     SCQ Unit #1: 실내/실외 전환 판단
@@ -165,6 +257,25 @@ async def scq_unit2_indoor_positioning(
         
         # 랜드마크 매칭 또는 기본값
         last_pose = input_data.last_known_pose or {}
+        indoor_map = input_data.indoor_map or {}
+        
+        indoor_map_id = _parse_uuid(indoor_map.get("id"))
+        if indoor_map_id is not None and input_data.camera_frame:
+            floor = indoor_map.get("floor", last_pose.get("floor"))
+            # 모델 지연 로드/추론과 인덱스 생성(동기 ORM)은 이벤트 루프 밖에서 실행
+            estimate = await run_in_threadpool(
+                _localize_from_frame, db, input_data.camera_frame, indoor_map_id, floor
+            )
+            if estimate is not None:
+                return IndoorPoseOutput(
+                    x=estimate.x,
+                    y=estimate.y,
+                    floor=estimate.floor,
+                    heading=estimate.heading if estimate.heading is not None else last_pose.get("heading", 0),
+                    confidence=estimate.confidence,
+                    relocalization_needed=estimate.confidence < 0.6,
+                    zone_id=estimate.zone_id,
+                )
         
         return IndoorPoseOutput(
             x=last_pose.get("x", 0),
@@ -180,8 +291,7 @@ async def scq_unit2_indoor_positioning(
 
 @router.post("/unit3/ar-guidance", response_model=ARActionOutput)
 async def scq_unit3_ar_guidance(
-    input_data: ARGuidanceInput,
-    db: Session = Depends(get_db)
+    input_data: ARGuidanceInput
 ):
     """
     SCQ Unit #3: 경로→AR 행동 지시
@@ -226,8 +336,7 @@ async def scq_unit3_ar_guidance(
 
 @router.post("/unit4/poi-recognition", response_model=POIRecognitionOutput)
 async def scq_unit4_poi_recognition(
-    input_data: POIRecognitionInput,
-    db: Session = Depends(get_db)
+    input_data: POIRecognitionInput
 ):
     """
     SCQ Unit #4: POI/콘텐츠 인식 & 우선순위
@@ -238,36 +347,38 @@ async def scq_unit4_poi_recognition(
         current_pose = input_data.current_pose
         top_k = input_data.top_k
         
-        # 거리 기반 필터링 및 우선순위 계산
-        scored_pois = []
+        # 카메라 프레임 특징 벡터가 있으면 POI 특징 벡터 인덱스로 시각 유사도 계산
+        visual_scores = _visual_poi_scores(input_data.camera_frame, len(poi_database))
         
-        for poi in poi_database:
-            score = poi.get("priority", 0.5)
-            
-            # 목적지 POI 우선
-            if user_goal.get("target_poi_id") == poi.get("id"):
-                score = 1.0
-            
-            # 거리 기반 보너스
-            if current_pose:
-                poi_pos = poi.get("position", {})
-                distance = _calculate_distance(
-                    current_pose.get("x", 0),
-                    current_pose.get("y", 0),
-                    poi_pos.get("x", 0),
-                    poi_pos.get("y", 0),
-                )
-                if distance < 50:
-                    score += (1 - distance / 50) * 0.3
-            
-            scored_pois.append({
-                **poi,
-                "priority": min(1.0, score),
-            })
+        # 우선순위 계산 (후보 전체를 배열 연산으로 한 번에)
+        scores = np.array([poi.get("priority", 0.5) for poi in poi_database], dtype=np.float64)
         
-        # 우선순위 정렬 및 Top-K 선택
-        scored_pois.sort(key=lambda p: p["priority"], reverse=True)
-        top_pois = scored_pois[:top_k]
+        # 시각 매칭 보너스
+        similarity = np.array(
+            [visual_scores.get(str(poi.get("id")), 0.0) for poi in poi_database], dtype=np.float64
+        )
+        scores += np.where(similarity > 0, similarity * 0.4, 0.0)
+        
+        # 목적지 POI 우선
+        target_poi_id = user_goal.get("target_poi_id")
+        scores[np.array([target_poi_id == poi.get("id") for poi in poi_database], dtype=bool)] = 1.0
+        
+        # 거리 기반 보너스
+        if current_pose and poi_database:
+            positions = np.array([
+                (poi.get("position", {}).get("x", 0), poi.get("position", {}).get("y", 0))
+                for poi in poi_database
+            ], dtype=np.float64)
+            distances = planar_distance(
+                current_pose.get("x", 0), current_pose.get("y", 0), positions[:, 0], positions[:, 1]
+            )
+            scores += np.where(distances < 50, (1 - distances / 50) * 0.3, 0.0)
+        
+        scores = np.minimum(scores, 1.0)
+        
+        # 우선순위 정렬 및 Top-K 선택 (같은 우선순위는 입력 순서 유지)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        top_pois = [{**poi_database[i], "priority": float(scores[i])} for i in order]
         
         # POI 출력 형식 변환
         poi_outputs = [
@@ -325,9 +436,36 @@ def _is_point_in_polygon(lat: float, lng: float, polygon: List[Dict[str, float]]
     return inside
 
 
-def _calculate_distance(x1: float, y1: float, x2: float, y2: float) -> float:
-    """두 지점 간 거리 계산 (미터)"""
-    return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+def _parse_uuid(value: Any) -> Optional[UUID]:
+    """UUID 문자열이면 UUID, 아니면 None"""
+    if value is None:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _localize_from_frame(db: Session, camera_frame: Dict[str, Any], indoor_map_id: UUID, floor: Optional[int]):
+    """카메라 프레임으로 랜드마크 매칭 pose 추정 (블로킹, 스레드풀에서 호출)"""
+    query = query_vector_from_frame(camera_frame, get_scq_service())
+    if query is None:
+        return None
+    return get_relocalization_engine().localize(db, query, indoor_map_id, floor)
+
+
+def _visual_poi_scores(camera_frame: Optional[Dict[str, Any]], top_k: int) -> Dict[str, float]:
+    """카메라 프레임 특징 벡터와 POI 특징 벡터의 코사인 유사도 (인덱스 top-k, POI ID → 유사도)"""
+    index = get_feature_index("poi")
+    if index is None or not camera_frame or top_k <= 0:
+        return {}
+    
+    query = extract_feature_vector(camera_frame.get("features"))
+    if query is None or query.shape[0] != index.dim:
+        return {}
+    
+    result = index.search(query, k=top_k)[0]
+    return dict(zip(result.ids, result.scores.tolist()))
 
 
 def _calculate_anchor_hint(poi: Dict[str, Any], current_pose: Dict[str, Any]) -> Optional[Dict[str, float]]:
@@ -335,12 +473,7 @@ def _calculate_anchor_hint(poi: Dict[str, Any], current_pose: Dict[str, Any]) ->
     poi_pos = poi.get("position", {})
     dx = poi_pos.get("x", 0) - current_pose.get("x", 0)
     dy = poi_pos.get("y", 0) - current_pose.get("y", 0)
-    distance = _calculate_distance(
-        current_pose.get("x", 0),
-        current_pose.get("y", 0),
-        poi_pos.get("x", 0),
-        poi_pos.get("y", 0),
-    )
+    distance = float(np.hypot(dx, dy))
     
     if distance > 0:
         return {
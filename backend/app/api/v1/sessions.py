@@ -1,23 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_async_db
 from app import models
 from app.schemas import session
 from app.models.navigation_session import SessionStatus
 
 router = APIRouter()
 
+async def _get_session_with_destination(db: AsyncSession, session_id) -> Optional[models.NavigationSession]:
+    """목적지 정보를 포함한 세션 조회 (응답 직렬화 중 지연 로드 방지)"""
+    result = await db.execute(
+        select(models.NavigationSession)
+        .options(selectinload(models.NavigationSession.destination))
+        .filter(models.NavigationSession.id == session_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 @router.get("/", response_model=List[session.SessionResponse])
-def list_sessions(
+async def list_sessions(
     limit: Optional[int] = Query(10, ge=1, le=100),
     skip: Optional[int] = Query(0, ge=0),
     status: Optional[str] = None,
     user_id: Optional[str] = Query(None, description="사용자 ID로 필터링"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """세션 목록 조회"""
-    query = db.query(models.NavigationSession)
+    # 각 세션에 목적지 정보 포함 (세션 목록과 함께 한 번의 추가 쿼리로 로드)
+    query = select(models.NavigationSession).options(
+        selectinload(models.NavigationSession.destination)
+    )
     
     # 사용자 ID로 필터링
     if user_id:
@@ -30,20 +45,15 @@ def list_sessions(
         except KeyError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
     
-    sessions = query.order_by(models.NavigationSession.started_at.desc()).offset(skip).limit(limit).all()
-    
-    # 각 세션에 목적지 정보 포함
-    for sess in sessions:
-        sess.destination = db.query(models.Destination).filter(
-            models.Destination.id == sess.destination_id
-        ).first()
-    
-    return sessions
+    result = await db.execute(
+        query.order_by(models.NavigationSession.started_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
 @router.post("/", response_model=session.SessionResponse)
-def create_session(
+async def create_session(
     session_data: session.SessionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """네비게이션 세션 생성"""
     try:
@@ -51,11 +61,13 @@ def create_session(
         destination_id = session_data.destination_id
         if not destination_id and session_data.place_id:
             # place_id로 기존 destination 찾기
-            existing_dest = db.query(models.Destination).filter(
-                models.Destination.name == session_data.place_name,
-                models.Destination.latitude == session_data.destination_latitude,
-                models.Destination.longitude == session_data.destination_longitude
-            ).first()
+            existing_dest = (await db.execute(
+                select(models.Destination).filter(
+                    models.Destination.name == session_data.place_name,
+                    models.Destination.latitude == session_data.destination_latitude,
+                    models.Destination.longitude == session_data.destination_longitude
+                )
+            )).scalars().first()
             
             if existing_dest:
                 destination_id = existing_dest.id
@@ -70,7 +82,7 @@ def create_session(
                     is_active=True
                 )
                 db.add(new_dest)
-                db.flush()  # ID를 얻기 위해 flush
+                await db.flush()  # ID를 얻기 위해 flush
                 destination_id = new_dest.id
         
         if not destination_id:
@@ -84,38 +96,33 @@ def create_session(
         session_dict['destination_id'] = destination_id
         db_session = models.NavigationSession(**session_dict)
         db.add(db_session)
-        db.commit()
-        db.refresh(db_session)
-        return db_session
+        await db.commit()
+        return await _get_session_with_destination(db, db_session.id)
     except HTTPException:
         raise
     except Exception as e:
         import traceback
         print(f"Error in create_session: {str(e)}")
         print(traceback.format_exc())
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/{session_id}", response_model=session.SessionResponse)
-def get_session(session_id: str, db: Session = Depends(get_db)):
+async def get_session(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """세션 상세 조회"""
-    db_session = db.query(models.NavigationSession).filter(
-        models.NavigationSession.id == session_id
-    ).first()
+    db_session = await _get_session_with_destination(db, session_id)
     if not db_session:
         raise HTTPException(status_code=404, detail="Session not found")
     return db_session
 
 @router.patch("/{session_id}", response_model=session.SessionResponse)
-def update_session(
+async def update_session(
     session_id: str,
     session_update: session.SessionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """세션 업데이트"""
-    db_session = db.query(models.NavigationSession).filter(
-        models.NavigationSession.id == session_id
-    ).first()
+    db_session = await _get_session_with_destination(db, session_id)
     if not db_session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -128,7 +135,5 @@ def update_session(
     for key, value in update_data.items():
         setattr(db_session, key, value)
     
-    db.commit()
-    db.refresh(db_session)
-    return db_session
-
+    await db.commit()
+    return await _get_session_with_destination(db, session_id)
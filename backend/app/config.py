@@ -49,6 +49,102 @@ class Settings(BaseSettings):
         description="서버 포트"
     )
     
+    # SCQ 서버 추론 설정 (SCQ_REGISTRY_DIR / SCQ_MODEL_PATH가 없으면 /api/v1/scq/encode 비활성)
+    scq_model_path: Optional[str] = Field(
+        default=os.getenv("SCQ_MODEL_PATH"),
+        description="SCQ Autoencoder 체크포인트 경로"
+    )
+    scq_registry_dir: Optional[str] = Field(
+        default=os.getenv("SCQ_REGISTRY_DIR"),
+        description="SCQ 모델 레지스트리 디렉토리 (설정 시 SCQ_MODEL_PATH 대신 사용)"
+    )
+    scq_model_name: str = Field(
+        default=os.getenv("SCQ_MODEL_NAME", "scq_nav"),
+        description="레지스트리 모델 이름"
+    )
+    scq_model_version: Optional[str] = Field(
+        default=os.getenv("SCQ_MODEL_VERSION"),
+        description="레지스트리 모델 버전 (미설정 시 CURRENT)"
+    )
+    scq_latent_dim: int = Field(
+        default=int(os.getenv("SCQ_LATENT_DIM", "128")),
+        description="SCQ 잠재 차원"
+    )
+    scq_num_codes: int = Field(
+        default=int(os.getenv("SCQ_NUM_CODES", "256")),
+        description="SCQ 코드북 크기"
+    )
+    scq_lambda: float = Field(
+        default=float(os.getenv("SCQ_LAMBDA", "1e-3")),
+        description="SCQ 정규화 계수"
+    )
+    scq_image_size: int = Field(
+        default=int(os.getenv("SCQ_IMAGE_SIZE", "64")),
+        description="SCQ 입력 프레임 리사이즈 크기 (정사각형)"
+    )
+    scq_num_candidates: int = Field(
+        default=int(os.getenv("SCQ_NUM_CANDIDATES", "8")),
+        description="위치별 희소 코드 수"
+    )
+    scq_max_batch_size: int = Field(
+        default=int(os.getenv("SCQ_MAX_BATCH_SIZE", "16")),
+        description="마이크로배치 최대 크기"
+    )
+    scq_max_wait_ms: float = Field(
+        default=float(os.getenv("SCQ_MAX_WAIT_MS", "5")),
+        description="마이크로배치 수집 대기 시간 (ms)"
+    )
+    
+    # 데이터베이스 연결 풀 (queue: 연결 재사용, null: 요청마다 새 연결)
+    db_pool_mode: str = Field(
+        default=os.getenv("DB_POOL_MODE", "queue"),
+        description="연결 풀 모드 (queue, null)"
+    )
+    db_pool_size: int = Field(
+        default=int(os.getenv("DB_POOL_SIZE", "5")),
+        description="풀에 유지할 연결 수"
+    )
+    db_max_overflow: int = Field(
+        default=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        description="풀 크기를 넘어 임시로 만들 수 있는 연결 수"
+    )
+    db_pool_timeout: float = Field(
+        default=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        description="풀이 가득 찼을 때 연결을 기다리는 최대 시간 (초)"
+    )
+    db_pool_recycle: int = Field(
+        default=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        description="연결 재생성 주기 (초)"
+    )
+    db_pool_pre_ping: bool = Field(
+        default=os.getenv("DB_POOL_PRE_PING", "True").lower() == "true",
+        description="체크아웃 시 끊어진 연결 감지 여부"
+    )
+    db_pool_prewarm: int = Field(
+        default=int(os.getenv("DB_POOL_PREWARM", "0")),
+        description="서버 시작 시 미리 만들 연결 수 (풀 크기 이내)"
+    )
+    health_check_interval: float = Field(
+        default=float(os.getenv("HEALTH_CHECK_INTERVAL", "10")),
+        description="/health용 DB 상태 백그라운드 갱신 주기 (초)"
+    )
+    
+    # 근처 검색 공간 쿼리 (auto: PostGIS가 설치되어 있으면 사용, postgis, bbox)
+    spatial_backend: str = Field(
+        default=os.getenv("SPATIAL_BACKEND", "auto").lower(),
+        description="반경 검색 방식 (auto, postgis, bbox)"
+    )
+    
+    # 랜드마크/POI 특징 벡터 인덱스 (서버 시작 시 준비)
+    vector_index_preload: bool = Field(
+        default=os.getenv("VECTOR_INDEX_PRELOAD", "False").lower() == "true",
+        description="서버 시작 시 특징 벡터 인덱스 로드/생성 여부"
+    )
+    vector_index_dir: Optional[str] = Field(
+        default=os.getenv("VECTOR_INDEX_DIR"),
+        description="특징 벡터 인덱스 저장 디렉토리 (메모리 맵 로드)"
+    )
+    
     @validator('database_url')
     def validate_database_url(cls, v):
         """데이터베이스 URL 검증"""
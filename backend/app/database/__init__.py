@@ -1,16 +1,27 @@
 # Database utilities
-from sqlalchemy import create_engine, text, event
+from sqlalchemy import create_engine, text, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError, DisconnectionError
+from sqlalchemy.pool import NullPool
 from app.config import settings
+from app.database.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    is_pgbouncer_url,
+    prewarm_pool
+)
+from app.database.health import DatabaseHealthProbe
 import logging
 import urllib.parse
 import subprocess
 import re
+import threading
 import time
+import uuid
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, AsyncIterator, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -125,11 +136,44 @@ if "supabase.co" in database_url:
     elif ":5432" in database_url:
         logger.info("Supabase 직접 연결 사용 중 (포트 5432)")
 
+# 트랜잭션 모드 연결 풀러(PgBouncer/Supavisor) 뒤인지 여부
+is_pgbouncer = is_pgbouncer_url(database_url)
+
+pool_metrics = PoolMetrics()
+
+def _pool_options(queue_pool_class=InstrumentedQueuePool) -> dict:
+    """설정에 맞는 create_engine 연결 풀 인자"""
+    if settings.db_pool_mode == "null":
+        return {"poolclass": NullPool}
+    if settings.db_pool_mode != "queue":
+        raise ValueError(f"지원하지 않는 DB_POOL_MODE입니다: {settings.db_pool_mode} (가능: queue, null)")
+    
+    options = {
+        "poolclass": queue_pool_class,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if is_pgbouncer:
+        # 풀러는 유휴 클라이언트 연결을 먼저 끊으므로 최근 연결부터 재사용(LIFO)하고
+        # 풀러의 유휴 정리보다 먼저 재생성해 끊긴 연결을 받는 일을 줄인다
+        options["pool_use_lifo"] = True
+        options["pool_recycle"] = min(settings.db_pool_recycle, 300)
+    return options
+
 engine = create_engine(
     database_url,
-    poolclass=None,      # 연결 풀 비활성화
     echo=settings.debug, # 디버그 모드에서 SQL 쿼리 출력
-    connect_args=connect_args
+    connect_args=connect_args,
+    **_pool_options()
+)
+if isinstance(engine.pool, InstrumentedQueuePool):
+    engine.pool.metrics = pool_metrics
+logger.info(
+    f"데이터베이스 연결 풀: mode={settings.db_pool_mode}, size={settings.db_pool_size}, "
+    f"overflow={settings.db_max_overflow}, pgbouncer={is_pgbouncer}"
 )
 
 # 연결 이벤트 리스너
@@ -204,12 +248,11 @@ def retry_db_connection(max_retries: int = 3, delay: float = 1.0, backoff: float
 def get_db():
     """
     데이터베이스 세션 생성 (의존성 주입용)
-    매번 새로운 연결 생성 (연결 풀 없음)
+    
+    연결은 첫 쿼리 시 풀에서 가져오며, 끊어진 연결은 체크아웃 시 pre-ping으로 걸러진다.
     """
     db = SessionLocal()
     try:
-        # 연결 테스트
-        db.execute(text("SELECT 1"))
         yield db
     except Exception as e:
         logger.error(f"데이터베이스 세션 오류: {e}")
@@ -234,11 +277,160 @@ def test_connection() -> bool:
         logger.error(f"데이터베이스 연결 테스트 실패: {e}")
         return False
 
+def warm_pool() -> int:
+    """
+    서버 시작 시 연결 풀 준비 (DB_POOL_PREWARM개)
+    
+    Returns:
+        생성된 연결 수 (실패 시 0)
+    """
+    if settings.db_pool_prewarm <= 0:
+        return 0
+    try:
+        count = prewarm_pool(engine, settings.db_pool_prewarm)
+        logger.info(f"데이터베이스 연결 {count}개 준비 완료")
+        return count
+    except Exception as e:
+        logger.error(f"데이터베이스 연결 풀 준비 실패: {e}")
+        return 0
+
+# 엔진 드라이버(psycopg2/psycopg)의 DBAPI 예외 기반 클래스
+DriverError = engine.dialect.loaded_dbapi.Error
+
+_existing_tables = set()
+_existing_tables_lock = threading.Lock()
+
+def table_exists(table_name: str) -> bool:
+    """
+    테이블 존재 여부 (존재가 확인되면 프로세스 동안 캐시)
+    
+    없는 테이블은 마이그레이션 후 생길 수 있으므로 캐시하지 않는다.
+    """
+    if table_name in _existing_tables:
+        return True
+    with _existing_tables_lock:
+        if table_name in _existing_tables:
+            return True
+        if inspect(engine).has_table(table_name):
+            _existing_tables.add(table_name)
+            return True
+    return False
+
+def _health_check():
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT 1")).scalar()
+
+# /health 응답용 캐시된 DB 상태 (서버 시작 시 백그라운드 갱신 시작)
+health_probe = DatabaseHealthProbe(
+    _health_check,
+    interval=settings.health_check_interval,
+    max_age=settings.health_check_interval * 3
+)
+
+def get_pool_stats() -> dict:
+    """연결 풀 체크아웃 지연 시간 / 포화도 지표 (비동기 엔진이 만들어졌으면 "async" 포함)"""
+    stats = pool_metrics.snapshot(engine.pool)
+    stats["mode"] = settings.db_pool_mode
+    stats["pgbouncer"] = is_pgbouncer
+    if _async_engine is not None:
+        stats["async"] = async_pool_metrics.snapshot(_async_engine.sync_engine.pool)
+    return stats
+
+# ============================================
+# 비동기 엔진 (SQLAlchemy asyncio + asyncpg)
+# ============================================
+# 엔진은 첫 사용 시 생성한다 (asyncpg가 필요 없는 스크립트/테스트에서 import 비용 없음)
+
+async_pool_metrics = PoolMetrics()
+_async_engine = None
+_async_sessionmaker = None
+
+def async_database_url(url: str) -> Tuple[Any, dict]:
+    """
+    동기 DATABASE_URL을 비동기 드라이버 URL과 connect_args로 변환
+    
+    asyncpg는 libpq URL 옵션(sslmode, connect_timeout, keepalives)을 받지 않으므로
+    대응하는 connect_args로 옮긴다. 연결 풀러(포트 6543) 뒤에서는 트랜잭션마다 서버 연결이
+    바뀔 수 있어 prepared statement 캐시를 끄고 이름이 겹치지 않게 한다.
+    """
+    from sqlalchemy.engine import make_url
+    
+    parsed = make_url(url)
+    query = dict(parsed.query)
+    args = {"timeout": float(query.pop("connect_timeout", connect_args["connect_timeout"]))}
+    
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite"), {}
+    if backend != "postgresql":
+        return parsed, {}
+    
+    sslmode = query.pop("sslmode", None)
+    if sslmode and sslmode != "disable":
+        args["ssl"] = sslmode
+    for key in [k for k in query if k.startswith("keepalives")]:
+        query.pop(key)
+    
+    if is_pgbouncer_url(url):
+        args["statement_cache_size"] = 0
+        args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        query["prepared_statement_cache_size"] = "0"
+    
+    return parsed.set(drivername="postgresql+asyncpg", query=query), args
+
+def get_async_engine():
+    """프로세스 전역 비동기 엔진 (첫 호출 시 생성)"""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        
+        url, async_connect_args = async_database_url(database_url)
+        _async_engine = create_async_engine(
+            url,
+            echo=settings.debug,
+            connect_args=async_connect_args,
+            **_pool_options(InstrumentedAsyncAdaptedQueuePool)
+        )
+        if isinstance(_async_engine.sync_engine.pool, InstrumentedAsyncAdaptedQueuePool):
+            _async_engine.sync_engine.pool.metrics = async_pool_metrics
+        # 커밋 후 응답 직렬화에서 지연 로드(동기 I/O)가 일어나지 않도록 만료하지 않음
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+async def get_async_db() -> AsyncIterator[Any]:
+    """
+    비동기 데이터베이스 세션 생성 (의존성 주입용)
+    
+    async def 라우터에서 사용하며, 쿼리 대기 중에도 이벤트 루프가 다른 요청을 처리한다.
+    관계 속성은 지연 로드되지 않으므로 selectinload 등으로 미리 로드해야 한다.
+    """
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"데이터베이스 세션 오류: {e}")
+            await db.rollback()
+            raise
+
+async def dispose_async_engine():
+    """비동기 엔진 종료 (서버 종료 시)"""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+
 # 연결 오류 이벤트 핸들러 추가
 @event.listens_for(engine, "invalidate")
 def receive_invalidate(dbapi_conn, connection_record, exception):
     """연결 무효화 이벤트 처리"""
     logger.warning(f"데이터베이스 연결이 무효화되었습니다: {exception}")
 
-__all__ = ["Base", "SessionLocal", "get_db", "engine", "test_connection", "retry_db_connection"]
+__all__ = [
+    "Base", "SessionLocal", "get_db", "engine", "test_connection", "retry_db_connection",
+    "warm_pool", "get_pool_stats", "is_pgbouncer",
+    "DriverError", "table_exists", "health_probe",
+    "get_async_db", "get_async_engine", "dispose_async_engine"
+]
 
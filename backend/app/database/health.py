@@ -0,0 +1,101 @@
+# Database health probe
+"""
+캐시된 데이터베이스 헬스 체크
+
+로드 밸런서의 /health 호출마다 DB에 연결하지 않도록, 풀 연결로 SELECT 1을 실행한 결과를
+백그라운드에서 주기적으로 갱신하고 요청에는 마지막 결과를 돌려준다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthStatus(NamedTuple):
+    """헬스 체크 결과 1건"""
+    ok: bool
+    result: Any
+    error: Optional[str]
+    latency_ms: float
+    checked_at: float  # time.time()
+
+
+class DatabaseHealthProbe:
+    """
+    백그라운드 갱신 헬스 체크
+
+    Args:
+        check: DB를 확인하는 함수 (실패 시 예외), 반환값은 result로 기록
+        interval: 백그라운드 갱신 주기 (초)
+        max_age: 이보다 오래된 결과는 요청 시 즉시 다시 확인 (초)
+    """
+
+    def __init__(self, check: Callable[[], Any], interval: float = 10.0, max_age: float = 30.0):
+        self.check = check
+        self.interval = interval
+        self.max_age = max_age
+        self._status: Optional[HealthStatus] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def status(self) -> Optional[HealthStatus]:
+        """마지막 결과 (아직 확인 전이면 None)"""
+        return self._status
+
+    def refresh(self) -> HealthStatus:
+        """지금 확인하고 결과 갱신 (블로킹, executor에서 호출)"""
+        start = time.perf_counter()
+        try:
+            result, error = self.check(), None
+        except Exception as e:
+            result, error = None, str(e)
+            logger.error(f"Health check failed: {error}")
+        status = HealthStatus(
+            ok=error is None,
+            result=result,
+            error=error,
+            latency_ms=(time.perf_counter() - start) * 1000.0,
+            checked_at=time.time()
+        )
+        self._status = status
+        return status
+
+    async def get(self) -> HealthStatus:
+        """캐시된 결과 (없거나 max_age보다 오래되면 한 번만 다시 확인)"""
+        status = self._status
+        if status is not None and time.time() - status.checked_at <= self.max_age:
+            return status
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            status = self._status
+            if status is None or time.time() - status.checked_at > self.max_age:
+                status = await asyncio.get_running_loop().run_in_executor(None, self.refresh)
+            return status
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await loop.run_in_executor(None, self.refresh)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """현재 이벤트 루프에서 백그라운드 갱신 시작"""
+        if self._task is not None and not self._task.done():
+            return
+        self._lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 갱신 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
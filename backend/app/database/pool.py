@@ -0,0 +1,154 @@
+# Connection pool utilities
+"""
+연결 풀 계측 및 준비
+
+- InstrumentedQueuePool: 체크아웃 대기 시간(ms)과 포화도(사용 중 연결 / 최대 연결)를 기록하는 QueuePool
+  (비동기 엔진용은 InstrumentedAsyncAdaptedQueuePool)
+- prewarm_pool: 서버 시작 시 연결을 미리 만들어 첫 요청의 TCP/TLS/인증 비용 제거
+- is_pgbouncer_url: Supabase 연결 풀러(PgBouncer/Supavisor, 포트 6543) 감지
+"""
+import logging
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+PGBOUNCER_PORT = 6543
+
+
+def is_pgbouncer_url(database_url: str) -> bool:
+    """트랜잭션 모드 연결 풀러(Supabase 포트 6543) 뒤의 DB인지 여부"""
+    try:
+        return urllib.parse.urlparse(database_url).port == PGBOUNCER_PORT
+    except ValueError:
+        return False
+
+
+class PoolMetrics:
+    """
+    연결 풀 체크아웃 지표
+
+    Args:
+        window: 백분위 계산에 사용할 최근 체크아웃 수
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._latencies.clear()
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_latency = 0.0
+            self.max_latency = 0.0
+            self.peak_checked_out = 0
+
+    def observe_checkout(self, seconds: float, checked_out: int):
+        with self._lock:
+            self.checkouts += 1
+            self.total_latency += seconds
+            self.max_latency = max(self.max_latency, seconds)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self._latencies.append(seconds)
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool=None) -> Dict[str, Any]:
+        """
+        현재 지표
+
+        Returns:
+            checkouts, timeouts, latency_ms(avg/p50/p95/p99/max), 풀 상태(pool이 있으면)
+        """
+        with self._lock:
+            recent = np.array(self._latencies, dtype=np.float64) * 1000.0
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "latency_ms": {
+                    "avg": self.total_latency * 1000.0 / self.checkouts if self.checkouts else 0.0,
+                    "p50": float(np.percentile(recent, 50)) if recent.size else 0.0,
+                    "p95": float(np.percentile(recent, 95)) if recent.size else 0.0,
+                    "p99": float(np.percentile(recent, 99)) if recent.size else 0.0,
+                    "max": self.max_latency * 1000.0
+                },
+                "peak_checked_out": self.peak_checked_out
+            }
+
+        if isinstance(pool, QueuePool):
+            checked_out = pool.checkedout()
+            capacity = pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": checked_out,
+                "overflow": max(pool.overflow(), 0),
+                "capacity": capacity,
+                "saturation": checked_out / capacity if capacity else 0.0,
+                "peak_saturation": self.peak_checked_out / capacity if capacity else 0.0
+            })
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    """체크아웃 대기 시간과 포화도를 PoolMetrics에 기록"""
+
+    def __init__(self, *args, metrics: Optional[PoolMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # engine.dispose() 후에도 지표 누적 유지
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """체크아웃 대기 시간과 포화도를 PoolMetrics에 기록하는 QueuePool"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """비동기 엔진(asyncpg)용 InstrumentedQueuePool"""
+
+
+def prewarm_pool(engine, count: int) -> int:
+    """
+    연결을 count개(풀 크기 이내) 미리 만들어 풀에 반납
+
+    Returns:
+        생성된 연결 수
+    """
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        count = min(count, pool.size())
+    connections: List = []
+    try:
+        for _ in range(max(count, 0)):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
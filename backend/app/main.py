@@ -3,10 +3,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
 import logging
 import traceback
 from app.api.v1 import destinations, sessions, navigation_points, feedback, analytics, users, favorites, auth, scq, geofences, indoor_maps, pois, buildings
 from app.config import settings
+from app.services.scq_inference import load_scq_codebook, start_scq_service, stop_scq_service
+from app.services.relocalization import get_relocalization_engine
+from app.services.vector_index import warm_feature_indexes
+from app.database import SessionLocal, dispose_async_engine, get_pool_stats, health_probe, warm_pool
+from app import models
 
 # 로깅 설정
 logging.basicConfig(
@@ -124,6 +130,36 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
+def _warm_feature_indexes():
+    """랜드마크/POI 특징 벡터 인덱스 준비 (실패해도 서버는 계속 시작)"""
+    # SCQ 코드북을 IVF coarse quantizer로 재사용 (모델은 만들지 않고 가중치에서 코드북만 읽음)
+    try:
+        codebook = load_scq_codebook(settings)
+    except Exception as e:
+        logger.error(f"SCQ 코드북 로드 실패 (IVF 없이 인덱스 준비): {e}")
+        codebook = None
+    try:
+        warm_feature_indexes(
+            SessionLocal,
+            {"poi": models.POI, "landmark": models.Landmark},
+            index_dir=settings.vector_index_dir,
+            coarse_quantizer=codebook
+        )
+    except Exception as e:
+        logger.error(f"특징 벡터 인덱스 준비 실패: {e}")
+
+    # SCQ Unit #2 재위치추정용 층별 랜드마크 인덱스
+    engine = get_relocalization_engine()
+    try:
+        db = SessionLocal()
+        try:
+            engine.warm(db)
+        finally:
+            db.close()
+        engine.watch_landmarks()
+    except Exception as e:
+        logger.error(f"재위치추정 인덱스 준비 실패: {e}")
+
 # 시작 이벤트 핸들러
 @app.on_event("startup")
 async def startup_event():
@@ -138,50 +174,61 @@ async def startup_event():
     logger.info(f"데이터베이스: {masked_url}")
     logger.info(f"CORS Origins: {', '.join(settings.cors_origins_list)}")
     logger.info("=" * 60)
+    
+    # 연결 풀 미리 준비 (첫 요청의 연결 수립 비용 제거)
+    await asyncio.get_running_loop().run_in_executor(None, warm_pool)
+    
+    # /health용 DB 상태 백그라운드 갱신
+    health_probe.start()
+    
+    # SCQ 인코딩 서비스 (모델은 첫 요청 시 로드)
+    await start_scq_service(settings)
+    
+    if settings.vector_index_preload:
+        await asyncio.get_running_loop().run_in_executor(None, _warm_feature_indexes)
 
 # 종료 이벤트 핸들러
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 실행"""
     logger.info("ARWay Lite API 서버 종료")
+    await health_probe.stop()
+    await stop_scq_service()
+    await dispose_async_engine()
+
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    """연결 풀 지표 (체크아웃 대기 시간, 포화도)"""
+    return get_pool_stats()
 
 @app.get("/health")
 async def health_check():
-    """헬스 체크 - 데이터베이스 연결 확인 포함"""
-    try:
-        import psycopg2
-        from app.config import settings
-        
-        # psycopg2로 직접 연결 (SQLAlchemy 우회)
-        conn = psycopg2.connect(settings.database_url)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        
+    """헬스 체크 - 백그라운드에서 갱신되는 데이터베이스 연결 상태 반환"""
+    status = await health_probe.get()
+    if status.ok:
         return {
             "status": "healthy", 
             "database": "connected",
             "version": "0.1.0",
-            "result": result[0] if result else None
+            "result": status.result,
+            "latency_ms": status.latency_ms,
+            "checked_at": status.checked_at
         }
-    except Exception as e:
-        error_detail = str(e)
-        logger.error(f"Health check failed: {error_detail}")
-        
-        # DNS 오류인 경우 더 명확한 메시지 제공
-        if "could not translate host name" in error_detail or "Name or service not known" in error_detail:
-            error_detail = "데이터베이스 호스트를 찾을 수 없습니다. 네트워크 연결을 확인하거나 백엔드 서버를 재시작해주세요."
-        
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy", 
-                "database": "disconnected", 
-                "error": error_detail,
-                "hint": "백엔드 서버를 재시작하면 해결될 수 있습니다.",
-                "version": "0.1.0"
-            }
-        )
+    
+    error_detail = status.error
+    
+    # DNS 오류인 경우 더 명확한 메시지 제공
+    if "could not translate host name" in error_detail or "Name or service not known" in error_detail:
+        error_detail = "데이터베이스 호스트를 찾을 수 없습니다. 네트워크 연결을 확인하거나 백엔드 서버를 재시작해주세요."
+    
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "unhealthy", 
+            "database": "disconnected", 
+            "error": error_detail,
+            "hint": "백엔드 서버를 재시작하면 해결될 수 있습니다.",
+            "version": "0.1.0"
+        }
+    )
 
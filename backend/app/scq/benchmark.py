@@ -0,0 +1,327 @@
+"""
+SCQ 성능 벤치마크
+
+솔버, SCQLayer, SCQAutoencoder(end-to-end)의 forward / forward+backward 처리량(samples/sec)과
+피크 메모리를 측정한다. 배치 크기, 코드북 크기(K), 코드 차원(d), λ, 솔버 백엔드를 스윕하고
+결과를 JSON으로 저장하며, 저장된 기준(baseline) 결과와 비교해 회귀를 표시한다.
+
+샘플 1개 = spatial x spatial 위치의 잠재 맵 1장 (autoencoder는 16배 큰 입력 이미지 1장).
+"""
+import itertools
+import json
+import os
+import platform
+import time
+import torch
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.scq.scq_layer import SCQLayer
+from app.scq.scq_autoencoder import SCQAutoencoder, compute_loss
+from app.scq.simplex_solver import solve_simplex_qp
+
+BENCHMARK_VERSION = 1
+BENCHMARK_TARGETS = ("solver", "layer", "autoencoder")
+
+# 처리량은 높을수록, 메모리는 낮을수록 좋음
+THROUGHPUT_METRICS = ("forward_samples_per_sec", "train_samples_per_sec")
+MEMORY_METRICS = ("forward_peak_bytes", "train_peak_bytes")
+
+# 인코더 다운샘플링 배율 (stride 2 conv 4개)
+_AUTOENCODER_STRIDE = 16
+
+
+class BenchmarkConfig(NamedTuple):
+    """벤치마크 설정 1건"""
+    target: str
+    batch_size: int
+    num_codes: int
+    codebook_dim: int
+    lam: float
+    solver: str = "fista"
+    spatial: int = 8
+
+    @property
+    def name(self) -> str:
+        """기준 결과와 매칭할 때 쓰는 고유 이름"""
+        return (
+            f"{self.target}/B={self.batch_size}/K={self.num_codes}/d={self.codebook_dim}"
+            f"/lam={self.lam:g}/{self.solver}/s={self.spatial}"
+        )
+
+
+def sweep_configs(
+    targets: Sequence[str] = ("layer",),
+    batch_sizes: Sequence[int] = (8,),
+    num_codes: Sequence[int] = (256,),
+    codebook_dims: Sequence[int] = (128,),
+    lams: Sequence[float] = (1e-3,),
+    solvers: Sequence[str] = ("fista",),
+    spatial: int = 8
+) -> List[BenchmarkConfig]:
+    """
+    파라미터 조합 전체의 벤치마크 설정 생성
+
+    solver 타깃은 FISTA 솔버 함수를 직접 호출하므로 fista 백엔드만 포함한다.
+    """
+    configs = []
+    for target, B, K, d, lam, solver in itertools.product(
+        targets, batch_sizes, num_codes, codebook_dims, lams, solvers
+    ):
+        if target not in BENCHMARK_TARGETS:
+            raise ValueError(f"지원하지 않는 벤치마크 타깃입니다: {target} (가능: {BENCHMARK_TARGETS})")
+        if target == "solver" and solver != "fista":
+            continue
+        configs.append(BenchmarkConfig(target, B, K, d, lam, solver, spatial))
+    return configs
+
+
+def _build(
+    config: BenchmarkConfig,
+    device: torch.device
+) -> Tuple[Callable[[], None], Callable[[], None]]:
+    """설정에 맞는 (forward 함수, forward+backward 함수) 생성"""
+    B, K, d, s = config.batch_size, config.num_codes, config.codebook_dim, config.spatial
+
+    if config.target == "solver":
+        codebook = torch.randn(K, d, device=device).requires_grad_(True)
+        z = torch.randn(B * s * s, d, device=device).requires_grad_(True)
+
+        def forward():
+            with torch.no_grad():
+                solve_simplex_qp(z, codebook, config.lam)
+
+        def train():
+            alpha = solve_simplex_qp(z, codebook, config.lam)
+            ((alpha @ codebook - z) ** 2).sum().backward()
+
+    elif config.target == "layer":
+        layer = SCQLayer(d, num_codes=K, lam=config.lam, device=device, solver=config.solver)
+        z = torch.randn(B, s, s, d, device=device).requires_grad_(True)
+
+        def forward():
+            with torch.no_grad():
+                layer(z)
+
+        def train():
+            z_q, _, stats = layer(z)
+            (((z_q - z) ** 2).mean() - 0.01 * stats['entropy']).backward()
+
+    else:
+        model = SCQAutoencoder(
+            latent_dim=d, num_codes=K, scq_lambda=config.lam,
+            device=device, scq_solver=config.solver
+        ).to(device)
+        size = s * _AUTOENCODER_STRIDE
+        x = torch.rand(B, 3, size, size, device=device)
+
+        def forward():
+            model.eval()
+            with torch.no_grad():
+                model(x)
+
+        def train():
+            model.train()
+            x_recon, z, z_q, stats = model(x)
+            loss, _ = compute_loss(x_recon, x, z, z_q, stats, return_tensors=True)
+            loss.backward()
+
+    return forward, train
+
+
+def _synchronize(device: torch.device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def _time_per_iter(fn: Callable[[], None], device: torch.device, warmup: int, iters: int) -> float:
+    """반복당 평균 실행 시간 (초)"""
+    for _ in range(warmup):
+        fn()
+    _synchronize(device)
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    _synchronize(device)
+    return (time.perf_counter() - start) / iters
+
+
+def peak_memory_bytes(fn: Callable[[], None], device: torch.device) -> int:
+    """
+    fn 1회 실행 중 추가로 할당된 텐서 메모리의 최대치 (바이트)
+
+    CUDA는 max_memory_allocated, CPU는 프로파일러 이벤트(torch.profiler 공개 API)의 연산별
+    self 메모리(할당 +, 해제 -)를 시작 시각 순으로 누적한 최대치로 계산한다.
+    """
+    if device.type == "cuda":
+        _synchronize(device)
+        torch.cuda.reset_peak_memory_stats(device)
+        base = torch.cuda.memory_allocated(device)
+        fn()
+        _synchronize(device)
+        return int(torch.cuda.max_memory_allocated(device) - base)
+
+    from torch.profiler import ProfilerActivity, profile
+
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        fn()
+
+    current = peak = 0
+    for event in sorted(prof.events(), key=lambda e: e.time_range.start):
+        current += event.self_cpu_memory_usage
+        peak = max(peak, current)
+    return int(peak)
+
+
+def run_benchmark(
+    config: BenchmarkConfig,
+    device: Optional[torch.device] = None,
+    warmup: int = 2,
+    iters: int = 5,
+    measure_memory: bool = True,
+    seed: int = 0
+) -> Dict:
+    """
+    설정 1건 측정
+
+    Returns:
+        설정 필드 + forward/train samples/sec, forward/train 피크 메모리(바이트)
+    """
+    if device is None:
+        device = torch.device("cpu")
+    torch.manual_seed(seed)
+    forward, train = _build(config, device)
+
+    result = dict(config._asdict(), name=config.name)
+    forward_sec = _time_per_iter(forward, device, warmup, iters)
+    train_sec = _time_per_iter(train, device, warmup, iters)
+    result['forward_samples_per_sec'] = config.batch_size / forward_sec
+    result['train_samples_per_sec'] = config.batch_size / train_sec
+
+    if measure_memory:
+        result['forward_peak_bytes'] = peak_memory_bytes(forward, device)
+        result['train_peak_bytes'] = peak_memory_bytes(train, device)
+
+    return result
+
+
+def run_suite(
+    configs: Iterable[BenchmarkConfig],
+    device: Optional[torch.device] = None,
+    warmup: int = 2,
+    iters: int = 5,
+    measure_memory: bool = True,
+    verbose: bool = False
+) -> Dict:
+    """
+    설정 목록 측정
+
+    선택 의존성(cvxpy 등)이 없어 실행할 수 없는 설정은 error 필드만 기록한다.
+
+    Returns:
+        {'version', 'meta': {...}, 'results': [...]}
+    """
+    if device is None:
+        device = torch.device("cpu")
+
+    results = []
+    for config in configs:
+        try:
+            result = run_benchmark(
+                config, device=device, warmup=warmup, iters=iters, measure_memory=measure_memory
+            )
+        except ImportError as e:
+            result = dict(config._asdict(), name=config.name, error=str(e))
+        results.append(result)
+        if verbose:
+            print(format_result(result))
+
+    return {
+        'version': BENCHMARK_VERSION,
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'torch': torch.__version__,
+            'device': str(device),
+            'num_threads': torch.get_num_threads(),
+            'platform': platform.platform(),
+            'warmup': warmup,
+            'iters': iters
+        },
+        'results': results
+    }
+
+
+def format_result(result: Dict) -> str:
+    """결과 1건 요약 문자열"""
+    if 'error' in result:
+        return f"{result['name']:60s} 건너뜀: {result['error']}"
+    line = (
+        f"{result['name']:60s} "
+        f"fwd {result['forward_samples_per_sec']:9.1f}/s, "
+        f"fwd+bwd {result['train_samples_per_sec']:9.1f}/s"
+    )
+    if 'train_peak_bytes' in result:
+        line += f", peak {result['train_peak_bytes'] / 2 ** 20:.1f} MiB"
+    return line
+
+
+def save_results(results: Dict, path: Path):
+    """결과 JSON 저장 (임시 파일에 쓴 뒤 원자적 교체)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_results(path: Path) -> Dict:
+    """결과 JSON 로드"""
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get('version') != BENCHMARK_VERSION:
+        raise ValueError(f"지원하지 않는 벤치마크 결과 버전입니다: {results.get('version')}")
+    return results
+
+
+def compare_to_baseline(
+    current: Dict,
+    baseline: Dict,
+    tolerance: float = 0.1,
+    memory_tolerance: float = 0.1
+) -> List[Dict]:
+    """
+    기준 결과와 비교
+
+    같은 이름의 설정끼리 비교하며, 처리량이 (1 - tolerance)배 미만으로 떨어지거나
+    피크 메모리가 (1 + memory_tolerance)배를 넘으면 회귀로 표시한다.
+
+    Returns:
+        지표별 비교 목록 [{'name', 'metric', 'baseline', 'current', 'ratio', 'regression'}]
+    """
+    baseline_by_name = {r['name']: r for r in baseline.get('results', []) if 'error' not in r}
+
+    comparisons = []
+    for result in current.get('results', []):
+        reference = baseline_by_name.get(result['name'])
+        if reference is None or 'error' in result:
+            continue
+        for metric in THROUGHPUT_METRICS + MEMORY_METRICS:
+            if metric not in result or metric not in reference:
+                continue
+            base_value, value = reference[metric], result[metric]
+            ratio = value / base_value if base_value else float('inf')
+            if metric in THROUGHPUT_METRICS:
+                regression = ratio < 1.0 - tolerance
+            else:
+                regression = base_value > 0 and ratio > 1.0 + memory_tolerance
+            comparisons.append({
+                'name': result['name'],
+                'metric': metric,
+                'baseline': base_value,
+                'current': value,
+                'ratio': ratio,
+                'regression': regression
+            })
+    return comparisons
@@ -0,0 +1,164 @@
+"""
+SCQ 압축 잠재 표현 바이너리 포맷
+
+위치별 희소 코드 인덱스(정수 배열)와 고정소수점으로 양자화된 가중치를
+버전이 있는 바이너리 컨테이너에 저장한다.
+
+레이아웃 (little-endian):
+    header: magic(4s) version(B) index_bytes(B) weight_bits(B) reserved(B)
+            batch(I) height(I) width(I) num_candidates(I) num_codes(I) latent_dim(I)
+    indices: (B, H, W, m) uint8/uint16
+    weights: (B, H, W, m) uint8, 위치별 합이 2^weight_bits - 1
+"""
+import struct
+import numpy as np
+import torch
+from typing import NamedTuple, Tuple
+
+CODEC_MAGIC = b"SCQL"
+CODEC_VERSION = 1
+WEIGHT_BITS = 8
+
+_HEADER_FORMAT = "<4sBBBBIIIIII"
+_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+
+
+class LatentHeader(NamedTuple):
+    """압축 잠재 표현 헤더"""
+    version: int
+    index_bytes: int
+    weight_bits: int
+    batch: int
+    height: int
+    width: int
+    num_candidates: int
+    num_codes: int
+    latent_dim: int
+
+
+def quantize_weights(weights: torch.Tensor, weight_bits: int = WEIGHT_BITS) -> torch.Tensor:
+    """
+    볼록 결합 가중치를 고정소수점 정수로 양자화
+
+    largest-remainder 반올림으로 위치별 합이 정확히 2^bits - 1 이 되도록 하여
+    복원된 가중치가 다시 심플렉스 위에 놓이게 한다.
+
+    Args:
+        weights: 가중치 (..., m), 마지막 축의 합이 1
+        weight_bits: 가중치 비트 수
+
+    Returns:
+        양자화된 가중치 (..., m), int64
+    """
+    scale = (1 << weight_bits) - 1
+    w = weights.clamp(min=0)
+    w = w / w.sum(dim=-1, keepdim=True).clamp(min=1e-12)
+    scaled = w * scale
+
+    q = torch.floor(scaled)
+    deficit = scale - q.sum(dim=-1, keepdim=True)
+
+    # 나머지가 큰 순서로 deficit 만큼 1씩 더함
+    order = torch.argsort(scaled - q, dim=-1, descending=True)
+    rank = torch.argsort(order, dim=-1)
+    q = q + (rank < deficit).to(q.dtype)
+
+    return q.long()
+
+
+def dequantize_weights(q: torch.Tensor, weight_bits: int = WEIGHT_BITS) -> torch.Tensor:
+    """고정소수점 가중치를 float32로 복원"""
+    scale = (1 << weight_bits) - 1
+    return q.float() / scale
+
+
+def pack_codes(
+    indices: torch.Tensor,
+    weights: torch.Tensor,
+    num_codes: int,
+    latent_dim: int
+) -> bytes:
+    """
+    희소 SCQ 코드를 바이너리 컨테이너로 직렬화
+
+    Args:
+        indices: 코드 인덱스 (B, H, W, m)
+        weights: 볼록 결합 계수 (B, H, W, m)
+        num_codes: 코드북 크기 (K)
+        latent_dim: 코드북 벡터 차원 (d)
+
+    Returns:
+        직렬화된 바이트열
+    """
+    if indices.dim() != 4 or indices.shape != weights.shape:
+        raise ValueError("indices와 weights는 동일한 (B, H, W, m) shape이어야 합니다.")
+
+    if num_codes > (1 << 16):
+        raise ValueError(f"코드북 크기는 {1 << 16} 이하여야 합니다 (uint16 인덱스): {num_codes}")
+
+    B, H, W, m = indices.shape
+    index_bytes = 1 if num_codes <= (1 << 8) else 2
+    index_dtype = np.uint8 if index_bytes == 1 else np.uint16
+
+    header = struct.pack(
+        _HEADER_FORMAT,
+        CODEC_MAGIC, CODEC_VERSION, index_bytes, WEIGHT_BITS, 0,
+        B, H, W, m, num_codes, latent_dim
+    )
+    index_array = indices.detach().cpu().numpy().astype(index_dtype)
+    weight_array = quantize_weights(weights.detach().cpu()).numpy().astype(np.uint8)
+
+    return header + index_array.tobytes() + weight_array.tobytes()
+
+
+def read_header(data: bytes) -> LatentHeader:
+    """바이너리 컨테이너 헤더 파싱 및 검증"""
+    if len(data) < _HEADER_SIZE:
+        raise ValueError("SCQ 잠재 표현 데이터가 너무 짧습니다.")
+
+    magic, version, index_bytes, weight_bits, _, B, H, W, m, K, d = struct.unpack_from(
+        _HEADER_FORMAT, data
+    )
+    if magic != CODEC_MAGIC:
+        raise ValueError("SCQ 잠재 표현 포맷이 아닙니다.")
+    if version != CODEC_VERSION:
+        raise ValueError(f"지원하지 않는 SCQ 잠재 표현 버전입니다: {version}")
+
+    return LatentHeader(version, index_bytes, weight_bits, B, H, W, m, K, d)
+
+
+def unpack_codes(data: bytes) -> Tuple[torch.Tensor, torch.Tensor, LatentHeader]:
+    """
+    바이너리 컨테이너에서 희소 SCQ 코드 복원
+
+    Args:
+        data: pack_codes로 직렬화된 바이트열
+
+    Returns:
+        indices: 코드 인덱스 (B, H, W, m), int64
+        weights: 볼록 결합 계수 (B, H, W, m), float32
+        header: 헤더 정보
+    """
+    header = read_header(data)
+    shape = (header.batch, header.height, header.width, header.num_candidates)
+    count = int(np.prod(shape))
+
+    index_dtype = np.uint8 if header.index_bytes == 1 else np.uint16
+    index_size = count * header.index_bytes
+    expected = _HEADER_SIZE + index_size + count
+    if len(data) != expected:
+        raise ValueError(
+            f"SCQ 잠재 표현 크기가 올바르지 않습니다: {len(data)} (예상: {expected})"
+        )
+
+    index_array = np.frombuffer(data, dtype=index_dtype, count=count, offset=_HEADER_SIZE)
+    weight_array = np.frombuffer(
+        data, dtype=np.uint8, count=count, offset=_HEADER_SIZE + index_size
+    )
+
+    indices = torch.from_numpy(index_array.astype(np.int64)).view(shape)
+    weights = dequantize_weights(
+        torch.from_numpy(weight_array.astype(np.int64)), header.weight_bits
+    ).view(shape)
+
+    return indices, weights, header
@@ -0,0 +1,293 @@
+"""
+SCQ 코드 엔트로피 코더 (rANS)
+
+학습 데이터에서 코드 인덱스/가중치 빈도표를 학습하고,
+희소 SCQ 코드를 rANS(range Asymmetric Numeral Systems) 비트스트림으로 압축한다.
+
+컨테이너 레이아웃 (little-endian):
+    header: magic(4s) version(B) scale_bits(B) weight_bits(B) reserved(B)
+            batch(I) height(I) width(I) num_candidates(I) num_codes(I) latent_dim(I)
+            index_stream_bytes(I)
+    index_stream: rANS로 압축된 코드 인덱스
+    weight_stream: rANS로 압축된 고정소수점 가중치
+        (위치별 합이 고정이므로 마지막 가중치는 저장하지 않음)
+"""
+import struct
+import numpy as np
+import torch
+from typing import Dict, Iterable, Tuple
+
+from app.scq.codec import (
+    WEIGHT_BITS,
+    LatentHeader,
+    dequantize_weights,
+    quantize_weights
+)
+
+ENTROPY_MAGIC = b"SCQE"
+ENTROPY_VERSION = 1
+
+_HEADER_FORMAT = "<4sBBBBIIIIIII"
+_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+
+# rANS 상태 하한 (32비트 상태, 바이트 단위 재정규화)
+RANS_L = 1 << 23
+
+
+class FrequencyTable:
+    """
+    rANS용 정규화된 빈도표
+
+    Args:
+        counts: 심볼별 빈도 (alphabet_size,)
+        scale_bits: 빈도 합의 비트 수 (합 = 2^scale_bits)
+    """
+
+    def __init__(self, counts: np.ndarray, scale_bits: int = 16):
+        counts = np.asarray(counts, dtype=np.float64)
+        alphabet_size = counts.shape[0]
+        total = 1 << scale_bits
+        if alphabet_size > total:
+            raise ValueError(
+                f"심볼 수({alphabet_size})가 빈도 합(2^{scale_bits})보다 큽니다."
+            )
+
+        # 라플라스 스무딩 후 합이 정확히 2^scale_bits 가 되도록 정규화
+        smoothed = counts + 1.0
+        freqs = np.maximum(1, np.floor(smoothed * total / smoothed.sum())).astype(np.int64)
+        diff = total - int(freqs.sum())
+        while diff != 0:
+            # 가장 큰 빈도에서 조정 (최소 1 유지)
+            idx = int(np.argmax(freqs))
+            step = diff if diff > 0 else max(diff, 1 - int(freqs[idx]))
+            freqs[idx] += step
+            diff -= step
+
+        self.scale_bits = scale_bits
+        self.freqs = freqs
+        self.starts = np.concatenate([[0], np.cumsum(freqs)[:-1]]).astype(np.int64)
+        self.lookup = np.repeat(np.arange(alphabet_size, dtype=np.int64), freqs)
+
+    def entropy_bits(self) -> float:
+        """빈도표 기준 심볼당 비트 수 (모델 엔트로피)"""
+        p = self.freqs / float(1 << self.scale_bits)
+        return float(-(p * np.log2(p)).sum())
+
+
+def rans_encode(symbols: np.ndarray, table: FrequencyTable) -> bytes:
+    """
+    심볼 배열을 rANS 바이트열로 인코딩
+
+    Args:
+        symbols: 정수 심볼 배열 (1차원)
+        table: 빈도표
+
+    Returns:
+        압축된 바이트열 (초기 상태 4바이트 + 재정규화 바이트)
+    """
+    scale_bits = table.scale_bits
+    freqs = table.freqs.tolist()
+    starts = table.starts.tolist()
+
+    x = RANS_L
+    out = bytearray()
+    for s in reversed(np.asarray(symbols).ravel().tolist()):
+        freq = freqs[s]
+        x_max = ((RANS_L >> scale_bits) << 8) * freq
+        while x >= x_max:
+            out.append(x & 0xFF)
+            x >>= 8
+        x = ((x // freq) << scale_bits) + (x % freq) + starts[s]
+
+    out.reverse()
+    return x.to_bytes(4, "little") + bytes(out)
+
+
+def rans_decode(data: bytes, count: int, table: FrequencyTable) -> np.ndarray:
+    """
+    rANS 바이트열을 심볼 배열로 디코딩
+
+    Args:
+        data: rans_encode 결과
+        count: 심볼 수
+        table: 인코딩에 사용한 빈도표
+
+    Returns:
+        심볼 배열 (count,), int64
+    """
+    scale_bits = table.scale_bits
+    mask = (1 << scale_bits) - 1
+    freqs = table.freqs.tolist()
+    starts = table.starts.tolist()
+    lookup = table.lookup.tolist()
+
+    x = int.from_bytes(data[:4], "little")
+    pos = 4
+    symbols = [0] * count
+    for i in range(count):
+        slot = x & mask
+        s = lookup[slot]
+        symbols[i] = s
+        x = freqs[s] * (x >> scale_bits) + slot - starts[s]
+        while x < RANS_L:
+            x = (x << 8) | data[pos]
+            pos += 1
+
+    return np.asarray(symbols, dtype=np.int64)
+
+
+class SCQEntropyCoder:
+    """
+    SCQ 희소 코드용 엔트로피 코더
+
+    코드 인덱스와 고정소수점 가중치 각각에 대해 빈도표를 학습한다.
+
+    Args:
+        num_codes: 코드북 크기 (K)
+        scale_bits: rANS 빈도 합 비트 수
+    """
+
+    def __init__(self, num_codes: int, scale_bits: int = 16):
+        self.num_codes = num_codes
+        self.scale_bits = scale_bits
+        self.index_counts = np.zeros(num_codes, dtype=np.int64)
+        self.weight_counts = np.zeros(1 << WEIGHT_BITS, dtype=np.int64)
+        self._tables = None
+
+    def update(self, indices: torch.Tensor, weights: torch.Tensor):
+        """
+        학습 데이터 배치로 빈도 누적
+
+        Args:
+            indices: 코드 인덱스 (..., m)
+            weights: 볼록 결합 계수 (..., m)
+        """
+        index_symbols, weight_symbols = self._to_symbols(indices, weights)
+        self.index_counts += np.bincount(index_symbols, minlength=self.num_codes)
+        self.weight_counts += np.bincount(weight_symbols, minlength=1 << WEIGHT_BITS)
+        self._tables = None
+
+    def fit(self, batches: Iterable[Tuple[torch.Tensor, torch.Tensor]]) -> "SCQEntropyCoder":
+        """(indices, weights) 배치 iterator로 빈도표 학습"""
+        for indices, weights in batches:
+            self.update(indices, weights)
+        return self
+
+    @property
+    def tables(self) -> Tuple[FrequencyTable, FrequencyTable]:
+        """(인덱스 빈도표, 가중치 빈도표)"""
+        if self._tables is None:
+            self._tables = (
+                FrequencyTable(self.index_counts, self.scale_bits),
+                FrequencyTable(self.weight_counts, self.scale_bits)
+            )
+        return self._tables
+
+    def _to_symbols(
+        self,
+        indices: torch.Tensor,
+        weights: torch.Tensor
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """인덱스/가중치를 rANS 심볼 배열로 변환 (마지막 가중치 제외)"""
+        index_symbols = indices.detach().cpu().reshape(-1).numpy().astype(np.int64)
+        q = quantize_weights(weights.detach().cpu())
+        weight_symbols = q[..., :-1].reshape(-1).numpy().astype(np.int64)
+        return index_symbols, weight_symbols
+
+    def encode(
+        self,
+        indices: torch.Tensor,
+        weights: torch.Tensor,
+        latent_dim: int
+    ) -> bytes:
+        """
+        희소 SCQ 코드를 엔트로피 코딩된 비트스트림으로 압축
+
+        Args:
+            indices: 코드 인덱스 (B, H, W, m)
+            weights: 볼록 결합 계수 (B, H, W, m)
+            latent_dim: 코드북 벡터 차원 (d)
+
+        Returns:
+            압축된 바이트열
+        """
+        if indices.dim() != 4 or indices.shape != weights.shape:
+            raise ValueError("indices와 weights는 동일한 (B, H, W, m) shape이어야 합니다.")
+
+        B, H, W, m = indices.shape
+        index_table, weight_table = self.tables
+        index_symbols, weight_symbols = self._to_symbols(indices, weights)
+
+        index_stream = rans_encode(index_symbols, index_table)
+        weight_stream = rans_encode(weight_symbols, weight_table)
+
+        header = struct.pack(
+            _HEADER_FORMAT,
+            ENTROPY_MAGIC, ENTROPY_VERSION, self.scale_bits, WEIGHT_BITS, 0,
+            B, H, W, m, self.num_codes, latent_dim, len(index_stream)
+        )
+        return header + index_stream + weight_stream
+
+    def decode(self, data: bytes) -> Tuple[torch.Tensor, torch.Tensor, LatentHeader]:
+        """
+        엔트로피 코딩된 비트스트림에서 희소 SCQ 코드 복원
+
+        Returns:
+            indices: 코드 인덱스 (B, H, W, m), int64
+            weights: 볼록 결합 계수 (B, H, W, m), float32
+            header: 헤더 정보
+        """
+        if len(data) < _HEADER_SIZE:
+            raise ValueError("SCQ 엔트로피 코딩 데이터가 너무 짧습니다.")
+
+        (magic, version, scale_bits, weight_bits, _,
+         B, H, W, m, K, d, index_stream_bytes) = struct.unpack_from(_HEADER_FORMAT, data)
+        if magic != ENTROPY_MAGIC:
+            raise ValueError("SCQ 엔트로피 코딩 포맷이 아닙니다.")
+        if version != ENTROPY_VERSION:
+            raise ValueError(f"지원하지 않는 SCQ 엔트로피 코딩 버전입니다: {version}")
+        if K != self.num_codes or scale_bits != self.scale_bits:
+            raise ValueError("비트스트림의 코드북 크기/빈도표 설정이 코더와 일치하지 않습니다.")
+
+        index_table, weight_table = self.tables
+        num_positions = B * H * W
+
+        index_stream = data[_HEADER_SIZE:_HEADER_SIZE + index_stream_bytes]
+        weight_stream = data[_HEADER_SIZE + index_stream_bytes:]
+
+        index_symbols = rans_decode(index_stream, num_positions * m, index_table)
+        partial = rans_decode(weight_stream, num_positions * (m - 1), weight_table)
+
+        # 마지막 가중치는 합 제약으로 복원
+        scale = (1 << weight_bits) - 1
+        partial = partial.reshape(num_positions, m - 1)
+        last = scale - partial.sum(axis=1, keepdims=True)
+        q = np.concatenate([partial, last], axis=1)
+
+        shape = (B, H, W, m)
+        indices = torch.from_numpy(index_symbols).view(shape)
+        weights = dequantize_weights(torch.from_numpy(q), weight_bits).view(shape)
+        header = LatentHeader(version, 0, weight_bits, B, H, W, m, K, d)
+
+        return indices, weights, header
+
+    def state_dict(self) -> Dict[str, torch.Tensor]:
+        """빈도표 상태 (torch.save로 저장 가능)"""
+        return {
+            'index_counts': torch.from_numpy(self.index_counts.copy()),
+            'weight_counts': torch.from_numpy(self.weight_counts.copy()),
+            'scale_bits': torch.tensor(self.scale_bits)
+        }
+
+    def load_state_dict(self, state: Dict[str, torch.Tensor]):
+        """빈도표 상태 로드"""
+        self.index_counts = state['index_counts'].numpy().astype(np.int64)
+        self.weight_counts = state['weight_counts'].numpy().astype(np.int64)
+        self.scale_bits = int(state['scale_bits'])
+        self.num_codes = self.index_counts.shape[0]
+        self._tables = None
+
+
+def is_entropy_coded(data: bytes) -> bool:
+    """엔트로피 코딩 컨테이너 여부"""
+    return data[:4] == ENTROPY_MAGIC
@@ -0,0 +1,310 @@
+"""
+SCQ 추론 그래프 export (CPU 서빙용)
+
+encode → quantize → decode 전체를 고정 코드북과 미분 없는 솔버로 묶어
+TorchScript(trace) 또는 torch.compile 모듈로 변환한다.
+
+- 고정 코드북: 코드북과 ||c_k||^2 를 buffer로 고정
+- channels-last 메모리 레이아웃
+- conv 레이어 int8 양자화 (FX 그래프 모드 post-training static quantization)
+"""
+import copy
+import time
+import torch
+import torch.nn as nn
+from typing import Dict, Optional, Tuple
+
+from app.scq.scq_autoencoder import SCQAutoencoder
+from app.scq.simplex_solver import fista_simplex
+
+EXPORT_BACKENDS = ("eager", "trace", "compile")
+# 현재 엔진을 쓸 수 없을 때의 양자화 엔진 우선순위 (x86/fbgemm: x86 CPU, qnnpack: ARM CPU)
+QUANTIZED_ENGINES = ("x86", "fbgemm", "qnnpack")
+
+
+class SCQInferenceModule(nn.Module):
+    """
+    고정 코드북 SCQ 추론 모듈
+
+    Forward는 호스트 동기화가 없는 고정 반복 솔버만 사용하므로 trace/compile 가능하다.
+
+    Args:
+        encoder: 인코더
+        decoder: 디코더
+        codebook: 코드북 (K, d)
+        lam: 정규화 계수 (λ)
+        num_candidates: 위치별 후보 코드 수 (m)
+        num_iters: FISTA 반복 횟수 (고정)
+        hard: True이면 최근접 코드 하드 할당 (m = 1)
+    """
+
+    def __init__(
+        self,
+        encoder: nn.Module,
+        decoder: nn.Module,
+        codebook: torch.Tensor,
+        lam: float,
+        num_candidates: int = 8,
+        num_iters: int = 50,
+        hard: bool = False
+    ):
+        super(SCQInferenceModule, self).__init__()
+
+        self.encoder = encoder
+        self.decoder = decoder
+        self.lam = lam
+        self.num_candidates = 1 if hard else min(num_candidates, codebook.shape[0])
+        self.num_iters = num_iters
+        self.hard = hard
+
+        codebook = codebook.detach().clone()
+        self.register_buffer("codebook", codebook)
+        self.register_buffer("codebook_sq", (codebook * codebook).sum(dim=-1))
+
+    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Args:
+            x: 입력 이미지 (B, C, H, W)
+
+        Returns:
+            x_recon: 재구성된 이미지 (B, C, H, W)
+            indices: 코드 인덱스 (B, H', W', m)
+            weights: 볼록 결합 계수 (B, H', W', m)
+        """
+        z = self.encoder(x)
+        B, D, H, W = z.shape
+        z_flat = z.permute(0, 2, 3, 1).reshape(B * H * W, D)
+
+        # ||z||^2 항은 순위에 무관
+        dist = self.codebook_sq - 2.0 * (z_flat @ self.codebook.T)
+        m = self.num_candidates
+
+        if self.hard:
+            indices = dist.argmin(dim=-1, keepdim=True)
+            weights = torch.ones_like(indices, dtype=z_flat.dtype)
+        else:
+            indices = torch.topk(dist, m, dim=-1, largest=False).indices
+            candidates = self.codebook[indices]  # (N, m, d)
+            eye = torch.eye(m, device=z_flat.device, dtype=z_flat.dtype)
+            gram = torch.bmm(candidates, candidates.transpose(1, 2)) + self.lam * eye
+            b = torch.bmm(candidates, z_flat.unsqueeze(-1)).squeeze(-1)
+            lipschitz = torch.linalg.eigvalsh(gram)[:, -1:]
+            # tol=0: 수렴 검사(.item())를 하지 않아 그래프가 고정됨
+            weights = fista_simplex(gram, b, lipschitz, num_iters=self.num_iters, tol=0.0)
+
+        z_q_flat = (weights.unsqueeze(-1) * self.codebook[indices]).sum(dim=1)
+        z_q = z_q_flat.view(B, H, W, D).permute(0, 3, 1, 2)
+        if x.is_contiguous(memory_format=torch.channels_last):
+            z_q = z_q.contiguous(memory_format=torch.channels_last)
+        else:
+            z_q = z_q.contiguous()
+
+        x_recon = self.decoder(z_q)
+        return x_recon, indices.view(B, H, W, m), weights.view(B, H, W, m)
+
+
+def default_quantized_engine() -> str:
+    """int8 변환에 쓸 양자화 엔진 (현재 엔진, 설정되지 않았으면 지원되는 엔진 중 우선순위 순)"""
+    supported = torch.backends.quantized.supported_engines
+    current = torch.backends.quantized.engine
+    # 일부 빌드는 supported_engines에 'none'을 포함함
+    if current in supported and current != "none":
+        return current
+    for engine in QUANTIZED_ENGINES:
+        if engine in supported:
+            return engine
+    raise ValueError(f"int8 양자화 엔진을 사용할 수 없습니다 (지원: {supported})")
+
+
+def quantize_conv_int8(
+    module: nn.Module,
+    example_input: torch.Tensor,
+    backend: Optional[str] = None
+) -> nn.Module:
+    """
+    conv 레이어 int8 양자화 (post-training static quantization)
+
+    PyTorch 동적 양자화는 Conv 레이어를 지원하지 않으므로, 예시 입력으로
+    활성값 범위를 보정(calibration)하는 FX 그래프 모드 정적 양자화를 사용한다.
+
+    양자화 엔진(torch.backends.quantized.engine)은 프로세스 전역 설정이므로 변환하는 동안만
+    바꾸고 되돌린다. 패킹된 int8 가중치는 변환한 엔진에서만 실행되므로 기본값은 현재 엔진이다.
+
+    Args:
+        module: 양자화할 모듈 (eval 모드)
+        example_input: 보정용 예시 입력
+        backend: 양자화 엔진 (None이면 현재 엔진, 없으면 x86 → fbgemm → qnnpack 중 지원되는 것)
+
+    Returns:
+        int8 conv를 사용하는 모듈 (입출력은 float)
+
+    Raises:
+        ValueError: 이 빌드/CPU에서 지원하지 않는 엔진
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    backend = backend or default_quantized_engine()
+    supported = torch.backends.quantized.supported_engines
+    if backend not in supported or backend == "none":
+        raise ValueError(f"지원하지 않는 양자화 엔진입니다: {backend} (가능: {supported})")
+
+    previous = torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+    try:
+        qconfig_mapping = get_default_qconfig_mapping(backend)
+        prepared = prepare_fx(copy.deepcopy(module).eval(), qconfig_mapping, (example_input,))
+        with torch.no_grad():
+            prepared(example_input)
+        return convert_fx(prepared)
+    finally:
+        torch.backends.quantized.engine = previous
+
+
+def export_inference_module(
+    model: SCQAutoencoder,
+    example_input: torch.Tensor,
+    num_candidates: int = 8,
+    num_iters: int = 50,
+    hard: bool = False,
+    channels_last: bool = True,
+    quantize_int8: bool = False,
+    backend: str = "trace"
+) -> nn.Module:
+    """
+    SCQAutoencoder를 CPU 서빙용 추론 모듈로 export
+
+    Args:
+        model: 학습된 SCQ Autoencoder
+        example_input: 예시 입력 (trace 및 int8 보정에 사용)
+        num_candidates: 위치별 후보 코드 수 (m)
+        num_iters: FISTA 반복 횟수
+        hard: 최근접 코드 하드 할당 사용 여부
+        channels_last: channels-last 메모리 레이아웃 사용 여부
+        quantize_int8: conv 레이어 int8 양자화 여부
+        backend: "eager", "trace"(TorchScript), "compile"(torch.compile)
+
+    Returns:
+        추론 모듈 (forward(x) -> (x_recon, indices, weights))
+    """
+    if backend not in EXPORT_BACKENDS:
+        raise ValueError(f"지원하지 않는 export 백엔드입니다: {backend} (가능: {EXPORT_BACKENDS})")
+
+    model = model.eval()
+    encoder = copy.deepcopy(model.encoder).eval()
+    decoder = copy.deepcopy(model.decoder).eval()
+
+    memory_format = torch.channels_last if channels_last else torch.contiguous_format
+    example_input = example_input.contiguous(memory_format=memory_format)
+
+    if quantize_int8:
+        with torch.no_grad():
+            example_z = encoder(example_input)
+        encoder = quantize_conv_int8(encoder, example_input)
+        decoder = quantize_conv_int8(decoder, example_z.contiguous(memory_format=memory_format))
+
+    module = SCQInferenceModule(
+        encoder,
+        decoder,
+        model.scq_layer.codebook,
+        model.scq_layer.lam,
+        num_candidates=num_candidates,
+        num_iters=num_iters,
+        hard=hard
+    ).eval()
+    module = module.to(memory_format=memory_format)
+
+    for param in module.parameters():
+        param.requires_grad_(False)
+
+    if backend == "trace":
+        with torch.no_grad():
+            module = torch.jit.trace(module, (example_input,), check_trace=False)
+            module = torch.jit.freeze(module)
+    elif backend == "compile":
+        module = torch.compile(module)
+
+    return module
+
+
+def benchmark_latency(
+    fn,
+    x: torch.Tensor,
+    warmup: int = 3,
+    iters: int = 10
+) -> Dict[str, float]:
+    """
+    프레임당 지연 시간 측정
+
+    Args:
+        fn: x를 입력으로 받는 호출 가능 객체
+        x: 입력 이미지 배치 (B, C, H, W)
+        warmup: 워밍업 반복 수
+        iters: 측정 반복 수
+
+    Returns:
+        batch_ms: 배치당 평균 지연 시간 (ms)
+        frame_ms: 프레임당 평균 지연 시간 (ms)
+    """
+    with torch.no_grad():
+        for _ in range(warmup):
+            fn(x)
+        start = time.perf_counter()
+        for _ in range(iters):
+            fn(x)
+        elapsed = time.perf_counter() - start
+
+    batch_ms = elapsed / iters * 1000.0
+    return {
+        'batch_ms': batch_ms,
+        'frame_ms': batch_ms / x.shape[0]
+    }
+
+
+def compare_with_eager(
+    model: SCQAutoencoder,
+    x: torch.Tensor,
+    exported: Optional[nn.Module] = None,
+    num_candidates: int = 8,
+    warmup: int = 3,
+    iters: int = 10
+) -> Dict[str, Dict[str, float]]:
+    """
+    eager 모델과 export 모듈의 지연 시간 비교
+
+    - eager: 같은 알고리즘(top-m 희소 양자화, quantize_sparse)의 eager 실행 → export 자체의 효과
+    - eager_full: 전체 코드북 quantize (학습 경로) → 알고리즘 변경까지 포함한 참고값
+
+    Args:
+        num_candidates: 위치별 후보 코드 수 (m, exported와 같은 값이어야 하며 하드 할당이면 1)
+
+    Returns:
+        {'eager': {...}, 'eager_full': {...}, 'exported': {...},
+         'speedup': {'frame': eager 대비, 'frame_vs_full': eager_full 대비}}
+    """
+    model = model.eval()
+    if exported is None:
+        exported = export_inference_module(model, x, num_candidates=num_candidates)
+
+    def eager_fn(inp):
+        z_q, _, _ = model.quantize_sparse(model.encode(inp), num_candidates=num_candidates)
+        return model.decode(z_q)
+
+    def eager_full_fn(inp):
+        z_q, _, _ = model.quantize(model.encode(inp))
+        return model.decode(z_q)
+
+    eager = benchmark_latency(eager_fn, x, warmup=warmup, iters=iters)
+    eager_full = benchmark_latency(eager_full_fn, x, warmup=warmup, iters=iters)
+    fast = benchmark_latency(exported, x, warmup=warmup, iters=iters)
+
+    frame_ms = max(fast['frame_ms'], 1e-9)
+    return {
+        'eager': eager,
+        'eager_full': eager_full,
+        'exported': fast,
+        'speedup': {
+            'frame': eager['frame_ms'] / frame_ms,
+            'frame_vs_full': eager_full['frame_ms'] / frame_ms
+        }
+    }
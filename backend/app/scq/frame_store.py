@@ -0,0 +1,360 @@
+"""
+SCQ 학습용 메모리 맵 프레임 저장소
+
+전처리된 프레임을 uint8 샤드 파일(raw, (N, C, H, W))로 나누어 저장하고
+index.json에 샤드 목록과 프레임 shape을 기록한다. 읽기는 np.memmap으로
+필요한 페이지만 올리므로 RAM보다 큰 AR 캡처 코퍼스로도 학습할 수 있다.
+
+디렉토리 레이아웃:
+    index.json          {"version", "frame_shape", "dtype", "shards": [{"file", "num_frames"}]}
+    shard_00000.u8      (num_frames, C, H, W) uint8
+    shard_00001.u8      ...
+"""
+import bisect
+import json
+import os
+import queue
+import threading
+import numpy as np
+import torch
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from torch.utils.data import DataLoader, Dataset, Sampler
+
+FRAME_STORE_VERSION = 1
+INDEX_FILENAME = "index.json"
+
+
+def frames_to_uint8(frames: Union[torch.Tensor, np.ndarray]) -> np.ndarray:
+    """
+    프레임 배치를 uint8 (N, C, H, W) 배열로 변환
+
+    float 입력은 [0, 1] 범위로 간주하여 255를 곱해 반올림한다.
+    """
+    if isinstance(frames, torch.Tensor):
+        frames = frames.detach().cpu().numpy()
+    frames = np.asarray(frames)
+    if frames.dtype != np.uint8:
+        frames = np.clip(np.rint(frames.astype(np.float32) * 255.0), 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(frames)
+
+
+def frames_to_float(x: torch.Tensor) -> torch.Tensor:
+    """uint8 프레임 배치를 [0, 1] float32로 변환 (float 입력은 그대로 반환)"""
+    if x.dtype == torch.uint8:
+        return x.float().div_(255.0)
+    return x
+
+
+class FrameStoreWriter:
+    """
+    샤드 단위 프레임 저장소 작성기
+
+    Args:
+        root: 저장 디렉토리
+        frame_shape: 프레임 shape (C, H, W)
+        shard_size: 샤드당 프레임 수
+    """
+
+    def __init__(self, root: Path, frame_shape: Sequence[int], shard_size: int = 4096):
+        if shard_size <= 0:
+            raise ValueError("shard_size는 1 이상이어야 합니다.")
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.frame_shape = tuple(int(s) for s in frame_shape)
+        self.shard_size = shard_size
+
+        self._shards: List[dict] = []
+        self._file = None
+        self._current_frames = 0
+        self._closed = False
+
+    def _open_shard(self):
+        name = f"shard_{len(self._shards):05d}.u8"
+        self._file = open(self.root / name, "wb")
+        self._shards.append({'file': name, 'num_frames': 0})
+        self._current_frames = 0
+
+    def append(self, frames: Union[torch.Tensor, np.ndarray]):
+        """
+        프레임 배치 추가
+
+        Args:
+            frames: (N, C, H, W) uint8 또는 [0, 1] 범위 float
+        """
+        if self._closed:
+            raise RuntimeError("이미 닫힌 프레임 저장소입니다.")
+
+        frames = frames_to_uint8(frames)
+        if frames.ndim == len(self.frame_shape):
+            frames = frames[None]
+        if tuple(frames.shape[1:]) != self.frame_shape:
+            raise ValueError(
+                f"프레임 shape이 일치하지 않습니다: {tuple(frames.shape[1:])} (예상: {self.frame_shape})"
+            )
+
+        offset = 0
+        while offset < len(frames):
+            if self._file is None or self._current_frames == self.shard_size:
+                self._close_shard()
+                self._open_shard()
+            count = min(self.shard_size - self._current_frames, len(frames) - offset)
+            self._file.write(frames[offset:offset + count].tobytes())
+            self._current_frames += count
+            self._shards[-1]['num_frames'] = self._current_frames
+            offset += count
+
+    def _close_shard(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """현재 샤드를 닫고 index.json을 원자적으로 기록"""
+        if self._closed:
+            return
+        self._close_shard()
+
+        index = {
+            'version': FRAME_STORE_VERSION,
+            'frame_shape': list(self.frame_shape),
+            'dtype': 'uint8',
+            'shards': self._shards
+        }
+        tmp_path = self.root / f".{INDEX_FILENAME}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.root / INDEX_FILENAME)
+        self._closed = True
+
+    def __enter__(self) -> "FrameStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_frame_store(
+    root: Path,
+    batches: Iterable[Union[torch.Tensor, np.ndarray]],
+    frame_shape: Sequence[int],
+    shard_size: int = 4096
+) -> Path:
+    """
+    프레임 배치 iterator를 프레임 저장소로 기록
+
+    Returns:
+        저장소 디렉토리
+    """
+    with FrameStoreWriter(root, frame_shape, shard_size=shard_size) as writer:
+        for frames in batches:
+            writer.append(frames)
+    return Path(root)
+
+
+def write_frame_store_from_images(
+    root: Path,
+    image_paths: Iterable[Path],
+    size: Tuple[int, int] = (64, 64),
+    shard_size: int = 4096
+) -> Path:
+    """
+    이미지 파일을 RGB로 읽어 리사이즈한 뒤 프레임 저장소로 기록
+
+    Args:
+        root: 저장소 디렉토리
+        image_paths: 이미지 파일 경로들
+        size: (H, W)
+        shard_size: 샤드당 프레임 수
+    """
+    from PIL import Image
+
+    height, width = size
+    with FrameStoreWriter(root, (3, height, width), shard_size=shard_size) as writer:
+        for path in image_paths:
+            with Image.open(path) as image:
+                image = image.convert("RGB").resize((width, height), Image.BILINEAR)
+                writer.append(np.asarray(image, dtype=np.uint8).transpose(2, 0, 1))
+    return Path(root)
+
+
+class MMapFrameDataset(Dataset):
+    """
+    메모리 맵 프레임 데이터셋
+
+    샤드는 처음 접근할 때 워커 프로세스별로 np.memmap으로 연다.
+    __getitem__은 메모리 맵 슬라이스를 복사 없이 uint8 텐서 (C, H, W)로 반환하며,
+    float 변환은 배치 단위로 학습 루프에서 수행한다 (frames_to_float).
+
+    Args:
+        root: FrameStoreWriter로 만든 저장소 디렉토리
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        with open(self.root / INDEX_FILENAME, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get('version') != FRAME_STORE_VERSION:
+            raise ValueError(f"지원하지 않는 프레임 저장소 버전입니다: {index.get('version')}")
+
+        self.frame_shape = tuple(index['frame_shape'])
+        self.shard_files = [s['file'] for s in index['shards']]
+        self.shard_sizes = [int(s['num_frames']) for s in index['shards']]
+        # 샤드별 시작 인덱스 (이진 탐색용)
+        self._offsets = np.concatenate([[0], np.cumsum(self.shard_sizes)]).astype(np.int64).tolist()
+        self._maps: List[Optional[np.memmap]] = [None] * len(self.shard_files)
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __getstate__(self):
+        # 워커로 전달할 때 열린 메모리 맵은 넘기지 않음 (워커에서 다시 연다)
+        state = self.__dict__.copy()
+        state['_maps'] = [None] * len(self.shard_files)
+        return state
+
+    def _shard(self, shard_idx: int) -> np.memmap:
+        shard = self._maps[shard_idx]
+        if shard is None:
+            # copy-on-write 모드: 파일은 수정되지 않고 torch.from_numpy가 쓰기 가능 배열을 받음
+            shard = np.memmap(
+                self.root / self.shard_files[shard_idx],
+                dtype=np.uint8,
+                mode="c",
+                shape=(self.shard_sizes[shard_idx],) + self.frame_shape
+            )
+            self._maps[shard_idx] = shard
+        return shard
+
+    def _locate(self, idx: int) -> Tuple[int, int]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"프레임 인덱스 범위를 벗어났습니다: {idx}")
+        shard_idx = bisect.bisect_right(self._offsets, idx) - 1
+        return shard_idx, idx - self._offsets[shard_idx]
+
+    def __getitem__(self, idx: int) -> torch.Tensor:
+        shard_idx, local_idx = self._locate(int(idx))
+        return torch.from_numpy(self._shard(shard_idx)[local_idx])
+
+
+class DevicePrefetcher:
+    """
+    백그라운드 스레드 배치 프리페처
+
+    DataLoader에서 다음 배치들을 미리 꺼내 디바이스로 (pinned 메모리면 non_blocking) 옮겨 둔다.
+    len(), dataset, batch_size, sampler는 원래 로더를 그대로 따르므로 학습 루프에 바로 넘길 수 있다.
+
+    Args:
+        loader: 원본 DataLoader
+        device: 대상 디바이스
+        depth: 미리 준비해 둘 배치 수
+    """
+
+    def __init__(self, loader: DataLoader, device: Optional[torch.device] = None, depth: int = 2):
+        self.loader = loader
+        self.device = device
+        self.depth = max(1, depth)
+
+    @property
+    def dataset(self) -> Dataset:
+        return self.loader.dataset
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        return self.loader.batch_size
+
+    @property
+    def sampler(self) -> Sampler:
+        return self.loader.sampler
+
+    def __len__(self) -> int:
+        return len(self.loader)
+
+    def __iter__(self) -> Iterator[torch.Tensor]:
+        batches: "queue.Queue" = queue.Queue(maxsize=self.depth)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # 소비자가 먼저 멈추면(break 등) 큐가 가득 차 있어도 바로 빠져나옴
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for batch in self.loader:
+                    if self.device is not None:
+                        batch = batch.to(self.device, non_blocking=batch.is_pinned())
+                    if not put(batch):
+                        return
+            except BaseException as e:  # 소비 스레드에서 다시 발생
+                put(e)
+                return
+            put(done)
+
+        thread = threading.Thread(target=produce, name="scq-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+
+def make_frame_loader(
+    dataset: Dataset,
+    batch_size: int = 32,
+    shuffle: bool = True,
+    num_workers: int = 4,
+    prefetch_factor: int = 4,
+    pin_memory: Optional[bool] = None,
+    sampler: Optional[Sampler] = None,
+    drop_last: bool = False
+) -> DataLoader:
+    """
+    프레임 데이터셋용 DataLoader
+
+    워커는 에폭 사이에도 유지(persistent_workers)되어 메모리 맵과 페이지 캐시를 재사용하고,
+    워커당 prefetch_factor 배치를 미리 읽는다. pin_memory는 기본적으로 CUDA 사용 시에만 켠다.
+
+    Args:
+        dataset: 프레임 데이터셋 (보통 MMapFrameDataset)
+        batch_size: 배치 크기
+        shuffle: 셔플 여부 (sampler 지정 시 무시)
+        num_workers: 로더 워커 프로세스 수 (0이면 메인 프로세스에서 읽음)
+        prefetch_factor: 워커당 미리 읽을 배치 수
+        pin_memory: pinned 메모리 사용 여부 (None이면 CUDA 사용 가능 여부)
+        sampler: 샘플러 (예: DistributedSampler)
+        drop_last: 마지막 불완전 배치 버림 여부
+    """
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+
+    kwargs = {}
+    if num_workers > 0:
+        kwargs.update(persistent_workers=True, prefetch_factor=prefetch_factor)
+
+    return DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=shuffle if sampler is None else False,
+        sampler=sampler,
+        num_workers=num_workers,
+        pin_memory=pin_memory,
+        drop_last=drop_last,
+        **kwargs
+    )
@@ -0,0 +1,145 @@
+"""
+SCQ 학습 지표 누적기
+
+손실 항목, 엔트로피, sparsity, 코드별 사용량 히스토그램을 디바이스 텐서로 누적하고
+N 스텝마다 또는 에폭 종료 시에만 호스트로 한 번에 가져온다.
+"""
+import torch
+from typing import Dict, Optional
+
+
+class SCQMetrics:
+    """
+    디바이스 상주 지표 누적기
+
+    Args:
+        num_codes: 코드북 크기 (K)
+        flush_every: 몇 스텝마다 호스트로 flush할지 (0이면 수동 flush만)
+        device: 누적 텐서 디바이스
+    """
+
+    def __init__(
+        self,
+        num_codes: int,
+        flush_every: int = 10,
+        device: Optional[torch.device] = None
+    ):
+        self.num_codes = num_codes
+        self.flush_every = flush_every
+        self.device = device
+
+        self._sums: Dict[str, torch.Tensor] = {}
+        self._count = 0
+        self._steps = 0
+
+        # 구간 히스토그램(flush마다 초기화)과 누적 히스토그램(reset_usage 전까지 유지)
+        self._window_usage: Optional[torch.Tensor] = None
+        self._total_usage: Optional[torch.Tensor] = None
+
+    def update(self, loss_dict: Dict[str, torch.Tensor], stats: Optional[Dict] = None):
+        """
+        한 스텝의 지표 누적 (호스트 동기화 없음)
+
+        Args:
+            loss_dict: compute_loss(..., return_tensors=True) 결과
+            stats: SCQ 레이어 통계 (code_usage 포함 시 히스토그램 누적)
+        """
+        for key, value in loss_dict.items():
+            value = torch.as_tensor(value).detach().float()
+            if self.device is None:
+                self.device = value.device
+            value = value.to(self.device)
+            if key in self._sums:
+                self._sums[key] += value
+            else:
+                self._sums[key] = value.clone()
+
+        if stats is not None and 'code_usage' in stats:
+            usage = stats['code_usage'].detach().to(self.device, torch.float64)
+            if self._window_usage is None:
+                self._window_usage = torch.zeros_like(usage)
+                self._total_usage = torch.zeros_like(usage)
+            self._window_usage += usage
+            self._total_usage += usage
+
+        self._count += 1
+        self._steps += 1
+
+    def should_flush(self) -> bool:
+        """flush 주기 도달 여부"""
+        return self.flush_every > 0 and self._count > 0 and self._steps % self.flush_every == 0
+
+    def flush(self) -> Dict[str, float]:
+        """
+        누적 평균을 호스트로 가져오고 구간 누적값 초기화
+
+        모든 값을 하나의 텐서로 묶어 동기화는 한 번만 발생한다.
+
+        Returns:
+            항목별 평균 및 구간 코드 사용 통계 (num_used_codes, perplexity)
+        """
+        if self._count == 0:
+            return {}
+
+        keys = list(self._sums)
+        values = [self._sums[k] / self._count for k in keys]
+
+        if self._window_usage is not None:
+            keys += ['num_used_codes', 'usage_perplexity']
+            values += [
+                (self._window_usage > 0).sum().float(),
+                self._perplexity(self._window_usage).float()
+            ]
+
+        host = torch.stack([v.float().reshape(()) for v in values]).tolist()
+        result = dict(zip(keys, host))
+        result['steps'] = self._count
+
+        self._sums = {}
+        self._count = 0
+        if self._window_usage is not None:
+            self._window_usage.zero_()
+
+        return result
+
+    @staticmethod
+    def _perplexity(usage: torch.Tensor) -> torch.Tensor:
+        """코드 사용 분포의 perplexity (exp(엔트로피), 1 ~ K)"""
+        p = usage / usage.sum().clamp(min=1)
+        entropy = -(p * torch.log(p.clamp(min=1e-12))).sum()
+        return torch.exp(entropy)
+
+    @property
+    def code_usage(self) -> Optional[torch.Tensor]:
+        """누적 코드별 사용량 히스토그램 (K,), 디바이스 텐서"""
+        return self._total_usage
+
+    def usage_summary(self, dead_threshold: float = 0.0) -> Dict[str, float]:
+        """
+        코드북 collapse 모니터링용 누적 사용량 요약
+
+        Args:
+            dead_threshold: 사용 비율이 이 값 이하인 코드를 dead로 간주
+
+        Returns:
+            num_used_codes, num_dead_codes, usage_perplexity
+        """
+        if self._total_usage is None:
+            return {}
+
+        fraction = self._total_usage / self._total_usage.sum().clamp(min=1)
+        host = torch.stack([
+            (self._total_usage > 0).sum().float(),
+            (fraction <= dead_threshold).sum().float(),
+            self._perplexity(self._total_usage).float()
+        ]).tolist()
+        return {
+            'num_used_codes': host[0],
+            'num_dead_codes': host[1],
+            'usage_perplexity': host[2]
+        }
+
+    def reset_usage(self):
+        """누적 히스토그램 초기화"""
+        if self._total_usage is not None:
+            self._total_usage.zero_()
@@ -0,0 +1,294 @@
+"""
+SCQ 로컬 모델 레지스트리
+
+체크포인트를 하이퍼파라미터(latent_dim, num_codes, scq_lambda 등), 평가 지표,
+내용 해시(sha256)와 함께 버전별로 저장한다.
+
+디렉토리 구조:
+    {root}/{name}/v1/model.pth     가중치 (state_dict)
+    {root}/{name}/v1/meta.json     메타데이터
+    {root}/{name}/CURRENT          서비스할 버전 이름
+
+- 버전 디렉토리는 임시 디렉토리에 쓴 뒤 이름 변경으로 한 번에 나타난다
+- CURRENT는 임시 파일에 쓴 뒤 os.replace로 원자적으로 교체된다
+- load()는 가중치를 메모리 맵으로 읽어 복사 없이 모델에 연결한다
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import torch
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from app.scq.scq_autoencoder import SCQAutoencoder
+
+REGISTRY_VERSION = 1
+WEIGHTS_FILENAME = "model.pth"
+META_FILENAME = "meta.json"
+CURRENT_FILENAME = "CURRENT"
+CODEBOOK_KEY = "scq_layer.codebook"
+
+# SCQAutoencoder 생성에 필요한 하이퍼파라미터
+HYPERPARAM_KEYS = ("input_channels", "latent_dim", "num_codes", "scq_lambda")
+
+_VERSION_PATTERN = re.compile(r"^v(\d+)$")
+
+
+class ModelVersion(NamedTuple):
+    """등록된 모델 버전 1건"""
+    name: str
+    version: str
+    path: Path
+    sha256: str
+    hyperparams: Dict[str, Any]
+    metrics: Dict[str, float]
+    created_at: str
+    source: Optional[str] = None
+
+    @property
+    def weights_path(self) -> Path:
+        return self.path / WEIGHTS_FILENAME
+
+    @property
+    def label(self) -> str:
+        """로그/응답용 이름 (예: scq_nav@v3)"""
+        return f"{self.name}@{self.version}"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """파일 내용 sha256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_hyperparams(model: SCQAutoencoder) -> Dict[str, Any]:
+    """모델 인스턴스에서 하이퍼파라미터 추출"""
+    return {
+        "input_channels": model.encoder.conv_layers[0].in_channels,
+        "latent_dim": model.latent_dim,
+        "num_codes": model.num_codes,
+        "scq_lambda": model.scq_layer.lam
+    }
+
+
+def _load_state_dict(source: Union[str, Path]) -> Dict[str, torch.Tensor]:
+    """에폭 체크포인트(state_dict)와 재개용 체크포인트({'model': ...}) 모두 지원"""
+    state = torch.load(source, map_location="cpu", weights_only=False)
+    if isinstance(state, dict) and 'model' in state:
+        state = state['model']
+    return state
+
+
+class ModelRegistry:
+    """
+    파일 시스템 기반 SCQ 모델 레지스트리
+
+    Args:
+        root: 레지스트리 루트 디렉토리
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _model_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def names(self) -> List[str]:
+        """등록된 모델 이름 목록"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    def versions(self, name: str) -> List[ModelVersion]:
+        """모델의 전체 버전 (오래된 순)"""
+        model_dir = self._model_dir(name)
+        if not model_dir.exists():
+            return []
+        numbered = []
+        for path in model_dir.iterdir():
+            match = _VERSION_PATTERN.match(path.name)
+            if match and (path / META_FILENAME).exists():
+                numbered.append((int(match.group(1)), path))
+        return [self._read_meta(name, path) for _, path in sorted(numbered)]
+
+    def _read_meta(self, name: str, path: Path) -> ModelVersion:
+        with open(path / META_FILENAME, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("registry_version") != REGISTRY_VERSION:
+            raise ValueError(f"지원하지 않는 레지스트리 버전입니다: {meta.get('registry_version')}")
+        return ModelVersion(
+            name=name,
+            version=path.name,
+            path=path,
+            sha256=meta["sha256"],
+            hyperparams=meta["hyperparams"],
+            metrics=meta.get("metrics", {}),
+            created_at=meta["created_at"],
+            source=meta.get("source")
+        )
+
+    def current(self, name: str) -> Optional[str]:
+        """서비스할 버전 이름 (지정되지 않았으면 None)"""
+        path = self._model_dir(name) / CURRENT_FILENAME
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8").strip() or None
+
+    def get(self, name: str, version: Optional[str] = None) -> ModelVersion:
+        """
+        버전 조회 (None이면 CURRENT, CURRENT가 없으면 최신 버전)
+
+        Raises:
+            KeyError: 등록되지 않은 모델/버전
+        """
+        version = version or self.current(name)
+        if version is None:
+            versions = self.versions(name)
+            if not versions:
+                raise KeyError(f"등록된 모델이 없습니다: {name}")
+            return versions[-1]
+
+        # 경로로 쓰이므로 vN 형식만 허용 ("../other/v3" 등 차단)
+        if not _VERSION_PATTERN.match(version):
+            raise KeyError(f"올바르지 않은 모델 버전입니다: {version}")
+        path = self._model_dir(name) / version
+        if not (path / META_FILENAME).exists():
+            raise KeyError(f"등록되지 않은 모델 버전입니다: {name}@{version}")
+        return self._read_meta(name, path)
+
+    def register(
+        self,
+        name: str,
+        model: Union[SCQAutoencoder, Dict[str, torch.Tensor], str, Path],
+        hyperparams: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Dict[str, float]] = None,
+        promote: bool = False
+    ) -> ModelVersion:
+        """
+        새 버전 등록
+
+        Args:
+            name: 모델 이름 (예: scq_nav)
+            model: 모델 인스턴스, state_dict 또는 체크포인트 경로
+            hyperparams: 하이퍼파라미터 (모델 인스턴스면 생략 가능)
+            metrics: 평가 지표 (PSNR, SSIM 등)
+            promote: 등록 후 CURRENT로 지정할지 여부
+
+        Returns:
+            등록된 버전 (같은 내용의 가중치가 이미 있으면 기존 버전)
+        """
+        source = None
+        if isinstance(model, SCQAutoencoder):
+            hyperparams = {**model_hyperparams(model), **(hyperparams or {})}
+            state = model.state_dict()
+        elif isinstance(model, (str, Path)):
+            source = str(model)
+            state = _load_state_dict(model)
+        else:
+            state = model
+
+        missing = [key for key in ("latent_dim", "num_codes", "scq_lambda") if key not in (hyperparams or {})]
+        if missing:
+            raise ValueError(f"하이퍼파라미터가 누락되었습니다: {missing}")
+        hyperparams = {key: hyperparams[key] for key in HYPERPARAM_KEYS if key in hyperparams}
+
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = model_dir / f".tmp-{os.getpid()}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}"
+        tmp_dir.mkdir()
+        try:
+            weights_path = tmp_dir / WEIGHTS_FILENAME
+            torch.save({key: value.detach().cpu() for key, value in state.items()}, weights_path)
+            sha256 = file_sha256(weights_path)
+
+            existing = next((v for v in self.versions(name) if v.sha256 == sha256), None)
+            if existing is not None:
+                shutil.rmtree(tmp_dir)
+                if promote:
+                    self.promote(name, existing.version)
+                return existing
+
+            meta = {
+                "registry_version": REGISTRY_VERSION,
+                "sha256": sha256,
+                "hyperparams": hyperparams,
+                "metrics": {key: float(value) for key, value in (metrics or {}).items()},
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "source": source
+            }
+            with open(tmp_dir / META_FILENAME, "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+
+            # 번호가 겹치면 (동시 등록) 다음 번호로 재시도
+            while True:
+                existing_numbers = [
+                    int(m.group(1)) for m in (_VERSION_PATTERN.match(p.name) for p in model_dir.iterdir()) if m
+                ]
+                version = f"v{max(existing_numbers, default=0) + 1}"
+                try:
+                    os.rename(tmp_dir, model_dir / version)
+                    break
+                except OSError:
+                    if not (model_dir / version).exists():
+                        raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if promote:
+            self.promote(name, version)
+        return self.get(name, version)
+
+    def promote(self, name: str, version: str):
+        """서비스할 버전 지정 (CURRENT 원자적 교체)"""
+        self.get(name, version)
+        model_dir = self._model_dir(name)
+        tmp_path = model_dir / f".{CURRENT_FILENAME}.tmp"
+        tmp_path.write_text(version, encoding="utf-8")
+        os.replace(tmp_path, model_dir / CURRENT_FILENAME)
+
+    def load(
+        self,
+        name: str,
+        version: Optional[str] = None,
+        mmap: bool = True,
+        verify: bool = False
+    ) -> Tuple[SCQAutoencoder, ModelVersion]:
+        """
+        버전의 모델 로드 (CPU, eval 모드)
+
+        Args:
+            name: 모델 이름
+            version: 버전 (None이면 CURRENT 또는 최신)
+            mmap: 가중치를 메모리 맵으로 읽어 복사 없이 연결
+            verify: 가중치 파일 전체를 읽어 sha256 검증 (등록 시 이미 계산하므로 기본은 생략해 콜드 스타트 비용을 줄임)
+
+        Raises:
+            KeyError: 등록되지 않은 모델/버전
+            ValueError: 가중치 해시 불일치
+        """
+        entry = self.get(name, version)
+        if verify and file_sha256(entry.weights_path) != entry.sha256:
+            raise ValueError(f"가중치 해시가 일치하지 않습니다: {entry.label}")
+
+        model = SCQAutoencoder(**entry.hyperparams, device=torch.device("cpu"))
+        state = torch.load(entry.weights_path, map_location="cpu", weights_only=True, mmap=mmap)
+        model.load_state_dict(state, assign=mmap)
+        return model.eval(), entry
+
+    def load_codebook(self, name: str, version: Optional[str] = None) -> torch.Tensor:
+        """
+        버전의 SCQ 코드북 (K, d)만 로드 (모델을 만들지 않고 가중치 파일을 메모리 맵으로 읽음)
+
+        Raises:
+            KeyError: 등록되지 않은 모델/버전
+        """
+        entry = self.get(name, version)
+        state = torch.load(entry.weights_path, map_location="cpu", weights_only=True, mmap=True)
+        return state[CODEBOOK_KEY].clone()
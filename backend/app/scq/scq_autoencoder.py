@@ -3,11 +3,17 @@ SCQ Autoencoder 구현
 
 Encoder + SCQ Layer + Decoder 구조
 """
+import math
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, TYPE_CHECKING
 from app.scq.scq_layer import SCQLayer
+from app.scq.codec import pack_codes, unpack_codes
+from app.scq.entropy_coder import is_entropy_coded
+
+if TYPE_CHECKING:
+    from app.scq.entropy_coder import SCQEntropyCoder
 
 
 class SimpleEncoder(nn.Module):
@@ -77,11 +83,22 @@ class SimpleDecoder(nn.Module):
         return self.conv_layers(z_q)
 
 
+QUANTIZE_MODES = ("scq", "hard", "scheduled")
+
+
 class SCQAutoencoder(nn.Module):
     """
     SCQ 기반 Autoencoder
     
     Encoder → SCQ Layer → Decoder 구조
+    
+    quantize_mode:
+        "scq": 항상 SCQ 볼록 최적화로 양자화
+        "hard": 최근접 코드 하드 할당 + straight-through (VQ)
+        "scheduled": 학습 중 SCQ와 하드 할당을 스케줄에 따라 전환
+            - scq_every: N 스텝마다 한 번만 SCQ를 풀고 나머지는 하드 할당
+            - anneal_steps: 이 스텝 동안 SCQ 비율을 1 → 0으로 선형 감소,
+              이후에는 (평가 시 포함) 하드 할당만 사용
     """
     
     def __init__(
@@ -90,12 +107,28 @@ class SCQAutoencoder(nn.Module):
         latent_dim: int = 128,
         num_codes: int = 256,
         scq_lambda: float = 1e-3,
-        device: Optional[torch.device] = None
+        device: Optional[torch.device] = None,
+        scq_solver: str = "fista",
+        scq_max_rows: Optional[int] = None,
+        quantize_mode: str = "scq",
+        scq_every: int = 1,
+        anneal_steps: int = 0
     ):
         super(SCQAutoencoder, self).__init__()
         
+        if quantize_mode not in QUANTIZE_MODES:
+            raise ValueError(
+                f"지원하지 않는 양자화 모드입니다: {quantize_mode} (가능: {QUANTIZE_MODES})"
+            )
+        
         self.latent_dim = latent_dim
         self.num_codes = num_codes
+        self.quantize_mode = quantize_mode
+        self.scq_every = max(1, scq_every)
+        self.anneal_steps = anneal_steps
+        
+        # 스케줄용 학습 스텝 카운터 (체크포인트 형식에 영향 없음)
+        self.quantize_step = 0
         
         # 인코더
         self.encoder = SimpleEncoder(input_channels, latent_dim)
@@ -105,7 +138,9 @@ class SCQAutoencoder(nn.Module):
             codebook_dim=latent_dim,
             num_codes=num_codes,
             lam=scq_lambda,
-            device=device
+            device=device,
+            solver=scq_solver,
+            max_rows=scq_max_rows
         )
         
         # 디코더
@@ -128,7 +163,7 @@ class SCQAutoencoder(nn.Module):
             x_recon: 재구성된 이미지 (B, C, H, W)
             z: 인코더 출력 (B, D, H', W')
             z_q: 양자화된 벡터 (B, D, H', W')
-            stats: SCQ 통계 정보
+            stats: SCQ 통계 정보 (EMA 업데이트용 detach된 'alpha' 포함)
         """
         # 인코딩
         z = self.encoder(x)  # (B, D, H', W')
@@ -138,7 +173,16 @@ class SCQAutoencoder(nn.Module):
         B, D, H, W = z.shape
         z_reshaped = z.permute(0, 2, 3, 1).contiguous()  # (B, H, W, D)
         
-        z_q_reshaped, alpha, stats = self.scq_layer(z_reshaped)
+        if self.use_hard_assignment():
+            z_q_reshaped, alpha, stats = self.scq_layer.hard_quantize(z_reshaped)
+        else:
+            z_q_reshaped, alpha, stats = self.scq_layer(z_reshaped)
+        
+        if self.training:
+            self.quantize_step += 1
+        
+        # EMA 코드북 업데이트용 할당 계수 (gradient 없음)
+        stats['alpha'] = alpha.detach()
         
         # 다시 (B, D, H, W) 형태로 변환
         z_q = z_q_reshaped.permute(0, 3, 1, 2).contiguous()  # (B, D, H, W)
@@ -148,6 +192,29 @@ class SCQAutoencoder(nn.Module):
         
         return x_recon, z, z_q, stats
     
+    def use_hard_assignment(self) -> bool:
+        """현재 스텝에서 하드 할당을 사용할지 여부"""
+        if self.quantize_mode == "hard":
+            return True
+        if self.quantize_mode == "scq":
+            return False
+        
+        step = self.quantize_step
+        annealed = self.anneal_steps > 0 and step >= self.anneal_steps
+        if not self.training or annealed:
+            return annealed
+        
+        if self.anneal_steps > 0:
+            # SCQ 비율 1 - n/A 의 누적합 c(n) = n - n^2/(2A) 가
+            # 새 정수 구간에 들어갈 때만 SCQ 스텝으로 결정적으로 배치
+            def scq_count(n: int) -> float:
+                return n - n * n / (2.0 * self.anneal_steps)
+            
+            if math.ceil(scq_count(step + 1)) == math.ceil(scq_count(step)):
+                return True
+        
+        return step % self.scq_every != 0
+    
     def encode(self, x: torch.Tensor) -> torch.Tensor:
         """인코딩만 수행"""
         return self.encoder(x)
@@ -160,9 +227,101 @@ class SCQAutoencoder(nn.Module):
         z_q = z_q_reshaped.permute(0, 3, 1, 2).contiguous()
         return z_q, alpha, stats
     
+    def quantize_sparse(
+        self,
+        z: torch.Tensor,
+        num_candidates: int = 8
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Top-k 희소 양자화 (추론 전용)
+        
+        Returns:
+            z_q: 양자화된 벡터 (B, D, H, W)
+            indices: 코드 인덱스 (B, H, W, m)
+            weights: 볼록 결합 계수 (B, H, W, m)
+        """
+        z_reshaped = z.permute(0, 2, 3, 1).contiguous()
+        z_q_reshaped, indices, weights = self.scq_layer.quantize_topk(
+            z_reshaped, num_candidates=num_candidates
+        )
+        z_q = z_q_reshaped.permute(0, 3, 1, 2).contiguous()
+        return z_q, indices, weights
+    
     def decode(self, z_q: torch.Tensor) -> torch.Tensor:
         """디코딩만 수행"""
         return self.decoder(z_q)
+    
+    def encode_to_bytes(
+        self,
+        x: torch.Tensor,
+        num_candidates: int = 8,
+        entropy_coder: Optional["SCQEntropyCoder"] = None
+    ) -> bytes:
+        """
+        이미지를 압축 잠재 표현 바이트열로 인코딩
+        
+        위치별 희소 코드 인덱스와 uint8 고정소수점 가중치를 저장한다.
+        
+        Args:
+            x: 입력 이미지 (B, C, H, W)
+            num_candidates: 위치별 코드 수 (m)
+            entropy_coder: 학습된 엔트로피 코더 (주어지면 rANS 비트스트림으로 저장)
+        
+        Returns:
+            직렬화된 바이트열 (app.scq.codec 또는 app.scq.entropy_coder 포맷)
+        """
+        with torch.no_grad():
+            z = self.encode(x)
+            _, indices, weights = self.quantize_sparse(z, num_candidates=num_candidates)
+        if entropy_coder is not None:
+            return entropy_coder.encode(indices, weights, self.latent_dim)
+        return pack_codes(indices, weights, self.num_codes, self.latent_dim)
+    
+    def latent_from_bytes(
+        self,
+        data: bytes,
+        entropy_coder: Optional["SCQEntropyCoder"] = None
+    ) -> torch.Tensor:
+        """
+        압축 잠재 표현 바이트열에서 z_q 복원
+        
+        z_q = Σ_j w_j c_{idx_j} 를 코드북 gather와 가중합으로 계산한다.
+        
+        Returns:
+            z_q: 양자화된 벡터 (B, D, H, W)
+        """
+        if is_entropy_coded(data):
+            if entropy_coder is None:
+                raise ValueError("엔트로피 코딩된 데이터는 entropy_coder가 필요합니다.")
+            indices, weights, header = entropy_coder.decode(data)
+        else:
+            indices, weights, header = unpack_codes(data)
+        if header.num_codes != self.num_codes or header.latent_dim != self.latent_dim:
+            raise ValueError(
+                "잠재 표현의 코드북 크기/차원이 모델과 일치하지 않습니다: "
+                f"K={header.num_codes}, d={header.latent_dim}"
+            )
+        
+        codebook = self.scq_layer.codebook.detach()
+        indices = indices.to(codebook.device)
+        weights = weights.to(device=codebook.device, dtype=codebook.dtype)
+        
+        z_q = (weights.unsqueeze(-1) * codebook[indices]).sum(dim=-2)  # (B, H, W, D)
+        return z_q.permute(0, 3, 1, 2).contiguous()
+    
+    def decode_from_bytes(
+        self,
+        data: bytes,
+        entropy_coder: Optional["SCQEntropyCoder"] = None
+    ) -> torch.Tensor:
+        """
+        압축 잠재 표현 바이트열을 이미지로 디코딩
+        
+        Returns:
+            x_recon: 재구성된 이미지 (B, C, H, W)
+        """
+        with torch.no_grad():
+            return self.decode(self.latent_from_bytes(data, entropy_coder))
 
 
 def compute_loss(
@@ -173,7 +332,8 @@ def compute_loss(
     stats: Dict,
     recon_weight: float = 1.0,
     commitment_weight: float = 0.25,
-    entropy_weight: float = 0.01
+    entropy_weight: float = 0.01,
+    return_tensors: bool = False
 ) -> Tuple[torch.Tensor, Dict]:
     """
     SCQ Autoencoder 손실 함수 계산
@@ -187,6 +347,8 @@ def compute_loss(
         recon_weight: 재구성 손실 가중치
         commitment_weight: Commitment 손실 가중치
         entropy_weight: 엔트로피 정규화 가중치
+        return_tensors: True이면 loss_dict 값을 detach된 디바이스 텐서로 반환
+            (호스트 동기화 없음, SCQMetrics와 함께 사용)
     
     Returns:
         total_loss: 총 손실
@@ -209,14 +371,21 @@ def compute_loss(
     )
     
     loss_dict = {
-        'total_loss': total_loss.item(),
-        'recon_loss': recon_loss.item(),
-        'commitment_loss': commitment_loss.item(),
-        'entropy_loss': entropy_loss.item(),
-        'entropy': stats['entropy'].item(),
-        'sparsity': stats['sparsity'].item(),
-        'num_active_codes': stats['num_active_codes']
+        'total_loss': total_loss.detach(),
+        'recon_loss': recon_loss.detach(),
+        'commitment_loss': commitment_loss.detach(),
+        'entropy_loss': entropy_loss.detach(),
+        'entropy': stats['entropy'].detach(),
+        'sparsity': stats['sparsity'].detach(),
+        'num_active_codes': torch.as_tensor(stats['num_active_codes'])
     }
     
+    if not return_tensors:
+        # 한 번의 동기화로 호스트 값 변환
+        keys = list(loss_dict)
+        values = torch.stack([loss_dict[k].float().to(total_loss.device) for k in keys]).tolist()
+        loss_dict = dict(zip(keys, values))
+        loss_dict['num_active_codes'] = int(loss_dict['num_active_codes'])
+    
     return total_loss, loss_dict
 
@@ -1,14 +1,22 @@
 """
 SCQ (Soft Convex Quantization) Layer 구현
 
-cvxpylayers를 사용한 미분 가능한 볼록 최적화 레이어
+배치 심플렉스 QP 솔버(FISTA + 암시적 미분)를 기본으로 사용하며,
+cvxpylayers 기반 솔버는 검증용 참조 백엔드로 선택할 수 있다.
 """
 import torch
 import torch.nn as nn
-import cvxpy as cp
-from cvxpylayers.torch import CvxpyLayer
 from typing import Optional, Tuple, Dict
 
+from app.scq.simplex_solver import (
+    QPFactors,
+    build_qp_factors,
+    solve_simplex_qp,
+    solve_topk_simplex_qp
+)
+
+SOLVER_BACKENDS = ("fista", "cvxpy")
+
 
 class SCQLayer(nn.Module):
     """
@@ -21,6 +29,10 @@ class SCQLayer(nn.Module):
         num_codes: 코드북 크기 (K)
         lam: 정규화 계수 (λ)
         device: 디바이스 (cuda/cpu)
+        solver: 솔버 백엔드 ("fista": 배치 솔버, "cvxpy": 샘플별 참조 솔버)
+        num_iters: FISTA 최대 반복 횟수
+        tol: FISTA 조기 종료 허용 오차
+        max_rows: 한 번에 솔버에 넣는 최대 행(위치) 수, None이면 전체를 한 번에 처리
     """
     
     def __init__(
@@ -28,27 +40,53 @@ class SCQLayer(nn.Module):
         codebook_dim: int,
         num_codes: int = 256,
         lam: float = 1e-3,
-        device: Optional[torch.device] = None
+        device: Optional[torch.device] = None,
+        solver: str = "fista",
+        num_iters: int = 100,
+        tol: float = 1e-6,
+        max_rows: Optional[int] = None
     ):
         super(SCQLayer, self).__init__()
         
+        if solver not in SOLVER_BACKENDS:
+            raise ValueError(f"지원하지 않는 솔버입니다: {solver} (가능: {SOLVER_BACKENDS})")
+        
         self.codebook_dim = codebook_dim
         self.num_codes = num_codes
         self.lam = lam
+        self.solver = solver
+        self.num_iters = num_iters
+        self.tol = tol
+        self.max_rows = max_rows
+        self.active_threshold = 1e-3
         
         # 코드북 C ∈ R^{K×d} (학습 가능한 파라미터)
         self.codebook = nn.Parameter(
             torch.randn(num_codes, codebook_dim) * 0.01
         )
         
-        # CVXPY 최적화 문제 정의
-        self._setup_cvxpy_layer()
+        # 코드별 사용량 EMA (dead code 판정용, 체크포인트에는 저장하지 않음)
+        self.register_buffer(
+            "ema_usage",
+            torch.full((num_codes,), 1.0 / num_codes),
+            persistent=False
+        )
+        
+        # CVXPY 레이어는 참조 백엔드가 처음 사용될 때 생성
+        self.cvxpy_layer = None
+        
+        # 코드북 버전별 QP 분해 캐시 (C C^T + λI 는 z와 무관)
+        self._qp_factors: Optional[QPFactors] = None
+        self._qp_factors_key: Optional[Tuple] = None
         
         if device is not None:
             self.to(device)
     
     def _setup_cvxpy_layer(self):
         """CVXPY 레이어 설정"""
+        import cvxpy as cp
+        from cvxpylayers.torch import CvxpyLayer
+        
         K = self.num_codes
         d = self.codebook_dim
         
@@ -107,27 +145,15 @@ class SCQLayer(nn.Module):
             z_flat = z
             need_reshape = False
         
-        batch_size = z_flat.shape[0]
-        
-        # 배치 단위로 최적화 문제 해결
-        alpha_list = []
-        z_q_list = []
-        
-        for i in range(batch_size):
-            z_i = z_flat[i]
-            C = self.codebook.T  # (d, K)
-            
-            # CVXPY 레이어로 최적화
-            alpha_i, = self.cvxpy_layer(z_i, C)
-            
-            # 양자화된 벡터 계산: z_q = C^T α
-            z_q_i = torch.matmul(alpha_i, self.codebook)
-            
-            alpha_list.append(alpha_i)
-            z_q_list.append(z_q_i)
-        
-        alpha_batch = torch.stack(alpha_list, dim=0)  # (B, K) 또는 (B*H*W, K)
-        z_q_batch = torch.stack(z_q_list, dim=0)  # (B, d) 또는 (B*H*W, d)
+        # 솔버(Cholesky, 투영)는 bf16/fp16을 지원하지 않으므로 autocast 하에서도 코드북 정밀도로 실행
+        with torch.autocast(device_type=z_flat.device.type, enabled=False):
+            z_flat = z_flat.to(self.codebook.dtype)
+            if self.solver == "cvxpy":
+                alpha_batch = self._solve_cvxpy(z_flat)
+                # 양자화된 벡터 계산: z_q = C^T α
+                z_q_batch = torch.matmul(alpha_batch, self.codebook)
+            else:
+                alpha_batch, z_q_batch = self._solve_tiled(z_flat)  # (B, K), (B, d) 또는 (B*H*W, ...)
         
         # 원래 shape로 복원
         if need_reshape:
@@ -135,16 +161,200 @@ class SCQLayer(nn.Module):
             z_q_batch = z_q_batch.view(B, H, W, d)
         
         # 통계 정보 계산
-        entropy = self._compute_entropy(alpha_batch)
-        sparsity = self._compute_sparsity(alpha_batch)
+        stats = self._compute_stats(alpha_batch)
+        
+        return z_q_batch, alpha_batch, stats
+    
+    def _row_tiles(self, num_rows: int):
+        """max_rows 단위 행 구간 (start, end) 생성"""
+        tile = self.max_rows if self.max_rows else num_rows
+        tile = max(1, tile)
+        for start in range(0, num_rows, tile):
+            yield start, min(start + tile, num_rows)
+    
+    def _solve_tiled(self, z_flat: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        배치 솔버를 타일 단위로 실행하여 미리 할당한 출력 텐서에 기록
+        
+        솔버의 중간 텐서(backward의 (N, K, K) 시스템 포함)가 타일 크기에 비례하므로
+        프레임 크기와 무관하게 최대 메모리가 일정하게 유지된다.
+        """
+        factors = self.get_qp_factors()
+        num_rows = z_flat.shape[0]
         
-        stats = {
-            'entropy': entropy,
-            'sparsity': sparsity,
-            'num_active_codes': self._count_active_codes(alpha_batch)
+        if not self.max_rows or num_rows <= self.max_rows:
+            alpha = solve_simplex_qp(
+                z_flat, self.codebook, self.lam,
+                num_iters=self.num_iters, tol=self.tol,
+                factors=factors
+            )
+            return alpha, torch.matmul(alpha, self.codebook)
+        
+        alpha = z_flat.new_empty(num_rows, self.num_codes)
+        z_q = z_flat.new_empty(num_rows, self.codebook_dim)
+        for start, end in self._row_tiles(num_rows):
+            alpha_tile = solve_simplex_qp(
+                z_flat[start:end], self.codebook, self.lam,
+                num_iters=self.num_iters, tol=self.tol,
+                factors=factors
+            )
+            alpha[start:end] = alpha_tile
+            z_q[start:end] = torch.matmul(alpha_tile, self.codebook)
+        
+        return alpha, z_q
+    
+    def hard_quantize(
+        self,
+        z: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, Dict]:
+        """
+        최근접 코드 하드 할당 (고전적 VQ) + straight-through gradient
+        
+        argmin_k ||z - c_k||^2 를 한 번의 matmul로 계산한다.
+        Forward 값은 c_k 이고, backward에서 z에는 항등 gradient가,
+        코드북에는 선택된 코드에 대한 gradient가 그대로 전달된다.
+        
+        Args:
+            z: 입력 벡터 (B, d) 또는 (B, H, W, d)
+        
+        Returns:
+            z_q: 양자화된 벡터 (z와 동일한 shape)
+            alpha: one-hot 할당 계수 (B, K) 또는 (B, H, W, K)
+            stats: 통계 정보 (forward와 동일한 키)
+        """
+        leading_shape = z.shape[:-1]
+        z_flat = z.reshape(-1, self.codebook_dim)
+        
+        with torch.no_grad():
+            # ||z||^2 항은 argmin에 무관
+            dist = (
+                (self.codebook * self.codebook).sum(dim=-1)
+                - 2.0 * (z_flat @ self.codebook.T)
+            )
+            indices = dist.argmin(dim=-1)
+        
+        z_q_flat = self.codebook[indices]
+        # Straight-through: 값은 z_q, z에 대한 gradient는 항등
+        z_q_flat = z_q_flat + (z_flat - z_flat.detach())
+        
+        alpha = torch.nn.functional.one_hot(indices, self.num_codes).to(z_q_flat.dtype)
+        
+        z_q = z_q_flat.view(*leading_shape, self.codebook_dim)
+        alpha = alpha.view(*leading_shape, self.num_codes)
+        
+        return z_q, alpha, self._compute_stats(alpha)
+    
+    def _compute_stats(self, alpha: torch.Tensor) -> Dict:
+        """
+        통계 정보 계산
+        
+        모든 값은 디바이스 텐서로 반환되며 호스트 동기화를 일으키지 않는다.
+        """
+        active = alpha.detach().reshape(-1, self.num_codes) > self.active_threshold
+        code_usage = active.sum(dim=0)  # (K,) 코드별 활성 위치 수
+        return {
+            'entropy': self._compute_entropy(alpha),
+            'sparsity': self._compute_sparsity(alpha),
+            'num_active_codes': (code_usage > 0).sum(),
+            'code_usage': code_usage
         }
+    
+    def quantize_topk(
+        self,
+        z: torch.Tensor,
+        num_candidates: int = 8
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Top-k 희소 양자화 (추론 전용)
         
-        return z_q_batch, alpha_batch, stats
+        가장 가까운 m개 코드만 후보로 두고 QP를 풀어 희소 표현을 반환한다.
+        
+        Args:
+            z: 입력 벡터 (B, d) 또는 (B, H, W, d)
+            num_candidates: 후보 코드 수 (m)
+        
+        Returns:
+            z_q: 양자화된 벡터 (z와 동일한 shape)
+            indices: 코드 인덱스 (..., m)
+            weights: 볼록 결합 계수 (..., m)
+        """
+        leading_shape = z.shape[:-1]
+        z_flat = z.reshape(-1, self.codebook_dim)
+        
+        codebook = self.codebook.detach()
+        num_rows = z_flat.shape[0]
+        m = min(num_candidates, self.num_codes)
+        
+        indices = torch.empty(num_rows, m, device=z_flat.device, dtype=torch.long)
+        weights = z_flat.new_empty(num_rows, m)
+        z_q = z_flat.new_empty(num_rows, self.codebook_dim)
+        
+        for start, end in self._row_tiles(num_rows):
+            idx_tile, w_tile = solve_topk_simplex_qp(
+                z_flat[start:end], codebook, self.lam,
+                num_candidates=m,
+                num_iters=self.num_iters, tol=self.tol
+            )
+            indices[start:end] = idx_tile
+            weights[start:end] = w_tile
+            # z_q = Σ_j w_j c_{idx_j}
+            z_q[start:end] = torch.bmm(w_tile.unsqueeze(1), codebook[idx_tile]).squeeze(1)
+        
+        return (
+            z_q.view(*leading_shape, self.codebook_dim),
+            indices.view(*leading_shape, m),
+            weights.view(*leading_shape, m)
+        )
+    
+    def sparse_to_dense(self, indices: torch.Tensor, weights: torch.Tensor) -> torch.Tensor:
+        """희소 (indices, weights) 표현을 dense α (..., K) 로 변환"""
+        alpha = torch.zeros(
+            *indices.shape[:-1], self.num_codes,
+            device=weights.device, dtype=weights.dtype
+        )
+        return alpha.scatter_(-1, indices, weights)
+    
+    def _codebook_key(self) -> Tuple:
+        """코드북 버전 식별 키 (in-place 수정, 디바이스 이동, λ 변경 시 달라짐)"""
+        codebook = self.codebook
+        return (
+            codebook._version,
+            codebook.data_ptr(),
+            codebook.device,
+            codebook.dtype,
+            self.lam
+        )
+    
+    def get_qp_factors(self) -> QPFactors:
+        """
+        현재 코드북에 대한 QP 분해 반환 (캐시)
+        
+        G = C C^T + λI 와 그 Cholesky 분해는 코드북 버전이 바뀔 때만 다시 계산한다.
+        따라서 N개 입력의 풀이 비용은 분해 1회 + N번의 back-solve가 된다.
+        """
+        key = self._codebook_key()
+        if self._qp_factors is None or self._qp_factors_key != key:
+            self._qp_factors = build_qp_factors(self.codebook, self.lam)
+            self._qp_factors_key = key
+        return self._qp_factors
+    
+    def invalidate_cache(self):
+        """QP 분해 캐시 무효화 (코드북을 .data로 직접 수정한 경우 호출)"""
+        self._qp_factors = None
+        self._qp_factors_key = None
+    
+    def _solve_cvxpy(self, z_flat: torch.Tensor) -> torch.Tensor:
+        """cvxpylayers 참조 백엔드 (샘플별 솔브, 검증용)"""
+        if self.cvxpy_layer is None:
+            self._setup_cvxpy_layer()
+        
+        C = self.codebook.T  # (d, K)
+        alpha_list = []
+        for i in range(z_flat.shape[0]):
+            alpha_i, = self.cvxpy_layer(z_flat[i], C)
+            alpha_list.append(alpha_i)
+        
+        return torch.stack(alpha_list, dim=0)
     
     def _compute_entropy(self, alpha: torch.Tensor) -> torch.Tensor:
         """엔트로피 계산 (코드북 사용 분산 측정)"""
@@ -158,37 +368,105 @@ class SCQLayer(nn.Module):
         sparsity = torch.norm(alpha, p=1, dim=-1)
         return sparsity.mean()
     
-    def _count_active_codes(self, alpha: torch.Tensor, threshold: float = 1e-3) -> int:
-        """활성 코드 수 계산"""
-        active = (alpha > threshold).any(dim=0)
-        return active.sum().item()
-    
     def get_codebook(self) -> torch.Tensor:
         """코드북 반환"""
         return self.codebook
     
-    def update_codebook_ema(self, z: torch.Tensor, alpha: torch.Tensor, decay: float = 0.99):
+    def update_codebook_ema(
+        self,
+        z: torch.Tensor,
+        alpha: torch.Tensor,
+        decay: float = 0.99,
+        reinit_dead_codes: bool = False,
+        dead_code_threshold: float = 1e-4,
+        distributed: bool = False
+    ):
         """
         EMA 방식으로 코드북 업데이트 (선택적)
         
+        코드별 가중 합 α^T z 를 한 번의 matmul로 계산하고,
+        가중치 합이 0인 코드는 마스킹하여 그대로 둔다. 호스트 동기화가 없으므로
+        매 스텝 호출해도 학습 스텝 시간에 큰 영향을 주지 않는다.
+        
         Args:
             z: 입력 벡터
             alpha: 볼록 결합 계수
             decay: EMA 감쇠 계수
+            reinit_dead_codes: 사용량이 낮은 코드를 재구성 오차가 큰 샘플로 재초기화
+            dead_code_threshold: 코드별 평균 가중치 EMA가 이 값보다 작으면 dead code로 판정
+            distributed: True이면 프로세스 그룹 전체에서 EMA 통계를 all-reduce하여
+                모든 rank의 코드북이 동일하게 유지되도록 한다
         """
-        # 간단한 구현: 실제로는 더 정교한 EMA 업데이트 필요
+        sync = (
+            distributed
+            and torch.distributed.is_available()
+            and torch.distributed.is_initialized()
+        )
         with torch.no_grad():
-            # z의 가중 평균으로 코드북 업데이트
-            z_flat = z.view(-1, self.codebook_dim)
-            alpha_flat = alpha.view(-1, self.num_codes)
+            z_flat = z.reshape(-1, self.codebook_dim).to(self.codebook.dtype)
+            alpha_flat = alpha.reshape(-1, self.num_codes).to(self.codebook.dtype)
+            codebook = self.codebook.data
             
-            # 각 코드북 벡터에 대한 가중 평균 계산
-            for k in range(self.num_codes):
-                weights = alpha_flat[:, k]
-                if weights.sum() > 0:
-                    weighted_z = (z_flat * weights.unsqueeze(1)).sum(dim=0) / weights.sum()
-                    self.codebook.data[k] = (
-                        decay * self.codebook.data[k] + 
-                        (1 - decay) * weighted_z
-                    )
-
+            # 코드별 가중치 합 (K,) 과 가중 합 α^T z (K, d)
+            weight_sum = alpha_flat.sum(dim=0)
+            weighted_sum = alpha_flat.T @ z_flat
+            num_rows = torch.tensor(
+                [float(alpha_flat.shape[0])], device=codebook.device, dtype=codebook.dtype
+            )
+            
+            if sync:
+                # 통계를 하나의 버퍼로 묶어 all-reduce 1회
+                packed = torch.cat([weight_sum, weighted_sum.reshape(-1), num_rows])
+                torch.distributed.all_reduce(packed)
+                weight_sum = packed[:self.num_codes]
+                weighted_sum = packed[self.num_codes:-1].view(self.num_codes, self.codebook_dim)
+                num_rows = packed[-1:]
+            
+            # 가중치가 있는 코드만 EMA 블렌딩
+            used = weight_sum > 0
+            weighted_mean = weighted_sum / weight_sum.clamp(min=1e-12).unsqueeze(1)
+            blended = decay * codebook + (1 - decay) * weighted_mean
+            codebook.copy_(torch.where(used.unsqueeze(1), blended, codebook))
+            
+            # 사용량 EMA 갱신
+            usage = weight_sum / num_rows.clamp(min=1)
+            self.ema_usage.mul_(decay).add_((1 - decay) * usage)
+            
+            if reinit_dead_codes:
+                self._reinit_dead_codes(z_flat, alpha_flat, dead_code_threshold)
+                if sync:
+                    # 재초기화는 rank별 로컬 샘플을 사용하므로 rank 0 결과로 통일
+                    torch.distributed.broadcast(codebook, src=0)
+                    torch.distributed.broadcast(self.ema_usage, src=0)
+        
+        # .data 수정은 버전 카운터를 올리지 않으므로 명시적으로 무효화
+        self.invalidate_cache()
+    
+    def _reinit_dead_codes(
+        self,
+        z_flat: torch.Tensor,
+        alpha_flat: torch.Tensor,
+        threshold: float
+    ):
+        """
+        Dead code를 재구성 오차가 큰 샘플로 재초기화
+        
+        dead code 수는 데이터에 따라 달라지지만, 마스킹과 누적합 인덱싱으로
+        처리하여 호스트 동기화 없이 동작한다.
+        """
+        codebook = self.codebook.data
+        dead = self.ema_usage < threshold  # (K,)
+        
+        # 재구성 오차 ||z - C^T α||^2 기준 상위 샘플 선택
+        errors = ((z_flat - alpha_flat @ codebook) ** 2).sum(dim=-1)
+        num_candidates = min(self.num_codes, z_flat.shape[0])
+        top_idx = torch.topk(errors, num_candidates).indices
+        
+        # k번째 dead code에는 k번째로 오차가 큰 샘플을 할당
+        rank = (torch.cumsum(dead.long(), dim=0) - 1).clamp(min=0) % num_candidates
+        candidates = z_flat[top_idx[rank]]  # (K, d)
+        
+        codebook.copy_(torch.where(dead.unsqueeze(1), candidates, codebook))
+        self.ema_usage.copy_(
+            torch.where(dead, torch.full_like(self.ema_usage, 1.0 / self.num_codes), self.ema_usage)
+        )
@@ -0,0 +1,339 @@
+"""
+SCQ 심플렉스 제약 QP 배치 솔버
+
+min_α ||z - C^T α||^2 + λ||α||^2  s.t.  α ≥ 0, 1^T α = 1
+
+위 문제를 (N, K) 배치 전체에 대해 하나의 텐서 연산으로 푸는 솔버.
+Forward는 가속 투영 경사법(FISTA + adaptive restart),
+Backward는 최적해의 KKT 조건을 이용한 암시적 미분(implicit differentiation)으로 계산한다.
+"""
+import torch
+from typing import Optional, NamedTuple, Tuple
+
+
+def project_simplex(v: torch.Tensor) -> torch.Tensor:
+    """
+    확률 심플렉스 {α | α ≥ 0, 1^T α = 1} 위로의 유클리드 투영 (배치)
+
+    정렬 기반 O(K log K) 알고리즘 (Duchi et al., 2008)
+
+    Args:
+        v: 입력 텐서 (N, K)
+
+    Returns:
+        투영된 텐서 (N, K)
+    """
+    K = v.shape[-1]
+    u, _ = torch.sort(v, dim=-1, descending=True)
+    css = torch.cumsum(u, dim=-1) - 1.0
+    ind = torch.arange(1, K + 1, device=v.device, dtype=v.dtype)
+    cond = (u - css / ind) > 0
+    rho = cond.sum(dim=-1, keepdim=True).clamp(min=1)
+    theta = torch.gather(css, -1, rho - 1) / rho.to(v.dtype)
+    return torch.clamp(v - theta, min=0.0)
+
+
+def lipschitz_constant(gram: torch.Tensor) -> torch.Tensor:
+    """0.5 α^T G α - b^T α 의 gradient Lipschitz 상수 (G의 최대 고유값)"""
+    return torch.linalg.eigvalsh(gram)[-1]
+
+
+class QPFactors(NamedTuple):
+    """
+    코드북에만 의존하는 QP 이차 형식의 사전 계산 결과
+
+    z와 무관하므로 코드북이 바뀌기 전까지 모든 샘플/스텝에서 재사용한다.
+    """
+    gram: torch.Tensor       # G = C C^T + λI (K, K)
+    chol: torch.Tensor       # G의 Cholesky 분해 (K, K)
+    lipschitz: torch.Tensor  # G의 최대 고유값
+    h_ones: torch.Tensor     # G^{-1} 1 (K,)
+    ones_h_ones: torch.Tensor  # 1^T G^{-1} 1
+
+
+def build_qp_factors(codebook: torch.Tensor, lam: float) -> QPFactors:
+    """
+    코드북으로부터 QP 이차 형식과 그 분해를 계산
+
+    Args:
+        codebook: 코드북 (K, d)
+        lam: 정규화 계수 (λ)
+
+    Returns:
+        QPFactors
+    """
+    with torch.no_grad():
+        codebook = codebook.detach()
+        K = codebook.shape[0]
+        eye = torch.eye(K, device=codebook.device, dtype=codebook.dtype)
+        gram = codebook @ codebook.T + lam * eye
+        chol = torch.linalg.cholesky(gram)
+        ones = torch.ones(K, 1, device=codebook.device, dtype=codebook.dtype)
+        h_ones = torch.cholesky_solve(ones, chol).squeeze(1)
+        return QPFactors(
+            gram=gram,
+            chol=chol,
+            lipschitz=lipschitz_constant(gram),
+            h_ones=h_ones,
+            ones_h_ones=h_ones.sum()
+        )
+
+
+def _equality_solve(rhs: torch.Tensor, factors: QPFactors) -> torch.Tensor:
+    """
+    M r = G^{-1} r - (1^T G^{-1} r / 1^T G^{-1} 1) G^{-1} 1 (배치, 캐시된 분해 사용)
+
+    rhs = b 이면 1^T α = 1 제약만 둔 문제의 해에서 상수항을 뺀 값이 된다.
+    """
+    h_r = torch.cholesky_solve(rhs.T, factors.chol).T  # (N, K)
+    coef = h_r.sum(dim=-1, keepdim=True) / factors.ones_h_ones
+    return h_r - coef * factors.h_ones
+
+
+def fista_simplex(
+    gram: torch.Tensor,
+    b: torch.Tensor,
+    lipschitz: torch.Tensor,
+    num_iters: int = 100,
+    tol: float = 1e-6,
+    alpha_init: Optional[torch.Tensor] = None,
+    check_every: int = 10
+) -> torch.Tensor:
+    """
+    FISTA로 min 0.5 α^T G α - b^T α (α ∈ simplex) 를 배치로 푼다.
+
+    Args:
+        gram: G = C C^T + λI, 공유 (K, K) 또는 샘플별 (N, K, K)
+        b: 선형 항 C z (N, K)
+        lipschitz: G의 최대 고유값, 스칼라 텐서 또는 샘플별 (N, 1)
+        num_iters: 최대 반복 횟수
+        tol: 반복 간 최대 변화량이 tol 이하이면 조기 종료
+        alpha_init: 초기값 (N, K), None이면 균등 분포
+        check_every: 수렴 검사 주기 (검사 시에만 호스트 동기화 발생)
+
+    Returns:
+        alpha: 최적 볼록 결합 계수 (N, K)
+    """
+    N, K = b.shape
+    step = 1.0 / lipschitz
+
+    if alpha_init is None:
+        alpha = torch.full((N, K), 1.0 / K, device=b.device, dtype=b.dtype)
+    else:
+        alpha = project_simplex(alpha_init)
+
+    y = alpha
+    t = torch.ones(N, 1, device=b.device, dtype=b.dtype)
+
+    batched_gram = gram.dim() == 3
+
+    for it in range(num_iters):
+        if batched_gram:
+            grad = torch.bmm(gram, y.unsqueeze(-1)).squeeze(-1) - b
+        else:
+            grad = y @ gram - b  # G는 대칭
+        alpha_next = project_simplex(y - step * grad)
+
+        # Adaptive restart: 모멘텀 방향이 나빠진 샘플은 모멘텀 초기화
+        restart = ((y - alpha_next) * (alpha_next - alpha)).sum(dim=-1, keepdim=True) > 0
+        t = torch.where(restart, torch.ones_like(t), t)
+
+        t_next = 0.5 * (1.0 + torch.sqrt(1.0 + 4.0 * t * t))
+        y = alpha_next + ((t - 1.0) / t_next) * (alpha_next - alpha)
+
+        delta = alpha_next - alpha
+        alpha = alpha_next
+        t = t_next
+
+        if tol > 0 and (it + 1) % check_every == 0:
+            if delta.abs().max().item() <= tol:
+                break
+
+    return alpha
+
+
+def simplex_qp_backward(
+    grad_alpha: torch.Tensor,
+    alpha: torch.Tensor,
+    gram: torch.Tensor,
+    support_eps: float = 0.0
+) -> torch.Tensor:
+    """
+    KKT 조건 기반 암시적 미분
+
+    최적해의 support S = {i | α_i > 0} 위에서
+        G_SS α_S = b_S - ν 1,  1^T α_S = 1
+    이 성립하므로 dα_S = M (db_S - dG_SS α_S),
+    M = H - H 1 1^T H / (1^T H 1),  H = G_SS^{-1}.
+
+    support 크기가 샘플마다 다르므로 비활성 좌표는 단위 행렬로 채운
+    마스킹된 (N, K, K) 시스템을 한 번에 푼다.
+
+    Args:
+        grad_alpha: 손실의 α에 대한 gradient (N, K)
+        alpha: 최적해 (N, K)
+        gram: G = C C^T + λI (K, K)
+        support_eps: support 판정 임계값
+
+    Returns:
+        v: adjoint 벡터 M g (N, K), 비활성 좌표는 0
+    """
+    mask = (alpha > support_eps).to(alpha.dtype)  # (N, K)
+
+    # G̃ = D G D + (I - D)
+    gram_masked = mask.unsqueeze(2) * gram.unsqueeze(0) * mask.unsqueeze(1)
+    gram_masked = gram_masked + torch.diag_embed(1.0 - mask)
+
+    rhs = torch.stack([grad_alpha * mask, mask], dim=-1)  # (N, K, 2)
+    sol = torch.linalg.solve(gram_masked, rhs)
+    h_g = sol[..., 0] * mask
+    h_1 = sol[..., 1] * mask
+
+    denom = (mask * h_1).sum(dim=-1, keepdim=True).clamp(min=1e-12)
+    coef = (mask * h_g).sum(dim=-1, keepdim=True) / denom
+    return (h_g - coef * h_1) * mask
+
+
+class SimplexQPFunction(torch.autograd.Function):
+    """
+    배치 심플렉스 QP 솔버의 autograd 래퍼
+
+    forward(z, codebook) -> alpha 이며, backward는 암시적 미분으로
+    z와 codebook에 대한 gradient를 계산한다.
+    """
+
+    @staticmethod
+    def forward(ctx, z, codebook, lam, num_iters, tol, factors):
+        if factors is None:
+            factors = build_qp_factors(codebook, lam)
+
+        alpha = solve_with_factors(z, codebook, factors, num_iters=num_iters, tol=tol)
+
+        ctx.factors = factors
+        ctx.save_for_backward(z, codebook, alpha)
+        return alpha
+
+    @staticmethod
+    def backward(ctx, grad_alpha):
+        z, codebook, alpha = ctx.saved_tensors
+        factors = ctx.factors
+
+        # support가 전체인 행은 캐시된 분해로, 나머지는 마스킹된 시스템으로 계산
+        full = (alpha > 0).all(dim=-1)
+        v = torch.zeros_like(alpha)
+        if full.any():
+            v[full] = _equality_solve(grad_alpha[full], factors)
+        if not full.all():
+            partial = ~full
+            v[partial] = simplex_qp_backward(
+                grad_alpha[partial], alpha[partial], factors.gram
+            )
+
+        grad_z = grad_codebook = None
+        if ctx.needs_input_grad[0]:
+            # b = C z
+            grad_z = v @ codebook
+        if ctx.needs_input_grad[1]:
+            # b = C z, G = C C^T + λI 항의 기여
+            va = v.T @ alpha  # (K, K)
+            grad_codebook = v.T @ z - (va + va.T) @ codebook
+
+        return grad_z, grad_codebook, None, None, None, None
+
+
+def solve_with_factors(
+    z: torch.Tensor,
+    codebook: torch.Tensor,
+    factors: QPFactors,
+    num_iters: int = 100,
+    tol: float = 1e-6
+) -> torch.Tensor:
+    """
+    캐시된 분해를 사용한 배치 풀이 (미분 없음)
+
+    먼저 등식 제약만 둔 문제를 N개의 back-solve로 풀고,
+    해가 이미 α ≥ 0 을 만족하는 행은 그대로 최적해로 사용한다.
+    나머지 행만 투영된 해에서 warm-start한 FISTA로 푼다.
+    """
+    with torch.no_grad():
+        b = z.detach() @ codebook.detach().T  # (N, K)
+        alpha = _equality_solve(b, factors) + factors.h_ones / factors.ones_h_ones
+
+        infeasible = (alpha < 0).any(dim=-1)
+        if infeasible.any():
+            alpha[infeasible] = fista_simplex(
+                factors.gram, b[infeasible], factors.lipschitz,
+                num_iters=num_iters, tol=tol,
+                alpha_init=alpha[infeasible]
+            )
+        return alpha
+
+
+def solve_simplex_qp(
+    z: torch.Tensor,
+    codebook: torch.Tensor,
+    lam: float,
+    num_iters: int = 100,
+    tol: float = 1e-6,
+    factors: Optional[QPFactors] = None
+) -> torch.Tensor:
+    """
+    배치 심플렉스 QP 풀이 (미분 가능)
+
+    Args:
+        z: 입력 벡터 (N, d)
+        codebook: 코드북 (K, d)
+        lam: 정규화 계수 (λ)
+        num_iters: FISTA 최대 반복 횟수
+        tol: 조기 종료 허용 오차
+        factors: 캐시된 QP 분해 (None이면 codebook으로부터 새로 계산)
+
+    Returns:
+        alpha: 볼록 결합 계수 (N, K)
+    """
+    return SimplexQPFunction.apply(z, codebook, lam, num_iters, tol, factors)
+
+
+def solve_topk_simplex_qp(
+    z: torch.Tensor,
+    codebook: torch.Tensor,
+    lam: float,
+    num_candidates: int,
+    num_iters: int = 100,
+    tol: float = 1e-6
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    후보 코드 사전 선택 후 심플렉스 QP 풀이 (추론 전용, 미분 없음)
+
+    제곱 거리 기준 가장 가까운 m개 코드를 한 번의 matmul로 고른 뒤,
+    그 m개 후보에 대해서만 QP를 푼다. 비용이 K 대신 m에 비례한다.
+    m < K 이면 근사해이며, m = K 이면 전체 풀이와 같은 해를 준다.
+
+    Args:
+        z: 입력 벡터 (N, d)
+        codebook: 코드북 (K, d)
+        lam: 정규화 계수 (λ)
+        num_candidates: 후보 코드 수 (m)
+        num_iters: FISTA 최대 반복 횟수
+        tol: 조기 종료 허용 오차
+
+    Returns:
+        indices: 후보 코드 인덱스 (N, m), 거리 오름차순
+        weights: 후보별 볼록 결합 계수 (N, m)
+    """
+    with torch.no_grad():
+        K = codebook.shape[0]
+        m = min(num_candidates, K)
+
+        # ||z - c_k||^2 = ||z||^2 - 2 z·c_k + ||c_k||^2 (||z||^2 는 순위에 무관)
+        dist = (codebook * codebook).sum(dim=-1) - 2.0 * (z @ codebook.T)  # (N, K)
+        indices = torch.topk(dist, m, dim=-1, largest=False).indices  # (N, m)
+
+        candidates = codebook[indices]  # (N, m, d)
+        eye = torch.eye(m, device=codebook.device, dtype=codebook.dtype)
+        gram = torch.bmm(candidates, candidates.transpose(1, 2)) + lam * eye  # (N, m, m)
+        b = torch.bmm(candidates, z.unsqueeze(-1)).squeeze(-1)  # (N, m)
+        lipschitz = torch.linalg.eigvalsh(gram)[:, -1:]  # (N, 1)
+
+        weights = fista_simplex(gram, b, lipschitz, num_iters=num_iters, tol=tol)
+        return indices, weights
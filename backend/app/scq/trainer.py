@@ -0,0 +1,541 @@
+"""
+SCQ 공용 학습 루프
+
+train_scq_nav / train_scq_food가 공유하는 학습 루프.
+
+- gradient accumulation, CPU bf16 autocast
+- 옵티마이저/스케줄러/RNG 상태를 포함한 재개 가능한 체크포인트
+- 체크포인트는 백그라운드 스레드에서 임시 파일에 쓴 뒤 원자적으로 교체 (학습 루프 비차단)
+
+world_size > 1이면 CPU gloo 백엔드의 DistributedDataParallel로
+여러 워커 프로세스에서 데이터 병렬 학습을 수행한다.
+
+- 코드북을 포함한 모든 파라미터의 gradient는 DDP가 all-reduce
+- EMA 코드북 통계는 SCQLayer.update_codebook_ema(distributed=True)로 동기화
+- 체크포인트는 rank 0에서만 저장
+"""
+import contextlib
+import os
+import queue
+import random
+import socket
+import threading
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.optim as optim
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, Dataset
+from torch.utils.data.distributed import DistributedSampler
+
+from app.scq.scq_autoencoder import SCQAutoencoder, compute_loss
+from app.scq.metrics import SCQMetrics
+from app.scq.frame_store import DevicePrefetcher, frames_to_float, make_frame_loader
+
+CHECKPOINT_VERSION = 1
+
+
+def _find_free_port() -> int:
+    """사용 가능한 로컬 포트 탐색"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def is_main_process() -> bool:
+    """rank 0 (또는 단일 프로세스) 여부"""
+    return not (dist.is_available() and dist.is_initialized()) or dist.get_rank() == 0
+
+
+def setup_process_group(rank: int, world_size: int, backend: str = "gloo"):
+    """프로세스 그룹 초기화 (MASTER_ADDR/MASTER_PORT 환경 변수 사용)"""
+    os.environ.setdefault("MASTER_ADDR", "127.0.0.1")
+    dist.init_process_group(backend, rank=rank, world_size=world_size)
+
+
+def cleanup_process_group():
+    """프로세스 그룹 정리"""
+    if dist.is_available() and dist.is_initialized():
+        dist.destroy_process_group()
+
+
+def unwrap_model(model: torch.nn.Module) -> SCQAutoencoder:
+    """DDP 래퍼를 벗긴 원본 모델"""
+    return model.module if isinstance(model, DistributedDataParallel) else model
+
+
+def _snapshot(obj: Any) -> Any:
+    """state_dict 등을 CPU 복사본으로 고정 (백그라운드 저장 중 학습이 값을 바꾸지 않도록)"""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {k: _snapshot(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_snapshot(v) for v in obj)
+    return obj
+
+
+def atomic_save(obj: Any, path: Path):
+    """같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 원자적 교체"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    torch.save(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class AsyncCheckpointWriter:
+    """
+    백그라운드 스레드 체크포인트 저장기
+
+    save()는 상태를 CPU 복사본으로 고정한 뒤 큐에 넣고 바로 반환한다.
+    실제 직렬화와 디스크 쓰기는 워커 스레드에서 atomic_save로 수행된다.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="scq-checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                obj, path = item
+                atomic_save(obj, path)
+            except BaseException as e:  # 다음 save/wait 호출에서 다시 발생
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"체크포인트 저장 실패: {error}") from error
+
+    def save(self, obj: Any, path: Path):
+        """비동기 저장 요청"""
+        self._raise_pending_error()
+        self._queue.put((_snapshot(obj), Path(path)))
+
+    def wait(self):
+        """대기 중인 저장이 모두 끝날 때까지 대기"""
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self):
+        """남은 저장을 마치고 워커 스레드 종료"""
+        self.wait()
+        self._queue.put(None)
+        self._thread.join()
+
+
+def _capture_rng_state() -> Dict[str, Any]:
+    """torch/CUDA/numpy/python RNG 상태"""
+    return {
+        'torch': torch.get_rng_state(),
+        'cuda': torch.cuda.get_rng_state_all() if torch.cuda.is_available() else None,
+        'numpy': np.random.get_state(),
+        'python': random.getstate()
+    }
+
+
+def _restore_rng_state(state: Dict[str, Any]):
+    """
+    RNG 상태 복원
+
+    체크포인트를 map_location=cuda로 불러오면 상태 텐서도 GPU로 옮겨지므로
+    set_rng_state가 요구하는 CPU ByteTensor로 되돌린다.
+    """
+    torch.set_rng_state(state['torch'].cpu())
+    if state.get('cuda') is not None and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all([s.cpu() for s in state['cuda']])
+    np.random.set_state(state['numpy'])
+    random.setstate(state['python'])
+
+
+class SCQTrainer:
+    """
+    SCQ Autoencoder 학습기
+
+    Args:
+        model: SCQ Autoencoder (또는 DDP로 감싼 모델)
+        train_loader: 학습 데이터 로더
+        device: 디바이스
+        save_dir: 체크포인트 디렉토리 (None이면 저장하지 않음)
+        checkpoint_prefix: 체크포인트 파일 이름 접두사
+        lr: 학습률
+        loss_weights: compute_loss 가중치 (recon/commitment/entropy_weight)
+        ema_decay: 설정 시 매 스텝 EMA 코드북 업데이트
+        log_every: 로그 출력 배치 간격
+        accumulation_steps: gradient accumulation 마이크로배치 수
+        use_bf16: bf16 autocast 사용 여부 (SCQ 솔버는 항상 fp32)
+        scheduler_fn: optimizer를 받아 LR 스케줄러를 만드는 함수 (옵티마이저 스텝마다 step)
+        distributed: DDP 학습 여부
+        prefetch_depth: 백그라운드 스레드에서 디바이스로 미리 옮겨 둘 배치 수 (0이면 사용 안 함)
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        train_loader: DataLoader,
+        device: torch.device,
+        save_dir: Optional[Path] = None,
+        checkpoint_prefix: str = "scq",
+        lr: float = 1e-4,
+        loss_weights: Optional[Dict[str, float]] = None,
+        ema_decay: Optional[float] = None,
+        log_every: int = 10,
+        accumulation_steps: int = 1,
+        use_bf16: bool = False,
+        scheduler_fn: Optional[Callable[[optim.Optimizer], Any]] = None,
+        distributed: bool = False,
+        prefetch_depth: int = 2
+    ):
+        self.model = model
+        self.core = unwrap_model(model)
+        self.train_loader = train_loader
+        self.device = device
+        self.save_dir = Path(save_dir) if save_dir is not None else None
+        self.checkpoint_prefix = checkpoint_prefix
+        self.loss_weights = loss_weights or {}
+        self.ema_decay = ema_decay
+        self.log_every = log_every
+        self.accumulation_steps = max(1, accumulation_steps)
+        self.prefetch_depth = prefetch_depth
+        self.use_bf16 = use_bf16
+        self.distributed = distributed
+        self.main = is_main_process()
+
+        self.optimizer = optim.Adam(model.parameters(), lr=lr)
+        self.scheduler = scheduler_fn(self.optimizer) if scheduler_fn is not None else None
+
+        self.epoch = 0
+        self.global_step = 0
+
+        self.writer = AsyncCheckpointWriter() if (self.save_dir is not None and self.main) else None
+
+    @property
+    def resume_path(self) -> Optional[Path]:
+        """재개용 체크포인트 경로 (매 에폭 원자적으로 덮어씀)"""
+        if self.save_dir is None:
+            return None
+        return self.save_dir / f"{self.checkpoint_prefix}_resume.pth"
+
+    def state_dict(self) -> Dict[str, Any]:
+        """재개 가능한 학습 상태"""
+        return {
+            'version': CHECKPOINT_VERSION,
+            'model': self.core.state_dict(),
+            'optimizer': self.optimizer.state_dict(),
+            'scheduler': self.scheduler.state_dict() if self.scheduler is not None else None,
+            'epoch': self.epoch,
+            'global_step': self.global_step,
+            'quantize_step': self.core.quantize_step,
+            'rng': _capture_rng_state()
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """학습 상태 복원"""
+        self.core.load_state_dict(state['model'])
+        self.optimizer.load_state_dict(state['optimizer'])
+        if self.scheduler is not None and state.get('scheduler') is not None:
+            self.scheduler.load_state_dict(state['scheduler'])
+        self.epoch = state['epoch']
+        self.global_step = state['global_step']
+        self.core.quantize_step = state.get('quantize_step', 0)
+        _restore_rng_state(state['rng'])
+
+    def resume(self, path: Optional[Path] = None) -> bool:
+        """
+        체크포인트에서 학습 재개
+
+        Args:
+            path: 체크포인트 경로 (None이면 save_dir의 재개용 체크포인트)
+
+        Returns:
+            재개 여부
+        """
+        path = Path(path) if path is not None else self.resume_path
+        if path is None or not path.exists():
+            return False
+
+        state = torch.load(path, map_location=self.device, weights_only=False)
+        self.load_state_dict(state)
+        if self.main:
+            print(f"체크포인트에서 재개: {path} (에폭 {self.epoch}, 스텝 {self.global_step})")
+        return True
+
+    def _autocast(self):
+        if not self.use_bf16:
+            return contextlib.nullcontext()
+        return torch.autocast(device_type=self.device.type, dtype=torch.bfloat16)
+
+    def _train_step(self, x: torch.Tensor, sync_gradients: bool):
+        """마이크로배치 1회 forward/backward"""
+        # DDP: 누적 중인 마이크로배치에서는 gradient all-reduce 생략
+        no_sync = (
+            self.model.no_sync()
+            if self.distributed and not sync_gradients
+            else contextlib.nullcontext()
+        )
+        with no_sync:
+            with self._autocast():
+                x_recon, z, z_q, stats = self.model(x)
+
+            # 손실 계산 (fp32)
+            loss, loss_dict = compute_loss(
+                x_recon.float(), x, z.float(), z_q.float(), stats,
+                return_tensors=True,
+                **self.loss_weights
+            )
+            (loss / self.accumulation_steps).backward()
+
+        if self.ema_decay is not None:
+            self.core.scq_layer.update_codebook_ema(
+                z.detach().float().permute(0, 2, 3, 1),
+                stats['alpha'],
+                decay=self.ema_decay,
+                distributed=self.distributed
+            )
+
+        return loss_dict, stats
+
+    def _optimizer_step(self):
+        self.optimizer.step()
+        self.optimizer.zero_grad()
+        if self.scheduler is not None:
+            self.scheduler.step()
+        self.global_step += 1
+
+    def fit(self, num_epochs: int):
+        """num_epochs 에폭까지 학습 (재개 시 남은 에폭만)"""
+        # 지표는 디바이스에 누적하고 log_every 배치마다 / 에폭 종료 시에만 호스트로 가져옴
+        step_metrics = SCQMetrics(self.core.num_codes, flush_every=self.log_every, device=self.device)
+        epoch_metrics = SCQMetrics(self.core.num_codes, flush_every=0, device=self.device)
+
+        try:
+            while self.epoch < num_epochs:
+                self._train_epoch(num_epochs, step_metrics, epoch_metrics)
+                self.epoch += 1
+                self._save_checkpoints()
+                if self.distributed:
+                    dist.barrier()
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+
+    def _train_epoch(self, num_epochs: int, step_metrics: SCQMetrics, epoch_metrics: SCQMetrics):
+        epoch = self.epoch
+        self.model.train()
+        sampler = getattr(self.train_loader, "sampler", None)
+        if isinstance(sampler, DistributedSampler):
+            sampler.set_epoch(epoch)
+
+        self.optimizer.zero_grad()
+        num_batches = len(self.train_loader)
+
+        batches = (
+            DevicePrefetcher(self.train_loader, self.device, depth=self.prefetch_depth)
+            if self.prefetch_depth > 0 else self.train_loader
+        )
+        for batch_idx, x in enumerate(batches):
+            # uint8 프레임 배치(MMapFrameDataset)는 디바이스로 옮긴 뒤 float 변환 (프리페처가 이미 옮겼으면 그대로)
+            x = frames_to_float(x.to(self.device, non_blocking=x.is_pinned()))
+
+            sync = (
+                (batch_idx + 1) % self.accumulation_steps == 0
+                or batch_idx + 1 == num_batches
+            )
+            loss_dict, stats = self._train_step(x, sync_gradients=sync)
+            if sync:
+                self._optimizer_step()
+
+            step_metrics.update(loss_dict, stats)
+            epoch_metrics.update(loss_dict, stats)
+
+            if step_metrics.should_flush():
+                logs = step_metrics.flush()
+                if self.main:
+                    print(
+                        f"Epoch {epoch+1}/{num_epochs}, "
+                        f"Batch {batch_idx}, "
+                        f"Loss: {logs['total_loss']:.4f}, "
+                        f"Recon: {logs['recon_loss']:.4f}, "
+                        f"Entropy: {logs['entropy']:.4f}"
+                    )
+
+        # 에폭별 평균 손실 (rank 0 기준)
+        logs = epoch_metrics.flush()
+        usage = epoch_metrics.usage_summary()
+        if self.main and logs:
+            print(
+                f"\nEpoch {epoch+1} 완료: "
+                f"Avg Loss: {logs['total_loss']:.4f}, "
+                f"Avg Recon: {logs['recon_loss']:.4f}, "
+                f"Avg Commitment: {logs['commitment_loss']:.4f}, "
+                f"Used Codes: {usage['num_used_codes']:.0f}/{self.core.num_codes}\n"
+            )
+
+    def _save_checkpoints(self):
+        """에폭 체크포인트(가중치)와 재개용 체크포인트를 비동기 저장 (rank 0만)"""
+        if self.writer is None:
+            return
+        self.writer.save(
+            self.core.state_dict(),
+            self.save_dir / f"{self.checkpoint_prefix}_epoch_{self.epoch}.pth"
+        )
+        self.writer.save(self.state_dict(), self.resume_path)
+
+
+def _distributed_worker(
+    rank: int,
+    world_size: int,
+    port: int,
+    model: SCQAutoencoder,
+    dataset: Dataset,
+    batch_size: int,
+    num_workers: int,
+    final_state: Dict[str, torch.Tensor],
+    trainer_kwargs: Dict,
+    num_epochs: int,
+    resume: bool
+):
+    """DDP 워커 프로세스 진입점"""
+    os.environ["MASTER_PORT"] = str(port)
+    # 코어를 rank끼리 나눠 사용 (oversubscription 방지)
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // world_size))
+    setup_process_group(rank, world_size, backend="gloo")
+
+    try:
+        device = torch.device("cpu")
+        model = model.to(device)
+        ddp_model = DistributedDataParallel(model)
+
+        sampler = DistributedSampler(dataset, num_replicas=world_size, rank=rank, shuffle=True)
+        train_loader = make_frame_loader(
+            dataset, batch_size=batch_size, sampler=sampler, num_workers=num_workers
+        )
+
+        trainer = SCQTrainer(
+            ddp_model, train_loader,
+            device=device, distributed=True,
+            **trainer_kwargs
+        )
+        if resume:
+            trainer.resume()
+        trainer.fit(num_epochs)
+
+        # 학습된 가중치를 부모 프로세스와 공유된 버퍼로 복사
+        if rank == 0:
+            with torch.no_grad():
+                for key, value in model.state_dict().items():
+                    final_state[key].copy_(value)
+        dist.barrier()
+    finally:
+        cleanup_process_group()
+
+
+def train_scq(
+    model: SCQAutoencoder,
+    train_loader: DataLoader,
+    num_epochs: int = 10,
+    device: torch.device = None,
+    save_dir: Path = None,
+    checkpoint_prefix: str = "scq",
+    lr: float = 1e-4,
+    recon_weight: float = 1.0,
+    commitment_weight: float = 0.25,
+    entropy_weight: float = 0.01,
+    ema_decay: Optional[float] = None,
+    log_every: int = 10,
+    accumulation_steps: int = 1,
+    use_bf16: bool = False,
+    scheduler_fn: Optional[Callable[[optim.Optimizer], Any]] = None,
+    resume: bool = False,
+    world_size: int = 1
+):
+    """
+    SCQ 모델 학습
+
+    Args:
+        model: SCQ Autoencoder 모델
+        train_loader: 학습 데이터 로더 (world_size > 1이면 dataset/batch_size만 사용)
+        num_epochs: 에폭 수
+        device: 디바이스 (world_size > 1이면 CPU 고정)
+        save_dir: 모델 저장 디렉토리
+        checkpoint_prefix: 체크포인트 파일 이름 접두사
+        lr: 학습률
+        recon_weight: 재구성 손실 가중치
+        commitment_weight: Commitment 손실 가중치
+        entropy_weight: 엔트로피 정규화 가중치
+        ema_decay: 설정 시 매 스텝 EMA 코드북 업데이트
+        log_every: 로그 출력 배치 간격
+        accumulation_steps: gradient accumulation 마이크로배치 수
+        use_bf16: bf16 autocast 사용 여부
+        scheduler_fn: optimizer를 받아 LR 스케줄러를 만드는 함수
+        resume: save_dir의 재개용 체크포인트가 있으면 이어서 학습
+        world_size: 데이터 병렬 워커 프로세스 수 (CPU gloo DDP)
+    """
+    trainer_kwargs = dict(
+        save_dir=save_dir,
+        checkpoint_prefix=checkpoint_prefix,
+        lr=lr,
+        loss_weights=dict(
+            recon_weight=recon_weight,
+            commitment_weight=commitment_weight,
+            entropy_weight=entropy_weight
+        ),
+        ema_decay=ema_decay,
+        log_every=log_every,
+        accumulation_steps=accumulation_steps,
+        use_bf16=use_bf16,
+        scheduler_fn=scheduler_fn
+    )
+
+    if world_size <= 1:
+        if device is None:
+            device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        model = model.to(device)
+        print(f"학습 시작: 디바이스={device}, 에폭={num_epochs}")
+        trainer = SCQTrainer(model, train_loader, device=device, **trainer_kwargs)
+        if resume:
+            trainer.resume()
+        trainer.fit(num_epochs)
+        print("학습 완료!")
+        return
+
+    model = model.to(torch.device("cpu"))
+    final_state = {
+        key: value.detach().clone().share_memory_()
+        for key, value in model.state_dict().items()
+    }
+
+    print(f"학습 시작: 디바이스=cpu, 워커={world_size} (gloo DDP), 에폭={num_epochs}")
+    mp.spawn(
+        _distributed_worker,
+        args=(
+            world_size,
+            _find_free_port(),
+            model,
+            train_loader.dataset,
+            train_loader.batch_size,
+            getattr(train_loader, "num_workers", 0),
+            final_state,
+            trainer_kwargs,
+            num_epochs,
+            resume
+        ),
+        nprocs=world_size,
+        join=True
+    )
+
+    model.load_state_dict(final_state)
+    print("학습 완료!")
@@ -2,9 +2,9 @@
 SCQ 유틸리티 함수
 """
 import torch
+import torch.nn.functional as F
 import numpy as np
-from typing import Tuple, Optional
-from sklearn.cluster import KMeans
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 
 def initialize_codebook_kmeans(
@@ -23,6 +23,8 @@ def initialize_codebook_kmeans(
     Returns:
         codebook: 초기화된 코드북 (K, d)
     """
+    from sklearn.cluster import KMeans
+    
     z_np = z_samples.detach().cpu().numpy()
     
     kmeans = KMeans(n_clusters=num_codes, random_state=random_state, n_init=10)
@@ -33,23 +35,289 @@ def initialize_codebook_kmeans(
     return codebook
 
 
-def compute_psnr(img1: torch.Tensor, img2: torch.Tensor) -> float:
+def iter_latent_batches(
+    model: torch.nn.Module,
+    data_loader: Iterable,
+    device: Optional[torch.device] = None
+) -> Iterator[torch.Tensor]:
+    """
+    DataLoader를 SCQAutoencoder.encode에 통과시켜 잠재 벡터 배치를 생성
+    
+    Args:
+        model: SCQ Autoencoder (encode 메서드 필요)
+        data_loader: 이미지 배치 iterator (B, C, H, W)
+        device: 디바이스
+    
+    Yields:
+        z_flat: 잠재 벡터 배치 (B*H'*W', d)
+    """
+    model.eval()
+    with torch.no_grad():
+        for x in data_loader:
+            if device is not None:
+                x = x.to(device)
+            z = model.encode(x)
+            yield z.permute(0, 2, 3, 1).reshape(-1, z.shape[1])
+
+
+def _kmeans_plus_plus(
+    samples: torch.Tensor,
+    num_codes: int,
+    generator: torch.Generator
+) -> torch.Tensor:
+    """k-means++ 시딩 (torch)"""
+    N = samples.shape[0]
+    first = torch.randint(N, (1,), generator=generator).to(samples.device)
+    centers = [samples[first].squeeze(0)]
+    min_dist = ((samples - centers[0]) ** 2).sum(dim=-1)
+    
+    for _ in range(1, num_codes):
+        # 거리 제곱에 비례하는 확률로 다음 중심 선택
+        probs = min_dist.clamp(min=0).double()
+        if probs.sum() <= 0:
+            probs = torch.ones_like(probs)
+        idx = torch.multinomial(probs.cpu(), 1, generator=generator).to(samples.device)
+        center = samples[idx].squeeze(0)
+        centers.append(center)
+        min_dist = torch.minimum(min_dist, ((samples - center) ** 2).sum(dim=-1))
+    
+    return torch.stack(centers, dim=0)
+
+
+def _assign(samples: torch.Tensor, centers: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """최근접 중심 할당 (matmul 기반 거리)"""
+    dist = (
+        (samples * samples).sum(dim=-1, keepdim=True)
+        - 2.0 * samples @ centers.T
+        + (centers * centers).sum(dim=-1)
+    )
+    min_dist, labels = dist.min(dim=-1)
+    return labels, min_dist
+
+
+def initialize_codebook_streaming(
+    batch_source: Union[Iterable[torch.Tensor], Callable[[], Iterable[torch.Tensor]]],
+    num_codes: int,
+    reservoir_size: int = 10000,
+    num_passes: int = 1,
+    reservoir_iters: int = 10,
+    random_state: int = 42
+) -> torch.Tensor:
+    """
+    스트리밍 mini-batch k-means로 코드북 초기화
+    
+    전체 샘플을 호스트로 복사하지 않고, 고정 크기 reservoir 샘플과
+    (K, d) 중심/카운트만 유지하므로 메모리 사용량이 데이터 크기와 무관하다.
+    
+    1. 스트림 앞부분으로 reservoir를 채운 뒤 k-means++ 시딩 + reservoir 위 Lloyd 반복
+    2. 이후 배치마다 mini-batch k-means 업데이트 (중심별 학습률 1/count, Sculley 2010)
+    3. reservoir는 스트림 끝까지 균등 샘플링을 유지하며, 끝까지 할당되지 않은
+       중심은 reservoir에서 오차가 큰 샘플로 재시딩
+    
+    Args:
+        batch_source: 잠재 벡터 배치 (N_i, d) iterator, 또는 여러 pass를 위해
+            새 iterator를 반환하는 callable (예: lambda: iter_latent_batches(model, loader))
+        num_codes: 코드북 크기
+        reservoir_size: reservoir 샘플 수 (num_codes 이상)
+        num_passes: 데이터 pass 수 (callable일 때만 2 이상 가능)
+        reservoir_iters: 시딩 후 reservoir 위 Lloyd 반복 횟수
+        random_state: 랜덤 시드
+    
+    Returns:
+        codebook: 초기화된 코드북 (K, d)
+    """
+    if not callable(batch_source) and num_passes > 1:
+        raise ValueError("여러 pass를 사용하려면 batch_source가 새 iterator를 반환하는 callable이어야 합니다.")
+    
+    reservoir_size = max(reservoir_size, num_codes)
+    generator = torch.Generator().manual_seed(random_state)
+    
+    reservoir: Optional[torch.Tensor] = None
+    seen = 0
+    centers: Optional[torch.Tensor] = None
+    counts: Optional[torch.Tensor] = None
+    
+    def seed():
+        # 시딩 전 배치는 모두 reservoir에 들어 있으므로 다시 흘려보내지 않고,
+        # reservoir 할당 수를 초기 카운트로 두어 이후 mini-batch 업데이트에서 가중치를 유지한다
+        nonlocal centers, counts
+        samples = reservoir[:min(seen, reservoir_size)]
+        centers = _kmeans_plus_plus(samples, num_codes, generator)
+        for _ in range(reservoir_iters):
+            labels, _ = _assign(samples, centers)
+            sums = torch.zeros_like(centers).index_add_(0, labels, samples)
+            n = torch.bincount(labels, minlength=num_codes).to(samples.dtype)
+            centers = torch.where(
+                n.unsqueeze(1) > 0, sums / n.clamp(min=1).unsqueeze(1), centers
+            )
+        labels, _ = _assign(samples, centers)
+        counts = torch.bincount(labels, minlength=num_codes).to(samples.dtype)
+    
+    def minibatch_update(batch: torch.Tensor):
+        nonlocal centers, counts
+        labels, _ = _assign(batch, centers)
+        sums = torch.zeros_like(centers).index_add_(0, labels, batch)
+        n = torch.bincount(labels, minlength=num_codes).to(batch.dtype)
+        counts = counts + n
+        step = n / counts.clamp(min=1)
+        means = sums / n.clamp(min=1).unsqueeze(1)
+        centers = centers + step.unsqueeze(1) * (means - centers)
+    
+    for pass_idx in range(num_passes):
+        batches = batch_source() if callable(batch_source) else batch_source
+        for batch in batches:
+            batch = batch.detach().reshape(-1, batch.shape[-1])
+            if batch.shape[0] == 0:
+                continue
+            
+            if pass_idx == 0:
+                # Reservoir 샘플링 (Algorithm R, 배치 단위 벡터화)
+                if reservoir is None:
+                    reservoir = batch.new_empty(reservoir_size, batch.shape[-1])
+                b = batch.shape[0]
+                positions = torch.arange(seen, seen + b)
+                fill = positions < reservoir_size
+                if fill.any():
+                    reservoir[positions[fill].to(batch.device)] = batch[fill.to(batch.device)]
+                replace_pos = torch.floor(
+                    torch.rand(b, generator=generator) * (positions + 1).double()
+                ).long()
+                replace = (~fill) & (replace_pos < reservoir_size)
+                if replace.any():
+                    reservoir[replace_pos[replace].to(batch.device)] = batch[replace.to(batch.device)]
+                seen += b
+                
+                if centers is None:
+                    if seen < reservoir_size:
+                        continue
+                    seed()
+                    continue
+            
+            minibatch_update(batch)
+        
+        if centers is None:
+            if reservoir is None or seen < num_codes:
+                raise ValueError(f"코드북 초기화에 필요한 샘플 수가 부족합니다: {seen} < {num_codes}")
+            seed()
+    
+    # 할당되지 않은 중심은 reservoir에서 오차가 큰 샘플로 재시딩
+    samples = reservoir[:min(seen, reservoir_size)]
+    labels, min_dist = _assign(samples, centers)
+    used = torch.bincount(labels, minlength=num_codes) > 0
+    dead = ~used
+    if dead.any():
+        num_dead = int(dead.sum())
+        far = torch.topk(min_dist, min(num_dead, samples.shape[0])).indices
+        dead_idx = torch.nonzero(dead).squeeze(1)[:far.shape[0]]
+        centers[dead_idx] = samples[far]
+    
+    return centers.float()
+
+
+def psnr_per_image(
+    img1: torch.Tensor,
+    img2: torch.Tensor,
+    data_range: float = 1.0
+) -> torch.Tensor:
+    """
+    이미지별 PSNR (Peak Signal-to-Noise Ratio) 계산
+    
+    Args:
+        img1: 첫 번째 이미지 (B, C, H, W)
+        img2: 두 번째 이미지 (B, C, H, W)
+        data_range: 픽셀 값 범위 (최댓값 - 최솟값)
+    
+    Returns:
+        psnr: 이미지별 PSNR (B,), 디바이스 텐서 (동일 이미지는 inf)
+    """
+    mse = ((img1.float() - img2.float()) ** 2).flatten(1).mean(dim=1)
+    return 10 * torch.log10(data_range ** 2 / mse)
+
+
+def gaussian_window(
+    window_size: int = 11,
+    sigma: float = 1.5,
+    device: Optional[torch.device] = None,
+    dtype: torch.dtype = torch.float32
+) -> torch.Tensor:
+    """정규화된 1차원 가우시안 윈도우 (window_size,)"""
+    coords = torch.arange(window_size, device=device, dtype=dtype) - (window_size - 1) / 2
+    window = torch.exp(-(coords ** 2) / (2 * sigma ** 2))
+    return window / window.sum()
+
+
+def ssim_per_image(
+    img1: torch.Tensor,
+    img2: torch.Tensor,
+    window_size: int = 11,
+    sigma: float = 1.5,
+    data_range: float = 1.0
+) -> torch.Tensor:
+    """
+    이미지별 가우시안 윈도우 SSIM (Structural Similarity Index) 계산
+    
+    가우시안 필터를 가로/세로 1차원 depthwise conv2d 두 번으로 분리하고,
+    x, y, x^2, y^2, xy 를 채널 방향으로 묶어 한 번에 필터링한다.
+    이미지가 윈도우보다 작으면 윈도우를 이미지 크기에 맞게 줄인다.
+    
+    Args:
+        img1: 첫 번째 이미지 (B, C, H, W)
+        img2: 두 번째 이미지 (B, C, H, W)
+        window_size: 가우시안 윈도우 크기
+        sigma: 가우시안 표준편차
+        data_range: 픽셀 값 범위 (최댓값 - 최솟값)
+    
+    Returns:
+        ssim: 이미지별 평균 SSIM (B,), 디바이스 텐서
+    """
+    img1 = img1.float()
+    img2 = img2.float()
+    B, C, H, W = img1.shape
+    
+    window_size = min(window_size, H, W)
+    window = gaussian_window(window_size, sigma, device=img1.device)
+    
+    groups = 5 * C
+    kernel_h = window.view(1, 1, window_size, 1).expand(groups, 1, window_size, 1)
+    kernel_w = window.view(1, 1, 1, window_size).expand(groups, 1, 1, window_size)
+    
+    stacked = torch.cat([img1, img2, img1 * img1, img2 * img2, img1 * img2], dim=1)
+    filtered = F.conv2d(F.conv2d(stacked, kernel_h, groups=groups), kernel_w, groups=groups)
+    mu1, mu2, e11, e22, e12 = filtered.split(C, dim=1)
+    
+    mu1_sq = mu1 * mu1
+    mu2_sq = mu2 * mu2
+    mu12 = mu1 * mu2
+    sigma1_sq = e11 - mu1_sq
+    sigma2_sq = e22 - mu2_sq
+    sigma12 = e12 - mu12
+    
+    C1 = (0.01 * data_range) ** 2
+    C2 = (0.03 * data_range) ** 2
+    
+    ssim_map = ((2 * mu12 + C1) * (2 * sigma12 + C2)) / \
+               ((mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2))
+    
+    return ssim_map.flatten(1).mean(dim=1)
+
+
+def compute_psnr(img1: torch.Tensor, img2: torch.Tensor, data_range: float = 1.0) -> float:
     """
     PSNR (Peak Signal-to-Noise Ratio) 계산
     
     Args:
         img1: 첫 번째 이미지 (B, C, H, W)
         img2: 두 번째 이미지 (B, C, H, W)
+        data_range: 픽셀 값 범위
     
     Returns:
-        psnr: 평균 PSNR 값
+        psnr: 배치 전체 MSE 기준 PSNR 값 (이미지별 평균은 psnr_per_image(...).mean())
     """
     mse = torch.mean((img1 - img2) ** 2)
     if mse == 0:
         return float('inf')
     
-    max_val = 1.0  # 이미지가 [-1, 1] 범위라고 가정
-    psnr = 20 * torch.log10(max_val / torch.sqrt(mse))
+    psnr = 20 * torch.log10(data_range / torch.sqrt(mse))
     
     return psnr.item()
 
@@ -57,34 +325,116 @@ def compute_psnr(img1: torch.Tensor, img2: torch.Tensor) -> float:
 def compute_ssim(
     img1: torch.Tensor,
     img2: torch.Tensor,
-    window_size: int = 11
+    window_size: int = 11,
+    data_range: float = 1.0
 ) -> float:
     """
-    SSIM (Structural Similarity Index) 계산 (간단한 버전)
+    SSIM (Structural Similarity Index) 계산
     
     Args:
         img1: 첫 번째 이미지 (B, C, H, W)
         img2: 두 번째 이미지 (B, C, H, W)
-        window_size: 윈도우 크기
+        window_size: 가우시안 윈도우 크기
+        data_range: 픽셀 값 범위
     
     Returns:
-        ssim: 평균 SSIM 값
+        ssim: 이미지별 SSIM의 평균
+    """
+    return ssim_per_image(img1, img2, window_size, data_range=data_range).mean().item()
+
+
+class ImageQualityMeter:
     """
-    # 간단한 구현: 실제로는 더 정교한 SSIM 계산 필요
-    mu1 = torch.mean(img1)
-    mu2 = torch.mean(img2)
+    스트리밍 PSNR/SSIM 누적기
     
-    sigma1_sq = torch.var(img1)
-    sigma2_sq = torch.var(img2)
-    sigma12 = torch.mean((img1 - mu1) * (img2 - mu2))
+    배치마다 이미지별 값을 디바이스 텐서로 누적하고 compute()에서만 호스트로 가져온다.
     
-    C1 = 0.01 ** 2
-    C2 = 0.03 ** 2
+    Args:
+        window_size: SSIM 가우시안 윈도우 크기
+        data_range: 픽셀 값 범위
+        keep_per_image: 이미지별 값 벡터 보관 여부
+    """
+    
+    def __init__(self, window_size: int = 11, data_range: float = 1.0, keep_per_image: bool = False):
+        self.window_size = window_size
+        self.data_range = data_range
+        self.keep_per_image = keep_per_image
+        self.reset()
+    
+    def reset(self):
+        """누적값 초기화"""
+        self._sums: Optional[torch.Tensor] = None  # (psnr 합, ssim 합)
+        self._count = 0
+        self._psnr = []
+        self._ssim = []
+    
+    @torch.no_grad()
+    def update(self, img1: torch.Tensor, img2: torch.Tensor):
+        """배치 누적 (호스트 동기화 없음)"""
+        psnr = psnr_per_image(img1, img2, self.data_range)
+        ssim = ssim_per_image(img1, img2, self.window_size, data_range=self.data_range)
+        
+        sums = torch.stack([psnr.sum(), ssim.sum()])
+        self._sums = sums if self._sums is None else self._sums + sums
+        self._count += psnr.shape[0]
+        if self.keep_per_image:
+            self._psnr.append(psnr)
+            self._ssim.append(ssim)
+    
+    def compute(self) -> Dict[str, Union[float, torch.Tensor]]:
+        """
+        평균 PSNR/SSIM (한 번의 동기화)
+        
+        Returns:
+            psnr, ssim, num_images (keep_per_image이면 psnr_per_image, ssim_per_image 텐서 포함)
+        """
+        if self._count == 0:
+            return {}
+        
+        psnr, ssim = (self._sums / self._count).tolist()
+        result = {'psnr': psnr, 'ssim': ssim, 'num_images': self._count}
+        if self.keep_per_image:
+            result['psnr_per_image'] = torch.cat(self._psnr).cpu()
+            result['ssim_per_image'] = torch.cat(self._ssim).cpu()
+        return result
+
+
+@torch.no_grad()
+def evaluate_reconstruction(
+    model,
+    data_loader: Iterable[torch.Tensor],
+    device: Optional[torch.device] = None,
+    window_size: int = 11,
+    keep_per_image: bool = False
+) -> Dict[str, Union[float, torch.Tensor]]:
+    """
+    검증 세트 재구성 품질 평가 (스트리밍)
+    
+    Args:
+        model: SCQ Autoencoder
+        data_loader: 이미지 배치 iterator (float 또는 uint8 프레임)
+        device: 디바이스 (None이면 모델 파라미터의 디바이스)
+        window_size: SSIM 가우시안 윈도우 크기
+        keep_per_image: 이미지별 값 벡터 반환 여부
+    
+    Returns:
+        ImageQualityMeter.compute() 결과
+    """
+    from app.scq.frame_store import frames_to_float
     
-    ssim = ((2 * mu1 * mu2 + C1) * (2 * sigma12 + C2)) / \
-           ((mu1 ** 2 + mu2 ** 2 + C1) * (sigma1_sq + sigma2_sq + C2))
+    if device is None:
+        device = next(model.parameters()).device
+    was_training = model.training
+    model.eval()
     
-    return ssim.item()
+    meter = ImageQualityMeter(window_size=window_size, keep_per_image=keep_per_image)
+    for x in data_loader:
+        x = frames_to_float(x.to(device))
+        x_recon, _, _, _ = model(x)
+        meter.update(x_recon, x)
+    
+    model.train(was_training)
+    return meter.compute()
 
 
 def estimate_bitrate(
@@ -111,3 +461,31 @@ def estimate_bitrate(
     
     return bitrate
 
+
+def measure_bitrate(
+    data: bytes,
+    alpha: torch.Tensor,
+    num_codes: int
+) -> Dict[str, float]:
+    """
+    실제 압축 페이로드 기준 비트레이트 측정 (추정치와 함께 보고)
+    
+    Args:
+        data: 압축된 잠재 표현 바이트열 (encode_to_bytes 결과)
+        alpha: 볼록 결합 계수 (B, H, W, K) 또는 희소 가중치 (B, H, W, m)
+        num_codes: 코드북 크기
+    
+    Returns:
+        report: payload_bytes, num_positions, measured_bits_per_position,
+            estimated_bits_per_position
+    """
+    num_positions = int(np.prod(alpha.shape[:-1]))
+    measured = len(data) * 8 / max(num_positions, 1)
+    
+    return {
+        'payload_bytes': float(len(data)),
+        'num_positions': float(num_positions),
+        'measured_bits_per_position': measured,
+        'estimated_bits_per_position': float(estimate_bitrate(alpha, num_codes))
+    }
+
@@ -0,0 +1,321 @@
+"""
+SCQ Unit #2 시각 재위치추정 (landmark feature matching)
+
+카메라 프레임의 특징 벡터(또는 SCQ 코드)로 층별 랜드마크 인덱스를 검색하고,
+매칭된 랜드마크의 position_x / position_y / heading을 유사도 가중 평균하여 pose를 추정한다.
+
+- 인덱스는 (indoor_map_id, floor)별로 캐시되며 서버 시작 시 미리 만들 수 있다 (warm)
+- 랜드마크가 변경되어 커밋되면 해당 실내 맵의 캐시를 무효화한다
+"""
+import base64
+import binascii
+import logging
+import math
+import threading
+import numpy as np
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.services.scq_inference import ModelUnavailableError
+from app.services.vector_index import VectorIndex, extract_feature_vector
+
+logger = logging.getLogger(__name__)
+
+FloorKey = Tuple[str, int]
+
+
+class FloorIndex(NamedTuple):
+    """층 하나의 랜드마크 인덱스"""
+    index: VectorIndex
+    positions: np.ndarray   # (N, 2), 인덱스 행 순서가 아니라 id 기준 조회
+    headings: np.ndarray    # (N,), heading이 없으면 nan
+    zone_ids: List[Optional[str]]
+    rows: Dict[str, int]    # landmark id -> positions 행
+
+
+class PoseEstimate(NamedTuple):
+    """재위치추정 결과"""
+    x: float
+    y: float
+    floor: int
+    heading: Optional[float]
+    confidence: float
+    zone_id: Optional[str]
+    landmark_ids: List[str]
+
+
+def query_vector_from_frame(camera_frame: Optional[Dict[str, Any]], scq_service=None) -> Optional[np.ndarray]:
+    """
+    카메라 프레임에서 검색 쿼리 벡터 추출
+
+    "features" 벡터가 있으면 그대로 사용하고, 없으면 "scq_code"(base64 SCQL 컨테이너,
+    /api/v1/scq/encode 결과)를 SCQ 코드북으로 복원해 공간 평균한 잠재 벡터를 사용한다.
+    """
+    if not camera_frame:
+        return None
+
+    vector = extract_feature_vector(camera_frame.get("features"))
+    if vector is not None:
+        return vector
+
+    code = camera_frame.get("scq_code")
+    if not code or scq_service is None:
+        return None
+    try:
+        data = base64.b64decode(code, validate=True)
+        z_q = scq_service.model.latent_from_bytes(data)  # (B, D, H, W)
+    except (binascii.Error, ValueError, ModelUnavailableError) as e:
+        logger.warning(f"SCQ 코드를 복원할 수 없습니다: {e}")
+        return None
+    return z_q.mean(dim=(0, 2, 3)).detach().cpu().numpy().astype(np.float32)
+
+
+class RelocalizationEngine:
+    """
+    랜드마크 특징 매칭 기반 실내 재위치추정 엔진
+
+    Args:
+        top_k: 층별 검색 후보 수
+        min_similarity: pose 추정에 사용할 최소 코사인 유사도
+        sharpness: 유사도 가중치 지수 (클수록 최상위 매칭에 집중)
+    """
+
+    def __init__(self, top_k: int = 5, min_similarity: float = 0.5, sharpness: float = 4.0):
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.sharpness = sharpness
+        self._floors: Dict[FloorKey, Optional[FloorIndex]] = {}
+        self._maps: Dict[str, List[int]] = {}  # 실내 맵별로 로드된 층 목록
+        self._lock = threading.RLock()
+        self._sync = None
+
+    # ---- 인덱스 캐시 ----
+
+    def _build_floors(self, db, indoor_map_id: Optional[str] = None) -> Dict[FloorKey, FloorIndex]:
+        from app.models.landmark import Landmark
+
+        query = db.query(
+            Landmark.id, Landmark.indoor_map_id, Landmark.floor, Landmark.zone_id,
+            Landmark.position_x, Landmark.position_y, Landmark.heading, Landmark.features
+        ).filter(
+            Landmark.is_active == True,
+            Landmark.indoor_map_id.isnot(None),
+            Landmark.features.isnot(None)
+        )
+        if indoor_map_id is not None:
+            query = query.filter(Landmark.indoor_map_id == indoor_map_id)
+
+        grouped: Dict[FloorKey, list] = {}
+        for row in query:
+            vector = extract_feature_vector(row.features)
+            if vector is None:
+                continue
+            grouped.setdefault((str(row.indoor_map_id), int(row.floor)), []).append((row, vector))
+
+        floors = {}
+        for key, items in grouped.items():
+            # 층 안에서 가장 흔한 차원만 사용
+            dims = [vector.shape[0] for _, vector in items]
+            dim = max(set(dims), key=dims.count)
+            items = [(row, vector) for row, vector in items if vector.shape[0] == dim]
+
+            ids = [str(row.id) for row, _ in items]
+            index = VectorIndex(dim, metric="cosine", capacity=len(items))
+            index.upsert(ids, np.stack([vector for _, vector in items]))
+            floors[key] = FloorIndex(
+                index=index,
+                positions=np.array(
+                    [[float(row.position_x), float(row.position_y)] for row, _ in items],
+                    dtype=np.float64
+                ),
+                headings=np.array(
+                    [float(row.heading) if row.heading is not None else np.nan for row, _ in items],
+                    dtype=np.float64
+                ),
+                zone_ids=[str(row.zone_id) if row.zone_id else None for row, _ in items],
+                rows={item_id: i for i, item_id in enumerate(ids)}
+            )
+        return floors
+
+    def _load_map(self, db, indoor_map_id: str) -> List[int]:
+        with self._lock:
+            if indoor_map_id in self._maps:
+                return self._maps[indoor_map_id]
+
+        floors = self._build_floors(db, indoor_map_id)
+        with self._lock:
+            for key, floor_index in floors.items():
+                self._floors[key] = floor_index
+            self._maps[indoor_map_id] = sorted(floor for _, floor in floors)
+            return self._maps[indoor_map_id]
+
+    def warm(self, db) -> int:
+        """
+        모든 실내 맵의 층별 인덱스를 미리 생성 (서버 시작 시)
+
+        Returns:
+            생성된 층 인덱스 수
+        """
+        floors = self._build_floors(db)
+        with self._lock:
+            self._floors = dict(floors)
+            self._maps = {}
+            for map_id, floor in floors:
+                self._maps.setdefault(map_id, []).append(floor)
+            for map_floors in self._maps.values():
+                map_floors.sort()
+        return len(floors)
+
+    def invalidate(self, indoor_map_id: Optional[str] = None):
+        """캐시 무효화 (None이면 전체)"""
+        with self._lock:
+            if indoor_map_id is None:
+                self._floors.clear()
+                self._maps.clear()
+                return
+            indoor_map_id = str(indoor_map_id)
+            self._maps.pop(indoor_map_id, None)
+            for key in [k for k in self._floors if k[0] == indoor_map_id]:
+                del self._floors[key]
+
+    def get_floor_index(self, db, indoor_map_id: Any, floor: int) -> Optional[FloorIndex]:
+        """층 인덱스 (캐시에 없으면 해당 실내 맵 전체를 로드)"""
+        indoor_map_id = str(indoor_map_id)
+        self._load_map(db, indoor_map_id)
+        with self._lock:
+            return self._floors.get((indoor_map_id, int(floor)))
+
+    # ---- pose 추정 ----
+
+    def _estimate(self, floor: int, floor_index: FloorIndex, ids: List[str], scores: np.ndarray) -> Optional[PoseEstimate]:
+        keep = scores >= self.min_similarity
+        if not keep.any():
+            return None
+        ids = [i for i, k in zip(ids, keep) if k]
+        scores = scores[keep].astype(np.float64)
+        rows = np.array([floor_index.rows[i] for i in ids])
+
+        weights = scores ** self.sharpness
+        weights /= weights.sum()
+        x, y = weights @ floor_index.positions[rows]
+
+        # heading은 원형 가중 평균 (heading이 있는 랜드마크만)
+        headings = floor_index.headings[rows]
+        has_heading = ~np.isnan(headings)
+        heading = None
+        if has_heading.any():
+            radians = np.deg2rad(headings[has_heading])
+            w = weights[has_heading]
+            heading = float(np.rad2deg(math.atan2(w @ np.sin(radians), w @ np.cos(radians))) % 360.0)
+
+        confidence = float(np.clip(weights @ scores, 0.0, 1.0))
+        return PoseEstimate(
+            x=float(x),
+            y=float(y),
+            floor=floor,
+            heading=heading,
+            confidence=confidence,
+            zone_id=floor_index.zone_ids[rows[0]],
+            landmark_ids=ids
+        )
+
+    def localize(
+        self,
+        db,
+        query: np.ndarray,
+        indoor_map_id: Any,
+        floor: Optional[int] = None
+    ) -> Optional[PoseEstimate]:
+        """
+        쿼리 벡터로 pose 추정
+
+        Args:
+            db: SQLAlchemy 세션 (캐시에 없는 실내 맵을 로드할 때 사용)
+            query: 카메라 프레임 특징 벡터
+            indoor_map_id: 실내 맵 ID
+            floor: 층 (None이면 모든 층을 검색해 최고 유사도 층 선택)
+
+        Returns:
+            PoseEstimate (충분히 유사한 랜드마크가 없으면 None)
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        indoor_map_id = str(indoor_map_id)
+        floors = self._load_map(db, indoor_map_id)
+        if floor is not None:
+            floors = [f for f in floors if f == int(floor)]
+
+        best = None
+        for f in floors:
+            with self._lock:
+                floor_index = self._floors.get((indoor_map_id, f))
+            if floor_index is None or floor_index.index.dim != query.shape[0]:
+                continue
+            result = floor_index.index.search(query, k=self.top_k)[0]
+            if not result.ids:
+                continue
+            if best is None or result.scores[0] > best[2].scores[0]:
+                best = (f, floor_index, result)
+
+        if best is None:
+            return None
+        f, floor_index, result = best
+        return self._estimate(f, floor_index, result.ids, result.scores)
+
+    # ---- ORM 변경 반영 ----
+
+    def watch_landmarks(self, session_class=None):
+        """랜드마크 변경이 커밋되면 해당 실내 맵 캐시 무효화"""
+        from sqlalchemy import event, inspect
+        from sqlalchemy.orm import Session
+        from app.models.landmark import Landmark
+
+        if self._sync is not None:
+            return
+        session_class = session_class or Session
+        key = f"relocalization_{id(self)}"
+
+        def after_flush(session, flush_context):
+            changed = session.info.setdefault(key, set())
+            for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+                if not isinstance(obj, Landmark):
+                    continue
+                history = inspect(obj).attrs.indoor_map_id.history
+                if obj in session.dirty and history.deleted:
+                    # 실내 맵이 바뀐 랜드마크: 이전 맵과 새 맵 모두 무효화
+                    changed.update(str(m) for m in history.deleted if m)
+                if obj.indoor_map_id:
+                    changed.add(str(obj.indoor_map_id))
+
+        def after_commit(session):
+            for map_id in session.info.pop(key, ()):
+                self.invalidate(map_id)
+
+        def after_rollback(session, previous_transaction):
+            session.info.pop(key, None)
+
+        listeners = [
+            ("after_flush", after_flush),
+            ("after_commit", after_commit),
+            ("after_soft_rollback", after_rollback)
+        ]
+        for name, fn in listeners:
+            event.listen(session_class, name, fn)
+        self._sync = (session_class, listeners)
+
+    def unwatch_landmarks(self):
+        """이벤트 등록 해제"""
+        from sqlalchemy import event
+
+        if self._sync is None:
+            return
+        session_class, listeners = self._sync
+        for name, fn in listeners:
+            event.remove(session_class, name, fn)
+        self._sync = None
+
+
+_engine = RelocalizationEngine()
+
+
+def get_relocalization_engine() -> RelocalizationEngine:
+    """프로세스 전역 재위치추정 엔진"""
+    return _engine
@@ -0,0 +1,480 @@
+"""
+SCQ 서버 측 추론 서비스
+
+카메라 프레임(JPEG 등)을 받아 SCQ 희소 코드(app.scq.codec 포맷)로 인코딩한다.
+
+- 모델 가중치는 첫 요청 시 한 번만 로드 (지연 로드, 레지스트리 모델은 메모리 맵)
+- swap_model()로 서버 재시작 없이 모델을 교체한다. 배치는 시작 시점의 모델 참조를 잡고
+  처리하므로 교체 중에도 처리 중인 요청이 끊기지 않는다
+- MicroBatcher가 동시 요청을 수 ms 동안 모아 한 번의 배치 encode/quantize로 처리하고
+  결과를 요청별로 돌려준다 (모델 호출은 전용 워커 스레드 1개에서 직렬 실행)
+
+torch/Pillow는 선택 의존성이므로 모델을 로드할 때 import한다.
+"""
+import asyncio
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    비동기 마이크로배처
+
+    submit()으로 들어온 요청을 max_wait_ms 동안(또는 max_batch_size가 찰 때까지) 모아
+    process_batch(items) -> results 를 executor에서 한 번 호출하고, 결과를 각 요청에 나눠준다.
+    배치 처리 중 예외가 나면 해당 배치의 모든 요청에 같은 예외가 전달된다.
+
+    Args:
+        process_batch: 항목 리스트를 받아 같은 길이의 결과 리스트를 반환하는 함수
+        max_batch_size: 배치 최대 크기
+        max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (ms)
+        executor: process_batch를 실행할 executor (None이면 워커 스레드 1개)
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="scq-infer")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 관측용 카운터
+        self.num_batches = 0
+        self.num_items = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """현재 이벤트 루프에서 배치 수집 태스크 시작"""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        """수집 태스크를 멈추고 대기 중인 요청을 실패 처리"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("SCQ 추론 서비스가 종료되었습니다."))
+
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def submit(self, item: Any) -> Any:
+        """항목 1개 처리 요청 (배치 처리 결과 중 해당 항목 결과 반환)"""
+        # 시작 전이거나 다른 이벤트 루프에서 호출되면 현재 루프에서 수집 태스크를 (재)시작
+        self.start()
+        future = self._loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # 대기 중 취소된 요청은 제외
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.process_batch, items)
+                if len(results) != len(items):
+                    raise RuntimeError("배치 결과 수가 요청 수와 일치하지 않습니다.")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.num_batches += 1
+            self.num_items += len(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class ModelUnavailableError(RuntimeError):
+    """모델을 로드할 수 없음"""
+
+
+class EncodedFrame(NamedTuple):
+    """프레임 1장의 SCQ 인코딩 결과"""
+    payload: bytes
+    height: int
+    width: int
+    num_candidates: int
+    num_codes: int
+    latent_dim: int
+    model_version: Optional[str] = None
+
+
+class SCQEncoderService:
+    """
+    SCQ 프레임 인코딩 서비스
+
+    Args:
+        model: 학습된 SCQ Autoencoder (None이면 첫 사용 시 loader로 로드)
+        image_size: 입력 프레임 리사이즈 크기 (정사각형)
+        num_candidates: 위치별 희소 코드 수 (m)
+        max_batch_size: 마이크로배치 최대 크기
+        max_wait_ms: 마이크로배치 수집 대기 시간 (ms)
+        loader: () -> (model, version) 지연 로드 함수
+        version: model의 버전 이름
+    """
+
+    def __init__(
+        self,
+        model=None,
+        image_size: int = 64,
+        num_candidates: int = 8,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        loader: Optional[Callable[[], Tuple[Any, Optional[str]]]] = None,
+        version: Optional[str] = None
+    ):
+        if model is None and loader is None:
+            raise ValueError("model 또는 loader가 필요합니다.")
+        # (모델, 버전)을 튜플 하나로 바꿔 끼워 읽는 쪽이 항상 일관된 쌍을 보도록 함
+        self._state: Tuple[Any, Optional[str]] = (model.eval() if model is not None else None, version)
+        self._loader = loader
+        self._load_lock = threading.Lock()
+        self.image_size = image_size
+        self.num_candidates = num_candidates
+        self.batcher = MicroBatcher(
+            self.encode_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self._state[0] is not None
+
+    @property
+    def loaded_state(self) -> Tuple[Any, Optional[str]]:
+        """(모델, 버전) 스냅샷 (로드를 유발하지 않으며, 로드 전이면 모델은 None)"""
+        return self._state
+
+    def _current(self) -> Tuple[Any, Optional[str]]:
+        """(모델, 버전) 스냅샷 (필요하면 지연 로드)"""
+        state = self._state
+        if state[0] is not None:
+            return state
+        with self._load_lock:
+            if self._state[0] is None:
+                start = time.perf_counter()
+                try:
+                    model, version = self._loader()
+                except Exception as e:
+                    logger.error(f"SCQ 모델 로드 실패: {e}")
+                    raise ModelUnavailableError(f"SCQ 모델을 로드할 수 없습니다: {e}") from e
+                self._state = (model.eval(), version)
+                logger.info(f"SCQ 모델 로드 완료: {version} ({time.perf_counter() - start:.2f}s)")
+            return self._state
+
+    @property
+    def model(self):
+        return self._current()[0]
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._current()[1]
+
+    @property
+    def num_codes(self) -> int:
+        return self.model.num_codes
+
+    @property
+    def latent_dim(self) -> int:
+        return self.model.latent_dim
+
+    def swap_model(self, model, version: Optional[str] = None):
+        """
+        모델 교체 (원자적)
+
+        처리 중인 배치는 이전 모델로 끝나고, 이후 배치부터 새 모델을 사용한다.
+        """
+        model = model.eval()
+        # 지연 로드 중이면 끝난 뒤 교체 (로드 결과가 교체를 덮어쓰지 않도록)
+        with self._load_lock:
+            self._state = (model, version)
+        logger.info(f"SCQ 모델 교체: {version}")
+
+    def decode_frame(self, data: bytes):
+        """
+        이미지 바이트열(JPEG/PNG 등)을 (3, S, S) float 텐서로 변환
+
+        Raises:
+            ValueError: 이미지로 읽을 수 없는 경우
+        """
+        import numpy as np
+        import torch
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                image = image.convert("RGB").resize(
+                    (self.image_size, self.image_size), Image.BILINEAR
+                )
+                array = np.array(image, dtype=np.uint8)
+        except (UnidentifiedImageError, OSError) as e:
+            raise ValueError(f"이미지를 디코딩할 수 없습니다: {e}") from e
+
+        return torch.from_numpy(array).permute(2, 0, 1).float().div_(255.0)
+
+    def encode_batch(self, frames: List) -> List[EncodedFrame]:
+        """
+        프레임 배치를 한 번의 encode/quantize로 처리 (워커 스레드에서 실행)
+
+        Args:
+            frames: (3, S, S) 텐서 리스트
+
+        Returns:
+            프레임별 EncodedFrame
+        """
+        import torch
+        from app.scq.codec import pack_codes
+
+        # 배치 도중 모델이 교체되어도 이 배치는 같은 모델로 처리
+        model, version = self._current()
+        device = next(model.parameters()).device
+        with torch.inference_mode():
+            x = torch.stack(frames).to(device)
+            z = model.encode(x)
+            _, indices, weights = model.quantize_sparse(z, num_candidates=self.num_candidates)
+
+        _, H, W, m = indices.shape
+        return [
+            EncodedFrame(
+                payload=pack_codes(
+                    indices[i:i + 1], weights[i:i + 1], model.num_codes, model.latent_dim
+                ),
+                height=H,
+                width=W,
+                num_candidates=m,
+                num_codes=model.num_codes,
+                latent_dim=model.latent_dim,
+                model_version=version
+            )
+            for i in range(indices.shape[0])
+        ]
+
+    async def encode(self, data: bytes) -> EncodedFrame:
+        """이미지 바이트열 1장 인코딩 (동시 요청과 함께 배치 처리)"""
+        # JPEG 디코딩은 이벤트 루프를 막지 않도록 기본 executor에서 수행
+        frame = await asyncio.get_running_loop().run_in_executor(None, self.decode_frame, data)
+        return await self.batcher.submit(frame)
+
+    def start(self):
+        self.batcher.start()
+
+    async def stop(self):
+        await self.batcher.stop()
+
+
+def load_scq_model(
+    path: str,
+    latent_dim: int = 128,
+    num_codes: int = 256,
+    scq_lambda: float = 1e-3
+):
+    """
+    체크포인트에서 SCQ Autoencoder 로드
+
+    에폭 체크포인트(state_dict)와 재개용 체크포인트({'model': state_dict, ...}) 모두 지원한다.
+    """
+    import torch
+    from app.scq import SCQAutoencoder
+
+    model = SCQAutoencoder(
+        latent_dim=latent_dim, num_codes=num_codes, scq_lambda=scq_lambda,
+        device=torch.device("cpu")
+    )
+    state = torch.load(path, map_location="cpu", weights_only=False)
+    if isinstance(state, dict) and 'model' in state:
+        state = state['model']
+    model.load_state_dict(state)
+    return model.eval()
+
+
+_service: Optional[SCQEncoderService] = None
+
+
+def get_scq_service() -> Optional[SCQEncoderService]:
+    """실행 중인 SCQ 인코딩 서비스 (없으면 None)"""
+    return _service
+
+
+def model_loader(settings, version: Optional[str] = None) -> Optional[Callable[[], Tuple[Any, Optional[str]]]]:
+    """
+    설정에 맞는 () -> (model, version) 로드 함수 (설정이 없으면 None)
+
+    SCQ_REGISTRY_DIR가 있으면 레지스트리에서 SCQ_MODEL_NAME의 version
+    (None이면 SCQ_MODEL_VERSION, 그것도 없으면 CURRENT)을 메모리 맵으로 로드하고,
+    없으면 SCQ_MODEL_PATH 체크포인트를 로드한다.
+    """
+    if settings.scq_registry_dir:
+        def load():
+            from app.scq.registry import ModelRegistry
+
+            model, entry = ModelRegistry(settings.scq_registry_dir).load(
+                settings.scq_model_name, version or settings.scq_model_version
+            )
+            return model, entry.label
+
+        return load
+
+    if settings.scq_model_path:
+        def load():
+            model = load_scq_model(
+                settings.scq_model_path,
+                latent_dim=settings.scq_latent_dim,
+                num_codes=settings.scq_num_codes,
+                scq_lambda=settings.scq_lambda
+            )
+            return model, settings.scq_model_path
+
+        return load
+
+    return None
+
+
+def load_scq_codebook(settings, version: Optional[str] = None) -> Optional[Any]:
+    """
+    설정된 모델의 SCQ 코드북 (K, d) numpy 배열 (모델을 로드하지 않음, 설정이 없으면 None)
+
+    특징 벡터 인덱스의 IVF coarse quantizer로 쓰이며, 버전 선택은 model_loader와 같다.
+    """
+    if settings.scq_registry_dir:
+        from app.scq.registry import ModelRegistry
+
+        codebook = ModelRegistry(settings.scq_registry_dir).load_codebook(
+            settings.scq_model_name, version or settings.scq_model_version
+        )
+        return codebook.numpy()
+
+    if settings.scq_model_path:
+        import torch
+        from app.scq.registry import CODEBOOK_KEY
+
+        state = torch.load(settings.scq_model_path, map_location="cpu", weights_only=False)
+        if isinstance(state, dict) and 'model' in state:
+            state = state['model']
+        return state[CODEBOOK_KEY].numpy()
+
+    return None
+
+
+async def start_scq_service(settings) -> Optional[SCQEncoderService]:
+    """
+    인코딩 서비스 시작 (서버 시작 시 1회)
+
+    모델은 첫 요청 시 워커 스레드에서 로드하므로 서버 시작이 모델 크기에 영향받지 않는다.
+    모델 설정이 없으면 서비스 없이 계속 진행한다.
+    """
+    global _service
+    loader = model_loader(settings)
+    if loader is None:
+        logger.info("SCQ_REGISTRY_DIR / SCQ_MODEL_PATH 미설정: SCQ 인코딩 엔드포인트 비활성")
+        return None
+
+    service = SCQEncoderService(
+        image_size=settings.scq_image_size,
+        num_candidates=settings.scq_num_candidates,
+        max_batch_size=settings.scq_max_batch_size,
+        max_wait_ms=settings.scq_max_wait_ms,
+        loader=loader
+    )
+    service.start()
+    _service = service
+    return service
+
+
+async def reload_scq_model(settings, version: Optional[str] = None) -> Optional[str]:
+    """
+    모델을 새로 로드해 실행 중인 서비스에 원자적으로 교체 (서버 재시작 없이)
+
+    로드는 기본 executor에서 수행하며, 로드하는 동안과 교체 시점의 요청은 이전 모델로 처리된다.
+
+    Returns:
+        교체된 모델 버전
+
+    Raises:
+        KeyError: 레지스트리에 없는 버전
+        ModelUnavailableError: 서비스가 없거나 로드 실패
+    """
+    loader = model_loader(settings, version)
+    if _service is None or loader is None:
+        raise ModelUnavailableError("SCQ 인코딩 서비스가 실행 중이 아닙니다.")
+
+    try:
+        model, loaded_version = await asyncio.get_running_loop().run_in_executor(None, loader)
+    except KeyError:
+        # 등록되지 않았거나 형식이 잘못된 버전 (호출자가 404로 응답)
+        raise
+    except Exception as e:
+        raise ModelUnavailableError(f"SCQ 모델을 로드할 수 없습니다: {e}") from e
+    _service.swap_model(model, loaded_version)
+
+    # 특징 벡터 인덱스의 IVF 할당을 새 코드북으로 갱신
+    from app.services.vector_index import set_coarse_quantizers
+
+    codebook = model.scq_layer.codebook.detach().cpu().numpy()
+    await asyncio.get_running_loop().run_in_executor(None, set_coarse_quantizers, codebook)
+    return loaded_version
+
+
+async def stop_scq_service():
+    """인코딩 서비스 종료"""
+    global _service
+    if _service is not None:
+        await _service.stop()
+        _service = None
+
+
+def set_scq_service(service: Optional[SCQEncoderService]):
+    """서비스 교체 (테스트 및 모델 핫스왑용)"""
+    global _service
+    _service = service
@@ -0,0 +1,123 @@
+"""
+반경 검색 공간 쿼리
+
+POI/건물/목적지의 근처 검색을 DB 쿼리 하나로 만든다 (필터, 거리 정렬, 페이지네이션 모두 DB에서 수행).
+
+- PostGIS: geography 식 GiST 인덱스(docs/CREATE_SPATIAL_INDEXES.sql)로 ST_DWithin 반경 필터, <-> KNN 정렬
+- bbox (PostGIS가 없을 때, SQLite 포함): (latitude, longitude) B-tree 인덱스로 경계 상자 범위 검색 후
+  등장방형(equirectangular) 근사 거리로 원 안만 남기고 정렬 (반경 수 km 이내에서 오차 0.1% 미만)
+"""
+import logging
+import math
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from sqlalchemy import Float, cast, func, text
+from app.config import settings
+from app.services.geo import METERS_PER_DEGREE
+
+logger = logging.getLogger(__name__)
+
+SPATIAL_BACKENDS = ("auto", "postgis", "bbox")
+
+# 엔진 URL별 PostGIS 설치 여부
+_postgis_support: Dict[str, bool] = {}
+
+
+class SpatialFilter(NamedTuple):
+    """반경 검색 조건과 정렬용 거리 식 (postgis: 미터, bbox: 미터 제곱)"""
+    where: List[Any]
+    distance: Any
+
+
+def has_postgis(connection) -> bool:
+    """
+    연결된 DB에서 PostGIS 공간 쿼리를 쓸지 여부 (SPATIAL_BACKEND, 엔진별로 한 번만 확인)
+
+    Args:
+        connection: 동기 Connection (Session.connection())
+    """
+    backend = settings.spatial_backend
+    if backend not in SPATIAL_BACKENDS:
+        raise ValueError(f"지원하지 않는 SPATIAL_BACKEND입니다: {backend} (가능: {', '.join(SPATIAL_BACKENDS)})")
+    if backend != "auto":
+        return backend == "postgis"
+    if connection.dialect.name != "postgresql":
+        return False
+
+    key = str(connection.engine.url)
+    if key not in _postgis_support:
+        installed = connection.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")).first()
+        _postgis_support[key] = installed is not None
+        logger.info(f"공간 쿼리: {'PostGIS' if installed else 'bbox (PostGIS 없음)'}")
+    return _postgis_support[key]
+
+
+async def has_postgis_async(db) -> bool:
+    """AsyncSession용 has_postgis"""
+    return await db.run_sync(lambda session: has_postgis(session.connection()))
+
+
+def bounding_box(lat: float, lng: float, radius: float) -> Tuple[float, float, float, float]:
+    """
+    반경 radius(미터) 원을 감싸는 위경도 경계 상자
+
+    Returns:
+        (min_lat, max_lat, min_lng, max_lng)
+    """
+    dlat = radius / METERS_PER_DEGREE
+    # 극 근처에서는 경도 폭이 무한대로 커지므로 전체 경도로 제한 (날짜변경선 넘김은 처리하지 않음)
+    cos_lat = math.cos(math.radians(lat))
+    dlng = dlat / cos_lat if cos_lat > dlat / 180.0 else 180.0
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def geography_point(lat, lng):
+    """위경도(컬럼 또는 값)의 PostGIS geography 식 (인덱스 식과 같은 형태)"""
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(cast(lng, Float), cast(lat, Float)), 4326))
+
+
+def nearby(lat_column, lng_column, lat: float, lng: float, radius: float, postgis: bool) -> SpatialFilter:
+    """
+    (lat, lng)에서 radius(미터) 이내 조건과 거리 정렬 식
+
+    Args:
+        lat_column, lng_column: 모델의 위도/경도 컬럼
+        postgis: has_postgis() 결과
+    """
+    if postgis:
+        point = geography_point(lat_column, lng_column)
+        origin = geography_point(lat, lng)
+        return SpatialFilter(
+            where=[func.ST_DWithin(point, origin, radius)],
+            distance=point.op("<->", return_type=Float)(origin)
+        )
+
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+    dy = (cast(lat_column, Float) - lat) * METERS_PER_DEGREE
+    dx = (cast(lng_column, Float) - lng) * (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+    distance = dy * dy + dx * dx
+    return SpatialFilter(
+        where=[
+            # 컬럼(Numeric)과 같은 타입으로 비교해야 B-tree 인덱스 범위 검색이 됨
+            lat_column.between(Decimal(repr(min_lat)), Decimal(repr(max_lat))),
+            lng_column.between(Decimal(repr(min_lng)), Decimal(repr(max_lng))),
+            distance <= radius * radius
+        ],
+        distance=distance
+    )
+
+
+def planar_nearby(x_column, y_column, x: float, y: float, radius: float) -> SpatialFilter:
+    """실내 좌표(미터)에서 (x, y) 반경 radius 이내 조건과 거리 정렬 식 (미터 제곱)"""
+    dx = cast(x_column, Float) - x
+    dy = cast(y_column, Float) - y
+    distance = dx * dx + dy * dy
+    return SpatialFilter(
+        where=[
+            x_column.between(Decimal(repr(x - radius)), Decimal(repr(x + radius))),
+            y_column.between(Decimal(repr(y - radius)), Decimal(repr(y + radius))),
+            distance <= radius * radius
+        ],
+        distance=distance
+    )
@@ -0,0 +1,687 @@
+"""
+랜드마크/POI 특징 벡터 인메모리 검색 인덱스
+
+Landmark.features / POI.features(JSONB)의 벡터를 연속된 float32 행렬로 보관하고
+top-k 코사인/L2 검색을 수행한다.
+
+- Flat: 전체 행렬과 한 번의 행렬곱
+- IVF: SCQ 코드북(또는 k-means 중심)을 coarse quantizer로 사용해 nprobe개 리스트만 탐색
+- PQ: IVF 잔차(residual)를 곱 양자화한 코드로 후보를 근사 점수화한 뒤 원본 벡터로 재정렬
+- 디렉토리에 .npy로 저장하고 np.load(mmap_mode="c")로 메모리 맵 로드
+- upsert/remove로 증분 갱신, ORM 커밋 시 자동 반영 (FeatureIndexSync)
+"""
+import json
+import logging
+import os
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+METRICS = ("cosine", "l2")
+
+# features JSONB에서 벡터를 찾을 키 (리스트 자체도 허용)
+FEATURE_VECTOR_KEYS = ("vector", "embedding", "features")
+
+
+class SearchResult(NamedTuple):
+    """쿼리 1개의 검색 결과 (점수는 클수록 가까움: 코사인 유사도 또는 -L2 거리)"""
+    ids: List[str]
+    scores: np.ndarray
+
+
+def extract_feature_vector(features: Any) -> Optional[np.ndarray]:
+    """
+    features JSONB 값에서 float32 벡터 추출
+
+    리스트이거나 {"vector" | "embedding" | "features": [...]} 형태를 지원한다.
+    """
+    if features is None:
+        return None
+    if isinstance(features, dict):
+        for key in FEATURE_VECTOR_KEYS:
+            if key in features:
+                features = features[key]
+                break
+        else:
+            return None
+    try:
+        vector = np.asarray(features, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    if vector.ndim != 1 or vector.size == 0 or not np.isfinite(vector).all():
+        return None
+    return vector
+
+
+def kmeans(
+    data: np.ndarray,
+    num_clusters: int,
+    num_iters: int = 20,
+    random_state: int = 0
+) -> np.ndarray:
+    """
+    numpy Lloyd k-means (IVF 중심 및 PQ 부분 코드북 학습용)
+
+    Returns:
+        중심 (num_clusters, d), float32
+    """
+    data = np.ascontiguousarray(data, dtype=np.float32)
+    rng = np.random.default_rng(random_state)
+    n = data.shape[0]
+    centers = data[rng.choice(n, size=num_clusters, replace=n < num_clusters)].copy()
+
+    data_sq = (data * data).sum(axis=1, keepdims=True)
+    for _ in range(num_iters):
+        dist = data_sq - 2.0 * data @ centers.T + (centers * centers).sum(axis=1)
+        assign = dist.argmin(axis=1)
+        counts = np.bincount(assign, minlength=num_clusters)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, assign, data)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+        # 빈 클러스터는 임의 샘플로 재초기화
+        empty = np.flatnonzero(~nonempty)
+        if empty.size:
+            centers[empty] = data[rng.choice(n, size=empty.size)]
+    return centers
+
+
+class VectorIndex:
+    """
+    특징 벡터 검색 인덱스
+
+    Args:
+        dim: 벡터 차원
+        metric: "cosine" 또는 "l2" (cosine은 저장 시 L2 정규화)
+        capacity: 초기 행렬 용량 (부족하면 2배씩 확장)
+    """
+
+    def __init__(self, dim: int, metric: str = "cosine", capacity: int = 1024):
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 metric입니다: {metric} (가능: {METRICS})")
+        self.dim = dim
+        self.metric = metric
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((max(1, capacity), dim), dtype=np.float32)
+
+        # IVF / PQ 상태
+        self.centroids: Optional[np.ndarray] = None
+        self.nprobe = 1
+        self._assign = np.zeros(self._vectors.shape[0], dtype=np.int32)
+        self.pq_codebooks: Optional[np.ndarray] = None  # (M, 256, d/M)
+        self._pq_codes = np.zeros((self._vectors.shape[0], 0), dtype=np.uint8)
+        # 저장된 인덱스를 만든 DB 상태 (load 시 meta.json에서 읽음)
+        self.source: Optional[Dict[str, Any]] = None
+        # IVF 역색인 (리스트별 행 번호를 이어 붙인 배열과 리스트 시작 오프셋), 할당이 바뀌면 다시 만듦
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        # 검색과 증분 갱신이 다른 스레드에서 일어날 수 있음
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return str(item_id) in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """저장된 벡터 (N, d) 뷰"""
+        return self._vectors[:len(self.ids)]
+
+    @property
+    def is_ivf(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def has_pq(self) -> bool:
+        return self.pq_codebooks is not None
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"벡터 차원이 일치하지 않습니다: {vectors.shape[1]} (예상: {self.dim})")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+        return vectors
+
+    def _reserve(self, size: int):
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        n = len(self.ids)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:n] = self._vectors[:n]
+        assign = np.zeros(capacity, dtype=np.int32)
+        assign[:n] = self._assign[:n]
+        codes = np.zeros((capacity, self._pq_codes.shape[1]), dtype=np.uint8)
+        codes[:n] = self._pq_codes[:n]
+        self._vectors, self._assign, self._pq_codes = vectors, assign, codes
+
+    # ---- 증분 갱신 ----
+
+    def upsert(self, ids: Sequence[Any], vectors: np.ndarray):
+        """벡터 추가 또는 교체 (기존 id는 같은 행을 덮어씀)"""
+        ids = [str(i) for i in ids]
+        vectors = self._prepare(vectors)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids와 vectors의 개수가 일치하지 않습니다.")
+
+        with self._lock:
+            new_ids = [i for i in dict.fromkeys(ids) if i not in self._rows]
+            self._reserve(len(self.ids) + len(new_ids))
+            for item_id in new_ids:
+                self._rows[item_id] = len(self.ids)
+                self.ids.append(item_id)
+
+            rows = np.array([self._rows[i] for i in ids], dtype=np.int64)
+            self._vectors[rows] = vectors
+            if self.is_ivf:
+                self._assign[rows] = self._coarse_assign(vectors)
+                self._lists = None
+            if self.has_pq:
+                self._pq_codes[rows] = self._pq_encode(vectors, self._assign[rows])
+
+    def remove(self, ids: Iterable[Any]) -> int:
+        """
+        벡터 삭제 (마지막 행을 빈 자리로 옮겨 행렬을 연속으로 유지)
+
+        Returns:
+            삭제된 개수
+        """
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                row = self._rows.pop(str(item_id), None)
+                if row is None:
+                    continue
+                last = len(self.ids) - 1
+                if row != last:
+                    moved = self.ids[last]
+                    self.ids[row] = moved
+                    self._rows[moved] = row
+                    self._vectors[row] = self._vectors[last]
+                    self._assign[row] = self._assign[last]
+                    self._pq_codes[row] = self._pq_codes[last]
+                self.ids.pop()
+                removed += 1
+            if removed:
+                self._lists = None
+        return removed
+
+    # ---- IVF / PQ ----
+
+    def set_coarse_quantizer(self, centroids: np.ndarray, nprobe: int = 8):
+        """
+        IVF coarse quantizer 설정 (예: SCQ 코드북 scq_layer.codebook)
+
+        기존 PQ 코드는 잔차 기준이 바뀌므로 제거된다.
+        """
+        centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        if centroids.ndim != 2 or centroids.shape[1] != self.dim:
+            raise ValueError(f"coarse quantizer shape이 올바르지 않습니다: {centroids.shape}")
+        with self._lock:
+            # 코사인 인덱스는 정규화된 벡터 공간에서 할당
+            self.centroids = self._prepare(centroids) if self.metric == "cosine" else centroids
+            self.nprobe = max(1, min(nprobe, self.centroids.shape[0]))
+            n = len(self.ids)
+            if n:
+                self._assign[:n] = self._coarse_assign(self.vectors)
+            self.pq_codebooks = None
+            self._pq_codes = np.zeros((self._vectors.shape[0], 0), dtype=np.uint8)
+            self._lists = None
+
+    def uses_coarse_quantizer(self, centroids: np.ndarray) -> bool:
+        """centroids가 현재 IVF 중심과 같은지 (저장된 인덱스가 바뀐 코드북으로 만들어졌는지 확인용)"""
+        if not self.is_ivf:
+            return False
+        centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        if centroids.shape != self.centroids.shape:
+            return False
+        if self.metric == "cosine":
+            centroids = self._prepare(centroids)
+        return np.array_equal(self.centroids, centroids)
+
+    def train_coarse_quantizer(self, num_lists: int, nprobe: int = 8, random_state: int = 0):
+        """현재 벡터로 k-means 중심을 학습해 IVF 설정 (SCQ 코드북이 없을 때)"""
+        if len(self) == 0:
+            raise ValueError("학습할 벡터가 없습니다.")
+        self.set_coarse_quantizer(
+            kmeans(self.vectors, min(num_lists, len(self)), random_state=random_state), nprobe
+        )
+
+    def _coarse_assign(self, vectors: np.ndarray) -> np.ndarray:
+        c = self.centroids
+        dist = (c * c).sum(axis=1) - 2.0 * vectors @ c.T
+        return dist.argmin(axis=1).astype(np.int32)
+
+    def train_pq(self, num_subspaces: int = 8, num_iters: int = 20, random_state: int = 0):
+        """
+        IVF 잔차 곱 양자화 학습 (부분공간당 최대 256 코드, uint8)
+
+        Args:
+            num_subspaces: 부분공간 수 (M, dim의 약수)
+        """
+        if not self.is_ivf:
+            raise ValueError("PQ는 IVF 모드에서만 사용할 수 있습니다 (set_coarse_quantizer 먼저 호출).")
+        if self.dim % num_subspaces != 0:
+            raise ValueError(f"dim({self.dim})이 num_subspaces({num_subspaces})로 나누어떨어지지 않습니다.")
+        if len(self) == 0:
+            raise ValueError("학습할 벡터가 없습니다.")
+
+        with self._lock:
+            n = len(self)
+            residuals = self.vectors - self.centroids[self._assign[:n]]
+            sub_dim = self.dim // num_subspaces
+            num_codes = min(256, n)
+            self.pq_codebooks = np.stack([
+                kmeans(residuals[:, m * sub_dim:(m + 1) * sub_dim], num_codes, num_iters, random_state)
+                for m in range(num_subspaces)
+            ])
+            self._pq_codes = np.zeros((self._vectors.shape[0], num_subspaces), dtype=np.uint8)
+            self._pq_codes[:n] = self._pq_encode(self.vectors, self._assign[:n])
+
+    def _pq_encode(self, vectors: np.ndarray, assign: np.ndarray) -> np.ndarray:
+        residuals = vectors - self.centroids[assign]
+        M, _, sub_dim = self.pq_codebooks.shape
+        codes = np.empty((vectors.shape[0], M), dtype=np.uint8)
+        for m in range(M):
+            sub = residuals[:, m * sub_dim:(m + 1) * sub_dim]
+            book = self.pq_codebooks[m]
+            dist = (book * book).sum(axis=1) - 2.0 * sub @ book.T
+            codes[:, m] = dist.argmin(axis=1)
+        return codes
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(리스트 순으로 정렬한 행 번호, 리스트별 시작 오프셋 (C + 1,))"""
+        if self._lists is None:
+            assign = self._assign[:len(self)]
+            rows = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=self.centroids.shape[0])
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self._lists = (rows, offsets)
+        return self._lists
+
+    # ---- 검색 ----
+
+    def _exact_scores(self, queries: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        vectors = self.vectors if rows is None else self._vectors[rows]
+        dots = queries @ vectors.T
+        if self.metric == "cosine":
+            return dots
+        # -||q - x||^2
+        return 2.0 * dots - (vectors * vectors).sum(axis=1) - (queries * queries).sum(axis=1, keepdims=True)
+
+    def _pq_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """비대칭 거리 계산(ADC)으로 후보의 -||q - x̂||^2 근사"""
+        M, _, sub_dim = self.pq_codebooks.shape
+        residuals = query - self.centroids[self._assign[rows]]  # (R, d)
+        codes = self._pq_codes[rows]
+        dist = np.zeros(rows.shape[0], dtype=np.float32)
+        for m in range(M):
+            sub = residuals[:, m * sub_dim:(m + 1) * sub_dim]
+            recon = self.pq_codebooks[m][codes[:, m]]
+            dist += ((sub - recon) ** 2).sum(axis=1)
+        return -dist
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        nprobe: Optional[int] = None,
+        rerank: int = 4
+    ) -> List[SearchResult]:
+        """
+        top-k 검색
+
+        Args:
+            queries: 쿼리 벡터 (d,) 또는 (Q, d)
+            k: 반환 개수
+            nprobe: IVF 탐색 리스트 수 (None이면 인덱스 기본값)
+            rerank: PQ 사용 시 k * rerank개 후보를 원본 벡터로 재정렬
+
+        Returns:
+            쿼리별 SearchResult (점수 내림차순)
+        """
+        queries = self._prepare(queries)
+        with self._lock:
+            n = len(self)
+            if n == 0:
+                return [SearchResult([], np.zeros(0, dtype=np.float32)) for _ in queries]
+
+            if not self.is_ivf:
+                scores = self._exact_scores(queries, None)
+                return [self._top_k(np.arange(n), row_scores, k) for row_scores in scores]
+
+            nprobe = max(1, min(nprobe or self.nprobe, self.centroids.shape[0]))
+            c = self.centroids
+            centroid_dist = (c * c).sum(axis=1) - 2.0 * queries @ c.T
+            probes = np.argsort(centroid_dist, axis=1)[:, :nprobe]
+            list_rows, offsets = self._inverted_lists()
+
+            results = []
+            for query, probe in zip(queries, probes):
+                # 탐색할 리스트의 행만 모음 (행 순서로 정렬해 동점 순서를 평면 검색과 맞춤)
+                rows = np.sort(np.concatenate([list_rows[offsets[p]:offsets[p + 1]] for p in probe]))
+                if rows.size == 0:
+                    results.append(SearchResult([], np.zeros(0, dtype=np.float32)))
+                    continue
+                if self.has_pq and rows.size > k * rerank:
+                    approx = self._pq_scores(query, rows)
+                    keep = np.argpartition(-approx, k * rerank)[:k * rerank]
+                    rows = rows[keep]
+                scores = self._exact_scores(query[None], rows)[0]
+                results.append(self._top_k(rows, scores, k))
+            return results
+
+    def _top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> SearchResult:
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k] if k < scores.shape[0] else np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return SearchResult([self.ids[r] for r in rows[top]], scores[top].astype(np.float32))
+
+    # ---- 저장 / 로드 ----
+
+    def save(self, path: Path, source: Optional[Dict[str, Any]] = None):
+        """
+        디렉토리에 저장 (배열은 .npy, 메타데이터는 meta.json)
+
+        각 파일은 임시 파일에 쓴 뒤 교체하고 meta.json을 마지막에 쓴다.
+
+        Args:
+            source: 인덱스를 만든 DB 상태 (source_fingerprint), 로드 시 최신 여부 확인에 사용
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            n = len(self)
+            arrays = {
+                'vectors': self._vectors[:n],
+                'assign': self._assign[:n],
+                'pq_codes': self._pq_codes[:n]
+            }
+            if self.is_ivf:
+                arrays['centroids'] = self.centroids
+            if self.has_pq:
+                arrays['pq_codebooks'] = self.pq_codebooks
+            meta = {
+                'version': INDEX_VERSION,
+                'dim': self.dim,
+                'metric': self.metric,
+                'nprobe': self.nprobe,
+                'ids': list(self.ids),
+                'arrays': sorted(arrays),
+                'source': source
+            }
+
+            for name, array in arrays.items():
+                tmp_path = path / f".{name}.npy.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, np.ascontiguousarray(array))
+                os.replace(tmp_path, path / f"{name}.npy")
+
+            tmp_path = path / ".meta.json.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, path / "meta.json")
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "VectorIndex":
+        """
+        저장된 인덱스 로드
+
+        mmap=True이면 copy-on-write 메모리 맵으로 열어 필요한 페이지만 읽고,
+        증분 갱신으로 용량이 늘어날 때 메모리로 복사된다.
+        """
+        path = Path(path)
+        with open(path / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 버전입니다: {meta.get('version')}")
+
+        mmap_mode = "c" if mmap else None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in meta['arrays']}
+
+        index = cls(meta['dim'], metric=meta['metric'], capacity=1)
+        index.ids = list(meta['ids'])
+        index._rows = {item_id: row for row, item_id in enumerate(index.ids)}
+        n = len(index.ids)
+        if n:
+            index._vectors = arrays['vectors']
+            index._assign = arrays['assign']
+            index._pq_codes = arrays['pq_codes']
+        else:
+            index._pq_codes = np.zeros((1, arrays['pq_codes'].shape[1]), dtype=np.uint8)
+        index.centroids = arrays.get('centroids')
+        index.pq_codebooks = arrays.get('pq_codebooks')
+        index.nprobe = meta['nprobe']
+        index.source = meta.get('source')
+        return index
+
+
+def _feature_rows(db, model, active_only: bool = True):
+    query = db.query(model.id, model.features).filter(model.features.isnot(None))
+    if active_only:
+        query = query.filter(model.is_active == True)
+    return query
+
+
+def source_fingerprint(db, model, active_only: bool = True) -> Dict[str, Any]:
+    """
+    인덱스 대상 행의 DB 상태 (행 수, 최근 updated_at)
+
+    저장된 인덱스와 다르면 다른 워커나 재시작 전의 추가/수정/삭제가 반영되지 않은 것이다.
+    """
+    from sqlalchemy import func
+
+    count, last_updated = _feature_rows(db, model, active_only).with_entities(
+        func.count(model.id), func.max(model.updated_at)
+    ).one()
+    return {'count': count, 'updated_at': last_updated.isoformat() if last_updated else None}
+
+
+def build_feature_index(
+    db,
+    model,
+    metric: str = "cosine",
+    dim: Optional[int] = None,
+    active_only: bool = True
+) -> Optional[VectorIndex]:
+    """
+    DB의 features 컬럼으로 인덱스 생성
+
+    Args:
+        db: SQLAlchemy 세션
+        model: models.POI 또는 models.Landmark
+        metric: "cosine" 또는 "l2"
+        dim: 벡터 차원 (None이면 첫 번째 유효 벡터 기준, 다른 차원은 건너뜀)
+        active_only: is_active 행만 포함
+
+    Returns:
+        인덱스 (유효한 벡터가 없고 dim도 없으면 None)
+    """
+    ids, vectors, skipped = [], [], 0
+    for item_id, features in _feature_rows(db, model, active_only):
+        vector = extract_feature_vector(features)
+        if vector is None or (dim is not None and vector.shape[0] != dim):
+            skipped += 1
+            continue
+        dim = vector.shape[0] if dim is None else dim
+        ids.append(item_id)
+        vectors.append(vector)
+
+    if skipped:
+        logger.warning(f"{model.__tablename__}: 특징 벡터 {skipped}개를 건너뛰었습니다 (형식/차원 불일치)")
+    if dim is None:
+        return None
+
+    index = VectorIndex(dim, metric=metric, capacity=max(len(ids), 1))
+    if ids:
+        index.upsert(ids, np.stack(vectors))
+    return index
+
+
+class FeatureIndexSync:
+    """
+    ORM 변경을 인덱스에 증분 반영
+
+    flush 시점에 model 인스턴스의 추가/수정/삭제를 세션에 모아 두었다가
+    커밋이 끝난 뒤에만 인덱스에 반영한다 (롤백 시 버림).
+
+    Args:
+        index: 갱신할 인덱스
+        model: models.POI 또는 models.Landmark
+        session_class: 이벤트를 등록할 세션 클래스 (기본: 모든 Session)
+    """
+
+    def __init__(self, index: VectorIndex, model, session_class=None):
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        self.index = index
+        self.model = model
+        self.session_class = session_class or Session
+        self._key = f"vector_index_sync_{id(self)}"
+        self._event = event
+
+        event.listen(self.session_class, "after_flush", self._after_flush)
+        event.listen(self.session_class, "after_commit", self._after_commit)
+        event.listen(self.session_class, "after_soft_rollback", self._after_rollback)
+
+    def close(self):
+        """이벤트 등록 해제"""
+        self._event.remove(self.session_class, "after_flush", self._after_flush)
+        self._event.remove(self.session_class, "after_commit", self._after_commit)
+        self._event.remove(self.session_class, "after_soft_rollback", self._after_rollback)
+
+    def _after_flush(self, session, flush_context):
+        pending = session.info.setdefault(self._key, {})
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, self.model):
+                active = getattr(obj, "is_active", True) is not False
+                pending[str(obj.id)] = extract_feature_vector(obj.features) if active else None
+        for obj in session.deleted:
+            if isinstance(obj, self.model):
+                pending[str(obj.id)] = None
+
+    def _after_commit(self, session):
+        pending = session.info.pop(self._key, None)
+        if not pending:
+            return
+        removed = {i for i, v in pending.items() if v is None or v.shape[0] != self.index.dim}
+        upserts = {i: v for i, v in pending.items() if i not in removed}
+        self.index.remove(removed)
+        if upserts:
+            self.index.upsert(list(upserts), np.stack(list(upserts.values())))
+
+    def _after_rollback(self, session, previous_transaction):
+        session.info.pop(self._key, None)
+
+
+# ---- 프로세스 전역 인덱스 (POI 인식 등에서 사용) ----
+
+_indexes: Dict[str, VectorIndex] = {}
+
+
+def get_feature_index(name: str) -> Optional[VectorIndex]:
+    """등록된 인덱스 ("poi", "landmark" 등)"""
+    return _indexes.get(name)
+
+
+def set_feature_index(name: str, index: Optional[VectorIndex]):
+    """인덱스 등록/해제"""
+    if index is None:
+        _indexes.pop(name, None)
+    else:
+        _indexes[name] = index
+
+
+def _apply_coarse_quantizer(index: VectorIndex, coarse_quantizer: Optional[np.ndarray], nprobe: int) -> bool:
+    """차원이 같고 아직 쓰고 있지 않은 coarse quantizer면 적용 (적용 여부 반환)"""
+    if (coarse_quantizer is None or coarse_quantizer.ndim != 2
+            or coarse_quantizer.shape[1] != index.dim or index.uses_coarse_quantizer(coarse_quantizer)):
+        return False
+    index.set_coarse_quantizer(coarse_quantizer, nprobe=nprobe)
+    return True
+
+
+def set_coarse_quantizers(coarse_quantizer: np.ndarray, nprobe: int = 8) -> List[str]:
+    """
+    등록된 인덱스에 새 coarse quantizer 적용 (SCQ 모델 교체 시 새 코드북으로 다시 할당)
+
+    Returns:
+        다시 할당한 인덱스 이름
+    """
+    updated = [
+        name for name, index in list(_indexes.items())
+        if _apply_coarse_quantizer(index, coarse_quantizer, nprobe)
+    ]
+    if updated:
+        logger.info(f"IVF coarse quantizer 갱신: {', '.join(updated)}")
+    return updated
+
+
+def warm_feature_indexes(
+    session_factory,
+    sources: Dict[str, Any],
+    index_dir: Optional[Path] = None,
+    metric: str = "cosine",
+    coarse_quantizer: Optional[np.ndarray] = None,
+    nprobe: int = 8
+) -> Dict[str, VectorIndex]:
+    """
+    서버 시작 시 인덱스 준비 및 등록
+
+    index_dir/<name>에 저장된 인덱스가 현재 DB 상태(source_fingerprint)와 같으면 메모리 맵으로 로드하고,
+    없거나 오래되었으면 DB에서 생성한 뒤 저장한다. 이후 ORM 변경은 FeatureIndexSync로 반영된다.
+
+    Args:
+        session_factory: 세션 팩토리 (예: SessionLocal)
+        sources: {"poi": models.POI, "landmark": models.Landmark}
+        index_dir: 인덱스 저장 디렉토리 (None이면 저장하지 않음)
+        metric: 새로 생성할 인덱스의 metric
+        coarse_quantizer: IVF 중심 (예: SCQ 코드북, 차원이 같은 인덱스에 적용하며
+            저장된 인덱스의 중심과 다르면 다시 할당한 뒤 저장)
+        nprobe: IVF 탐색 리스트 수
+    """
+    loaded = {}
+    for name, model in sources.items():
+        path = Path(index_dir) / name if index_dir else None
+        db = session_factory()
+        try:
+            source = source_fingerprint(db, model)
+            index = None
+            if path is not None and (path / "meta.json").exists():
+                index = VectorIndex.load(path)
+                if index.source != source:
+                    logger.info(f"{name}: 저장된 인덱스가 DB와 달라 다시 생성합니다.")
+                    index = None
+            changed = index is None
+            if index is None:
+                index = build_feature_index(db, model, metric=metric)
+            if index is not None:
+                # 새 인덱스, 또는 다른 코드북(이전 모델)으로 저장된 인덱스
+                changed = _apply_coarse_quantizer(index, coarse_quantizer, nprobe) or changed
+                if changed:
+                    index.source = source
+                    if path is not None:
+                        index.save(path, source=source)
+        finally:
+            db.close()
+
+        if index is None:
+            logger.info(f"{name}: 특징 벡터가 없어 인덱스를 만들지 않았습니다.")
+            continue
+        FeatureIndexSync(index, model)
+        set_feature_index(name, index)
+        loaded[name] = index
+        logger.info(f"{name} 특징 벡터 인덱스 준비 완료: {len(index)}개, dim={index.dim}")
+    return loaded
@@ -0,0 +1 @@
+# SCQ 벤치마크
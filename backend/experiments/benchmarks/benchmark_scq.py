@@ -0,0 +1,101 @@
+"""
+SCQ 처리량/메모리 벤치마크 스위트
+
+솔버, SCQLayer, SCQAutoencoder의 forward / forward+backward samples/sec와 피크 메모리를
+파라미터 스윕으로 측정하고, 기준 결과와 비교해 회귀가 있으면 종료 코드 1을 반환한다.
+
+예시:
+    python experiments/benchmarks/benchmark_scq.py --targets solver layer autoencoder \\
+        --batch-sizes 4 16 --num-codes 64 256 --output results.json
+    python experiments/benchmarks/benchmark_scq.py --save-baseline   # 기준 결과 갱신
+"""
+import argparse
+import torch
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.scq.benchmark import (
+    compare_to_baseline,
+    load_results,
+    run_suite,
+    save_results,
+    sweep_configs
+)
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "scq_baseline.json"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SCQ 처리량/메모리 벤치마크")
+    parser.add_argument("--targets", nargs="+", default=["solver", "layer", "autoencoder"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[4, 16])
+    parser.add_argument("--num-codes", nargs="+", type=int, default=[64, 256])
+    parser.add_argument("--dims", nargs="+", type=int, default=[64])
+    parser.add_argument("--lams", nargs="+", type=float, default=[1e-3])
+    parser.add_argument("--solvers", nargs="+", default=["fista"])
+    parser.add_argument("--spatial", type=int, default=4, help="잠재 맵 한 변 크기")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--iters", type=int, default=5)
+    parser.add_argument("--no-memory", action="store_true", help="피크 메모리 측정 생략")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준 결과로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="처리량 허용 하락 비율")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="메모리 허용 증가 비율")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+    device = torch.device(args.device)
+
+    configs = sweep_configs(
+        targets=args.targets,
+        batch_sizes=args.batch_sizes,
+        num_codes=args.num_codes,
+        codebook_dims=args.dims,
+        lams=args.lams,
+        solvers=args.solvers,
+        spatial=args.spatial
+    )
+    print(f"디바이스={device}, 스레드={torch.get_num_threads()}, 설정 {len(configs)}개")
+    results = run_suite(
+        configs, device=device, warmup=args.warmup, iters=args.iters,
+        measure_memory=not args.no_memory, verbose=True
+    )
+
+    if args.output is not None:
+        save_results(results, args.output)
+        print(f"결과 저장: {args.output}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"기준 결과 저장: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"기준 결과가 없습니다: {args.baseline} (--save-baseline으로 생성)")
+        return 1
+
+    comparisons = compare_to_baseline(
+        results, load_results(args.baseline),
+        tolerance=args.tolerance, memory_tolerance=args.memory_tolerance
+    )
+    regressions = [c for c in comparisons if c['regression']]
+    for c in regressions:
+        print(
+            f"⚠️ 회귀: {c['name']} {c['metric']} "
+            f"{c['baseline']:.1f} -> {c['current']:.1f} ({c['ratio']:.2f}x)"
+        )
+    print(f"비교 {len(comparisons)}건, 회귀 {len(regressions)}건")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
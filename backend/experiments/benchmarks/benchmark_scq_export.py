@@ -0,0 +1,63 @@
+"""
+SCQ 추론 그래프 export 지연 시간 벤치마크 (CPU)
+
+eager 모델과 export된 모듈(TorchScript, channels-last, int8 conv)의
+프레임당 지연 시간을 비교한다. eager는 같은 top-m 희소 양자화(quantize_sparse)와
+전체 코드북 quantize 두 가지로 측정한다.
+"""
+import torch
+from pathlib import Path
+import sys
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.scq.scq_autoencoder import SCQAutoencoder
+from app.scq.export import export_inference_module, compare_with_eager
+
+
+def main():
+    """메인 함수"""
+    torch.manual_seed(0)
+    batch_size = 8
+    num_candidates = 8
+    
+    model = SCQAutoencoder(
+        input_channels=3,
+        latent_dim=128,
+        num_codes=256,
+        scq_lambda=1e-3
+    ).eval()
+    
+    # 체크포인트가 있으면 로드 (없으면 랜덤 가중치로 측정)
+    checkpoint = project_root / "experiments" / "nav_ar" / "checkpoints" / "scq_nav_epoch_10.pth"
+    if checkpoint.exists():
+        model.load_state_dict(torch.load(checkpoint, map_location="cpu"))
+    
+    x = torch.randn(batch_size, 3, 64, 64)
+    
+    configs = {
+        "trace": dict(backend="trace"),
+        "trace+channels_last+int8": dict(backend="trace", channels_last=True, quantize_int8=True),
+        "trace+hard": dict(backend="trace", hard=True),
+    }
+    
+    print(f"디바이스=cpu, 배치={batch_size}, 스레드={torch.get_num_threads()}")
+    for name, kwargs in configs.items():
+        exported = export_inference_module(model, x, num_candidates=num_candidates, **kwargs)
+        # 하드 할당은 후보 1개의 희소 양자화와 같은 알고리즘
+        m = 1 if kwargs.get("hard") else num_candidates
+        result = compare_with_eager(model, x, exported, num_candidates=m)
+        print(
+            f"{name:28s} "
+            f"eager(top-{m}): {result['eager']['frame_ms']:.2f} ms/frame, "
+            f"eager(full): {result['eager_full']['frame_ms']:.2f} ms/frame, "
+            f"exported: {result['exported']['frame_ms']:.2f} ms/frame, "
+            f"speedup: {result['speedup']['frame']:.2f}x "
+            f"(full 대비 {result['speedup']['frame_vs_full']:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@ AR 음식 인식용 SCQ 모델 학습 스크립트
 """
 import torch
 import torch.nn as nn
-import torch.optim as optim
 from torch.utils.data import DataLoader, Dataset
 from pathlib import Path
 import sys
@@ -12,8 +11,11 @@ import sys
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.scq.scq_autoencoder import SCQAutoencoder, compute_loss
-from app.scq.utils import compute_psnr, compute_ssim, estimate_bitrate
+from app.scq.scq_autoencoder import SCQAutoencoder
+from app.scq.utils import evaluate_reconstruction
+from app.scq.trainer import train_scq
+from app.scq.frame_store import INDEX_FILENAME, MMapFrameDataset, make_frame_loader
+from app.scq.registry import ModelRegistry
 
 
 class SimpleImageDataset(Dataset):
@@ -38,7 +40,8 @@ def train_scq_food(
     train_loader: DataLoader,
     num_epochs: int = 10,
     device: torch.device = None,
-    save_dir: Path = None
+    save_dir: Path = None,
+    world_size: int = 1
 ):
     """
     AR 음식 인식용 SCQ 모델 학습
@@ -49,59 +52,20 @@ def train_scq_food(
         num_epochs: 에폭 수
         device: 디바이스
         save_dir: 모델 저장 디렉토리
+        world_size: CPU 데이터 병렬 워커 프로세스 수 (1이면 단일 프로세스)
     """
-    if device is None:
-        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-    
-    model = model.to(device)
-    optimizer = optim.Adam(model.parameters(), lr=1e-4)
-    
-    print(f"학습 시작: 디바이스={device}, 에폭={num_epochs}")
-    
-    for epoch in range(num_epochs):
-        model.train()
-        total_loss = 0.0
-        
-        for batch_idx, x in enumerate(train_loader):
-            x = x.to(device)
-            
-            # Forward pass
-            x_recon, z, z_q, stats = model(x)
-            
-            # 손실 계산
-            loss, loss_dict = compute_loss(
-                x_recon, x, z, z_q, stats,
-                recon_weight=1.0,
-                commitment_weight=0.25,
-                entropy_weight=0.01
-            )
-            
-            # 역전파
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
-            
-            total_loss += loss_dict['total_loss']
-            
-            if batch_idx % 10 == 0:
-                print(
-                    f"Epoch {epoch+1}/{num_epochs}, "
-                    f"Batch {batch_idx}, "
-                    f"Loss: {loss_dict['total_loss']:.4f}"
-                )
-        
-        avg_loss = total_loss / len(train_loader)
-        print(f"\nEpoch {epoch+1} 완료: Avg Loss: {avg_loss:.4f}\n")
-        
-        # 모델 저장
-        if save_dir is not None:
-            save_dir.mkdir(parents=True, exist_ok=True)
-            torch.save(
-                model.state_dict(),
-                save_dir / f"scq_food_epoch_{epoch+1}.pth"
-            )
-    
-    print("학습 완료!")
+    train_scq(
+        model=model,
+        train_loader=train_loader,
+        num_epochs=num_epochs,
+        device=device,
+        save_dir=save_dir,
+        checkpoint_prefix="scq_food",
+        recon_weight=1.0,
+        commitment_weight=0.25,
+        entropy_weight=0.01,
+        world_size=world_size
+    )
 
 
 def main():
@@ -112,6 +76,8 @@ def main():
     num_epochs = 10
     latent_dim = 128
     num_codes = 256
+    world_size = 1  # CPU 데이터 병렬 워커 프로세스 수 (gloo DDP)
+    num_workers = 4  # 데이터 로더 워커 수
     
     # 모델 생성
     model = SCQAutoencoder(
@@ -122,11 +88,16 @@ def main():
         device=device
     )
     
-    # 더미 데이터 생성 (실제로는 데이터셋 로드)
-    print("⚠️ 더미 데이터를 사용합니다. 실제 데이터셋으로 교체하세요.")
-    dummy_images = torch.randn(100, 3, 64, 64)
-    dataset = SimpleImageDataset(dummy_images)
-    train_loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+    # 프레임 저장소(write_frame_store로 생성)가 있으면 메모리 맵으로 읽고, 없으면 더미 데이터 사용
+    frame_dir = Path(__file__).parent / "frames"
+    if (frame_dir / INDEX_FILENAME).exists():
+        dataset = MMapFrameDataset(frame_dir)
+        train_loader = make_frame_loader(dataset, batch_size=batch_size, num_workers=num_workers)
+    else:
+        print("⚠️ 더미 데이터를 사용합니다. 실제 데이터셋으로 교체하세요.")
+        dummy_images = torch.randn(100, 3, 64, 64)
+        dataset = SimpleImageDataset(dummy_images)
+        train_loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
     
     # 학습
     save_dir = Path(__file__).parent / "checkpoints"
@@ -135,8 +106,15 @@ def main():
         train_loader=train_loader,
         num_epochs=num_epochs,
         device=device,
-        save_dir=save_dir
+        save_dir=save_dir,
+        world_size=world_size
     )
+    
+    # 평가 지표와 함께 모델 레지스트리에 등록 (API 서버는 SCQ_REGISTRY_DIR에서 로드)
+    metrics = evaluate_reconstruction(model, train_loader)
+    registry = ModelRegistry(project_root / "model_registry")
+    entry = registry.register("scq_food", model, metrics=metrics, promote=True)
+    print(f"모델 등록: {entry.label} (sha256={entry.sha256[:12]}, PSNR={metrics.get('psnr', 0):.2f})")
 
 
 if __name__ == "__main__":
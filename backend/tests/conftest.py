@@ -1,15 +1,18 @@
 """
 pytest 설정 및 공통 픽스처
 """
+import os
 import pytest
+import tempfile
 import uuid
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, JSON, String, TypeDecorator
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
-from app.database import Base, get_db
+from app.database import Base, get_async_db, get_db
 from app.main import app
 
 # SQLite용 UUID 타입 어댑터
@@ -40,8 +43,10 @@ class GUID(TypeDecorator):
         else:
             return value
 
-# 테스트용 인메모리 SQLite 데이터베이스
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# 테스트용 SQLite 데이터베이스
+# 동기 세션(db_session)과 비동기 라우터(get_async_db)가 같은 데이터를 보도록 임시 파일 사용
+_TEST_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="arway-test-"), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{_TEST_DB_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -49,6 +54,10 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+# TestClient는 요청마다 다른 스레드/이벤트 루프를 쓸 수 있으므로 연결을 재사용하지 않음
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{_TEST_DB_PATH}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # SQLite는 JSONB와 UUID를 지원하지 않으므로 변환 필요
 # 모든 테이블의 JSONB 컬럼을 JSON으로, UUID 컬럼을 GUID로 변경
 for table in Base.metadata.tables.values():
@@ -82,7 +91,12 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
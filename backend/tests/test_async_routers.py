@@ -0,0 +1,66 @@
+"""
+비동기 세션(get_async_db)으로 옮긴 라우터 테스트 (pois, geofences, navigation-points)
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.destination import Destination
+from app.models.geofence import Geofence, GeofenceEntryPoint
+from app.models.navigation_session import NavigationSession
+from app.models.poi import POI
+from app.models.user import User
+
+
+def test_get_pois_nearby_and_detail(client, db_session):
+    """근처 POI 검색과 상세 조회 테스트"""
+    near = POI(id=uuid4(), name="가까운 매장", poi_type="store", priority=Decimal("0.9"),
+               latitude=Decimal("37.5000"), longitude=Decimal("127.0000"))
+    far = POI(id=uuid4(), name="먼 매장", poi_type="store", priority=Decimal("0.5"),
+              latitude=Decimal("37.6000"), longitude=Decimal("127.0000"))
+    db_session.add_all([near, far])
+    db_session.commit()
+
+    response = client.get("/api/v1/pois/", params={"lat": 37.5001, "lng": 127.0, "radius": 100})
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()] == [str(near.id)]
+
+    response = client.get(f"/api/v1/pois/{far.id}")
+    assert response.status_code == 200 and response.json()["name"] == "먼 매장"
+    assert client.get(f"/api/v1/pois/{uuid4()}").status_code == 404
+
+
+def test_get_geofences_with_entry_points(client, db_session):
+    """지오펜스 목록/상세에 출입구가 포함되는지 테스트"""
+    geofence = Geofence(
+        id=uuid4(), name="건물", type="building",
+        polygon=[{"lat": 37.5, "lng": 127.0}, {"lat": 37.5002, "lng": 127.0002}]
+    )
+    geofence.entry_points.append(GeofenceEntryPoint(name="정문", latitude="37.5", longitude="127.0"))
+    db_session.add(geofence)
+    db_session.commit()
+
+    response = client.get("/api/v1/geofences/", params={"lat": 37.5, "lng": 127.0, "radius": 100})
+    assert response.status_code == 200
+    assert response.json()[0]["entry_points"][0]["name"] == "정문"
+
+    response = client.get(f"/api/v1/geofences/{geofence.id}")
+    assert response.status_code == 200 and len(response.json()["entry_points"]) == 1
+
+
+def test_navigation_points_roundtrip(client, db_session, test_user_id):
+    """네비게이션 포인트 생성 후 세션별 조회 테스트"""
+    db_session.add(User(id=test_user_id, email="test@arway.com", name="Test User"))
+    destination = Destination(id=uuid4(), name="목적지", latitude=Decimal("37.5"), longitude=Decimal("127.0"))
+    session = NavigationSession(id=uuid4(), user_id=test_user_id, destination_id=destination.id)
+    db_session.add_all([destination, session])
+    db_session.commit()
+
+    for lat in (37.5001, 37.5002):
+        response = client.post("/api/v1/navigation-points/", json={
+            "session_id": str(session.id), "latitude": lat, "longitude": 127.0
+        })
+        assert response.status_code == 200
+
+    response = client.get(f"/api/v1/navigation-points/session/{session.id}")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
@@ -0,0 +1,87 @@
+"""
+캐시된 DB 헬스 체크와 테이블 존재 확인 캐시 테스트
+"""
+import asyncio
+import pytest
+
+import app.database as database
+from app.database.health import DatabaseHealthProbe
+from tests.conftest import engine as test_engine
+
+
+def test_probe_caches_until_stale():
+    """max_age 안에서는 다시 확인하지 않고, 지나면 한 번만 다시 확인하는지 테스트"""
+    calls = []
+    probe = DatabaseHealthProbe(lambda: calls.append(1) or 1, interval=60, max_age=60)
+
+    async def run():
+        first = await probe.get()
+        second = await probe.get()
+        probe._status = first._replace(checked_at=first.checked_at - 120)
+        third, fourth = await asyncio.gather(probe.get(), probe.get())
+        return first, second, third, fourth
+
+    first, second, third, fourth = asyncio.run(run())
+    assert first.ok and first.result == 1 and second is first
+    assert third is fourth and third.checked_at > first.checked_at
+    assert len(calls) == 2
+
+
+def test_probe_records_failure():
+    """확인 실패 시 예외 대신 오류 상태를 기록하는지 테스트"""
+    def check():
+        raise RuntimeError("could not translate host name")
+
+    status = DatabaseHealthProbe(check).refresh()
+    assert not status.ok and status.result is None
+    assert "could not translate host name" in status.error
+
+
+def test_probe_background_refresh():
+    """start() 후 백그라운드에서 갱신되고 stop()으로 멈추는지 테스트"""
+    calls = []
+    probe = DatabaseHealthProbe(lambda: calls.append(1) or 1, interval=0.01)
+
+    async def run():
+        probe.start()
+        await asyncio.sleep(0.1)
+        await probe.stop()
+        count = len(calls)
+        await asyncio.sleep(0.05)
+        return count
+
+    count = asyncio.run(run())
+    assert count >= 2 and len(calls) == count
+    assert probe.status.ok
+
+
+def test_health_endpoint(client, monkeypatch):
+    """/health가 캐시된 상태로 응답하는지 테스트"""
+    import app.main as main
+
+    monkeypatch.setattr(main, "health_probe", DatabaseHealthProbe(lambda: 1))
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy" and response.json()["result"] == 1
+
+    def check():
+        raise RuntimeError("Name or service not known")
+
+    monkeypatch.setattr(main, "health_probe", DatabaseHealthProbe(check))
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["error"].startswith("데이터베이스 호스트를 찾을 수 없습니다")
+
+
+def test_table_exists_caches_positive_result(db_session, monkeypatch):
+    """존재가 확인된 테이블은 다시 조회하지 않고, 없는 테이블은 캐시하지 않는지 테스트"""
+    monkeypatch.setattr(database, "engine", test_engine)
+    monkeypatch.setattr(database, "_existing_tables", set())
+
+    assert database.table_exists("users")
+    assert not database.table_exists("no_such_table")
+    assert database._existing_tables == {"users"}
+
+    # 캐시된 뒤에는 검사기를 호출하지 않음
+    monkeypatch.setattr(database, "inspect", lambda _: pytest.fail("schema inspected again"))
+    assert database.table_exists("users")
@@ -0,0 +1,72 @@
+"""
+데이터베이스 연결 풀 계측 테스트
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.database.pool import InstrumentedQueuePool, is_pgbouncer_url, prewarm_pool
+
+
+def _engine(tmp_path, **kwargs):
+    return create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        connect_args={"check_same_thread": False},
+        **kwargs
+    )
+
+
+def test_checkout_latency_and_saturation(tmp_path):
+    """체크아웃 수, 지연 시간, 포화도가 기록되는지 테스트"""
+    engine = _engine(tmp_path, pool_size=2, max_overflow=2)
+    metrics = engine.pool.metrics
+
+    first, second = engine.connect(), engine.connect()
+    first.execute(text("SELECT 1"))
+    stats = metrics.snapshot(engine.pool)
+    assert stats["checkouts"] == 2 and stats["checked_out"] == 2
+    assert stats["capacity"] == 4 and stats["saturation"] == pytest.approx(0.5)
+    assert stats["latency_ms"]["max"] >= stats["latency_ms"]["p50"] >= 0.0
+
+    first.close()
+    second.close()
+    stats = metrics.snapshot(engine.pool)
+    assert stats["checked_out"] == 0 and stats["peak_saturation"] == pytest.approx(0.5)
+
+    # dispose() 후 새 풀에서도 같은 지표에 누적
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert engine.pool.metrics is metrics and metrics.checkouts == 3
+
+
+def test_pool_timeout_is_counted(tmp_path):
+    """풀이 가득 차 체크아웃이 시간 초과되면 timeouts가 증가하는지 테스트"""
+    engine = _engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    assert engine.pool.metrics.timeouts == 1
+
+
+def test_prewarm_pool(tmp_path):
+    """미리 만든 연결이 풀에 남아 있는지 테스트"""
+    engine = _engine(tmp_path, pool_size=3, max_overflow=0)
+    assert prewarm_pool(engine, 5) == 3
+    assert engine.pool.checkedin() == 3
+
+
+def test_is_pgbouncer_url():
+    """Supabase 연결 풀러 포트 감지 테스트"""
+    assert is_pgbouncer_url("postgresql://u:p@aws-0-ap.pooler.supabase.com:6543/postgres")
+    assert not is_pgbouncer_url("postgresql://u:p@db.abc.supabase.co:5432/postgres")
+    assert not is_pgbouncer_url("postgresql://u:p@localhost/arway")
+
+
+def test_pool_stats_endpoint(client):
+    """/health/db-pool 엔드포인트 테스트"""
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"checkouts", "timeouts", "latency_ms", "mode", "pgbouncer"} <= set(data)
@@ -0,0 +1,60 @@
+"""
+벡터화된 거리/방위 계산 테스트
+"""
+import math
+import numpy as np
+import pytest
+
+from app.services.geo import bearing, equirectangular, haversine, nearby_indices, planar_distance
+
+
+def _scalar_haversine(lat1, lng1, lat2, lng2):
+    φ1, φ2 = math.radians(lat1), math.radians(lat2)
+    Δφ, Δλ = math.radians(lat2 - lat1), math.radians(lng2 - lng1)
+    a = math.sin(Δφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(Δλ / 2) ** 2
+    return 6371e3 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def test_haversine_matches_scalar_and_broadcasts():
+    """배열 결과가 스칼라 공식과 같고, 한 점 대 배열로 브로드캐스팅되는지 테스트"""
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(33.0, 38.5, 100)
+    lngs = rng.uniform(125.0, 130.0, 100)
+
+    distances = haversine(37.5, 127.0, lats, lngs)
+    expected = [_scalar_haversine(37.5, 127.0, a, b) for a, b in zip(lats, lngs)]
+    np.testing.assert_allclose(distances, expected, rtol=1e-12)
+    assert float(haversine(37.5, 127.0, 37.5, 127.0)) == 0.0
+
+
+def test_equirectangular_close_to_haversine_at_short_range():
+    """수 km 이내에서 등장방형 근사 오차가 0.1% 미만인지 테스트"""
+    rng = np.random.default_rng(1)
+    lats = 37.5 + rng.uniform(-0.05, 0.05, 200)
+    lngs = 127.0 + rng.uniform(-0.05, 0.05, 200)
+    np.testing.assert_allclose(equirectangular(37.5, 127.0, lats, lngs), haversine(37.5, 127.0, lats, lngs), rtol=1e-3)
+
+
+def test_bearing_cardinal_directions():
+    """북/동/남/서 방위각 테스트"""
+    result = bearing(0.0, 0.0, [1.0, 0.0, -1.0, 0.0], [0.0, 1.0, 0.0, -1.0])
+    np.testing.assert_allclose(result, [0.0, 90.0, 180.0, 270.0], atol=1e-9)
+
+
+def test_planar_distance():
+    """실내 좌표 유클리드 거리 테스트"""
+    np.testing.assert_allclose(planar_distance(0, 0, [3, 0], [4, 0]), [5.0, 0.0])
+
+
+def test_nearby_indices_filters_and_sorts():
+    """반경 내 후보만 가까운 순으로 반환하는지 테스트"""
+    # 북쪽으로 약 900m, 100m, 1100m, 500m
+    lats = 37.5 + np.array([900, 100, 1100, 500]) / 111195.0
+    lngs = np.full(4, 127.0)
+
+    indices, distances = nearby_indices(37.5, 127.0, lats, lngs, 1000)
+    assert indices.tolist() == [1, 3, 0]
+    assert distances[0] == pytest.approx(100, rel=1e-3)
+
+    indices, distances = nearby_indices(37.5, 127.0, [], [], 1000)
+    assert indices.size == 0 and distances.size == 0
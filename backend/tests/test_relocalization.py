@@ -0,0 +1,122 @@
+"""
+SCQ Unit #2 시각 재위치추정 테스트
+"""
+import pytest
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.landmark import Landmark
+from app.services.relocalization import RelocalizationEngine, get_relocalization_engine
+
+MAP_ID = uuid4()
+
+
+def _landmark(x, y, vector, floor=1, heading=None, **kwargs):
+    return Landmark(
+        id=uuid4(), indoor_map_id=kwargs.pop("indoor_map_id", MAP_ID),
+        name="LM", landmark_type="sign",
+        position_x=Decimal(str(x)), position_y=Decimal(str(y)), floor=floor,
+        heading=Decimal(str(heading)) if heading is not None else None,
+        features={"vector": vector}, **kwargs
+    )
+
+
+@pytest.fixture
+def landmarks(db_session):
+    rows = [
+        _landmark(0, 0, [1.0, 0.0, 0.0], heading=350),
+        _landmark(10, 0, [0.9, 0.1, 0.0], heading=10),
+        _landmark(50, 50, [0.0, 1.0, 0.0], heading=180),
+        _landmark(5, 5, [0.0, 0.0, 1.0], floor=2),
+        _landmark(99, 99, [1.0, 0.0, 0.0], is_active=False)
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def test_localize_weighted_pose(db_session, landmarks):
+    """유사한 랜드마크 위치/heading의 가중 평균으로 pose를 추정하는지 테스트"""
+    engine = RelocalizationEngine(min_similarity=0.5)
+    estimate = engine.localize(db_session, [1.0, 0.05, 0.0], MAP_ID, floor=1)
+
+    assert estimate is not None and estimate.floor == 1
+    assert 0.0 < estimate.x < 10.0 and estimate.y == pytest.approx(0.0)
+    # 350°와 10°의 원형 평균은 0° 근처
+    assert min(estimate.heading, 360.0 - estimate.heading) < 10.0
+    assert estimate.confidence > 0.9
+    assert str(landmarks[2].id) not in estimate.landmark_ids
+
+
+def test_localize_selects_floor_and_rejects_weak_match(db_session, landmarks):
+    """층을 모르면 가장 유사한 층을 고르고, 유사도가 낮으면 None인지 테스트"""
+    engine = RelocalizationEngine(min_similarity=0.8)
+    assert engine.warm(db_session) == 2
+
+    estimate = engine.localize(db_session, [0.0, 0.0, 1.0], MAP_ID)
+    assert estimate.floor == 2 and (estimate.x, estimate.y) == (5.0, 5.0)
+
+    assert engine.localize(db_session, [1.0, 1.0, 1.0], MAP_ID, floor=1) is None
+    assert engine.localize(db_session, [1.0, 0.0, 0.0], uuid4()) is None
+
+
+def test_cache_invalidated_on_commit(db_session, landmarks):
+    """랜드마크 변경이 커밋되면 해당 실내 맵 캐시가 다시 만들어지는지 테스트"""
+    engine = RelocalizationEngine()
+    engine.watch_landmarks()
+    try:
+        engine.warm(db_session)
+        moved = landmarks[2]
+        moved.position_x = Decimal("70")
+        db_session.flush()
+        db_session.rollback()
+        assert engine.get_floor_index(db_session, MAP_ID, 1) is not None
+
+        landmarks[2].position_x = Decimal("70")
+        db_session.commit()
+        estimate = engine.localize(db_session, [0.0, 1.0, 0.0], MAP_ID, floor=1)
+        assert estimate.x == pytest.approx(70.0)
+    finally:
+        engine.unwatch_landmarks()
+
+
+def test_unit2_endpoint_uses_landmark_matching(client, db_session, landmarks):
+    """unit2 엔드포인트가 카메라 특징 벡터로 pose를 추정하는지 테스트"""
+    try:
+        response = client.post("/api/v1/scq/unit2/indoor-positioning", json={
+            "camera_frame": {"features": [0.0, 1.0, 0.0]},
+            "indoor_map": {"id": str(MAP_ID), "floor": 1},
+            "last_known_pose": {"x": 1, "y": 1, "floor": 1, "heading": 90}
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["x"], data["y"], data["heading"]) == (50.0, 50.0, 180.0)
+        assert data["relocalization_needed"] is False
+
+        # 특징 벡터가 없으면 마지막 pose 유지
+        response = client.post("/api/v1/scq/unit2/indoor-positioning", json={
+            "indoor_map": {"id": str(MAP_ID)},
+            "last_known_pose": {"x": 1, "y": 1, "floor": 1, "heading": 90}
+        })
+        assert response.json()["relocalization_needed"] is True
+    finally:
+        get_relocalization_engine().invalidate()
+
+
+def test_unit2_endpoint_ignores_invalid_map_id(client, monkeypatch):
+    """UUID가 아닌 실내 맵 ID는 DB 조회 없이 마지막 pose를 유지하는지 테스트"""
+    import app.api.v1.scq as scq
+
+    class FailingEngine:
+        def localize(self, *args, **kwargs):
+            # PostgreSQL UUID 컬럼 비교 실패와 같은 상황
+            raise ValueError("invalid input syntax for type uuid")
+
+    monkeypatch.setattr(scq, "get_relocalization_engine", lambda: FailingEngine())
+    response = client.post("/api/v1/scq/unit2/indoor-positioning", json={
+        "camera_frame": {"features": [0.0, 1.0, 0.0]},
+        "indoor_map": {"id": "lobby-1f"},
+        "last_known_pose": {"x": 1, "y": 1, "floor": 1, "heading": 90}
+    })
+    assert response.status_code == 200
+    assert (response.json()["x"], response.json()["relocalization_needed"]) == (1.0, True)
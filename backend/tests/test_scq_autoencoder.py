@@ -0,0 +1,128 @@
+"""
+SCQ Autoencoder 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.scq import SCQAutoencoder
+from app.scq.scq_autoencoder import compute_loss
+
+
+def test_hard_assignment_straight_through():
+    """하드 할당 모드에서 인코더와 코드북 모두에 gradient가 전달되는지 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32, quantize_mode="hard")
+    x = torch.randn(2, 3, 32, 32)
+
+    x_recon, z, z_q, stats = model(x)
+    loss, loss_dict = compute_loss(x_recon, x, z, z_q, stats)
+    loss.backward()
+
+    # z_q는 코드북 벡터 중 하나
+    codebook = model.scq_layer.codebook.detach()
+    z_q_flat = z_q.detach().permute(0, 2, 3, 1).reshape(-1, 16)
+    assert torch.cdist(z_q_flat, codebook).min(dim=-1).values.max() < 1e-4
+
+    assert model.encoder.conv_layers[0].weight.grad is not None
+    assert model.scq_layer.codebook.grad.abs().sum() > 0
+    assert set(loss_dict) >= {'total_loss', 'entropy', 'num_active_codes'}
+
+
+def test_scheduled_quantization():
+    """스케줄 모드가 SCQ에서 하드 할당으로 전환되는지 테스트"""
+    model = SCQAutoencoder(
+        latent_dim=16, num_codes=32,
+        quantize_mode="scheduled", anneal_steps=20
+    )
+    schedule = []
+    for step in range(30):
+        model.quantize_step = step
+        schedule.append(model.use_hard_assignment())
+
+    assert schedule[0] is False
+    assert all(schedule[20:])
+    assert 0 < sum(schedule[:20]) < 20
+
+    model.eval()
+    model.quantize_step = 0
+    assert model.use_hard_assignment() is False
+
+    every = SCQAutoencoder(latent_dim=16, num_codes=32, quantize_mode="scheduled", scq_every=4)
+    hard = []
+    for step in range(8):
+        every.quantize_step = step
+        hard.append(every.use_hard_assignment())
+    assert hard == [False, True, True, True, False, True, True, True]
+
+
+def test_encode_decode_bytes_roundtrip():
+    """압축 잠재 표현 바이트열 인코딩/디코딩 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    model.eval()
+    x = torch.randn(2, 3, 32, 32)
+
+    data = model.encode_to_bytes(x, num_candidates=4)
+    # (B, H', W', m) = (2, 2, 2, 4) → 인덱스 1바이트 + 가중치 1바이트
+    assert isinstance(data, bytes)
+    assert len(data) < 2 * 2 * 2 * 4 * 2 + 64
+
+    with torch.no_grad():
+        z_q_ref, _, _ = model.quantize_sparse(model.encode(x), num_candidates=4)
+    z_q = model.latent_from_bytes(data)
+    assert z_q.shape == z_q_ref.shape
+    assert torch.allclose(z_q, z_q_ref, atol=0.05)
+
+    x_recon = model.decode_from_bytes(data)
+    assert x_recon.shape == x.shape
+
+
+def test_decode_from_bytes_rejects_invalid_data():
+    """잘못된 바이트열 디코딩 시 오류"""
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    with pytest.raises(ValueError):
+        model.decode_from_bytes(b"not a latent")
+
+
+def test_pack_codes_rejects_oversized_codebook():
+    """uint16 인덱스로 표현할 수 없는 코드북 크기를 거부하는지 테스트"""
+    from app.scq.codec import pack_codes, unpack_codes
+
+    indices = torch.full((1, 1, 1, 2), 65535, dtype=torch.long)
+    weights = torch.full((1, 1, 1, 2), 0.5)
+    restored, _, header = unpack_codes(pack_codes(indices, weights, num_codes=1 << 16, latent_dim=4))
+    assert restored.flatten().tolist() == [65535, 65535] and header.num_codes == 1 << 16
+
+    with pytest.raises(ValueError):
+        pack_codes(indices, weights, num_codes=(1 << 16) + 1, latent_dim=4)
+
+
+def test_entropy_coded_bytes_roundtrip():
+    """엔트로피 코딩 비트스트림이 무손실로 복원되고 더 작은지 테스트"""
+    from app.scq.entropy_coder import SCQEntropyCoder
+    from app.scq.utils import measure_bitrate
+
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    model.eval()
+    x = torch.randn(4, 3, 64, 64)
+
+    with torch.no_grad():
+        _, indices, weights = model.quantize_sparse(model.encode(x), num_candidates=4)
+    coder = SCQEntropyCoder(num_codes=32).fit([(indices, weights)])
+
+    packed = model.encode_to_bytes(x, num_candidates=4)
+    coded = model.encode_to_bytes(x, num_candidates=4, entropy_coder=coder)
+    assert len(coded) < len(packed)
+
+    z_q_packed = model.latent_from_bytes(packed)
+    z_q_coded = model.latent_from_bytes(coded, entropy_coder=coder)
+    assert torch.equal(z_q_packed, z_q_coded)
+
+    with pytest.raises(ValueError):
+        model.latent_from_bytes(coded)
+
+    report = measure_bitrate(coded, weights, num_codes=32)
+    assert report['num_positions'] == 4 * 4 * 4
+    assert report['measured_bits_per_position'] == len(coded) * 8 / 64
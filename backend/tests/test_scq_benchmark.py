@@ -0,0 +1,72 @@
+"""
+SCQ 벤치마크 하네스 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.scq.benchmark import (
+    compare_to_baseline,
+    load_results,
+    run_suite,
+    save_results,
+    sweep_configs
+)
+
+
+def test_sweep_configs_product():
+    """스윕 조합 생성 (solver 타깃은 fista만) 테스트"""
+    configs = sweep_configs(
+        targets=("solver", "layer"), batch_sizes=(2, 4), num_codes=(16,),
+        codebook_dims=(8,), lams=(1e-3,), solvers=("fista", "cvxpy")
+    )
+    assert len(configs) == 2 + 4
+    assert all(c.solver == "fista" for c in configs if c.target == "solver")
+    assert len({c.name for c in configs}) == len(configs)
+
+    with pytest.raises(ValueError):
+        sweep_configs(targets=("unknown",))
+
+
+def test_run_suite_and_baseline_roundtrip(tmp_path):
+    """측정 결과 JSON 저장/로드 및 동일 결과 비교 시 회귀 없음 테스트"""
+    configs = sweep_configs(
+        targets=("solver", "layer", "autoencoder"), batch_sizes=(2,),
+        num_codes=(16,), codebook_dims=(8,), spatial=2
+    )
+    results = run_suite(configs, warmup=1, iters=1)
+
+    assert len(results['results']) == 3
+    for result in results['results']:
+        assert result['forward_samples_per_sec'] > 0
+        assert result['train_samples_per_sec'] > 0
+        assert result['train_peak_bytes'] > 0
+
+    path = tmp_path / "baseline.json"
+    save_results(results, path)
+    baseline = load_results(path)
+    comparisons = compare_to_baseline(results, baseline)
+    assert len(comparisons) == 3 * 4
+    assert not any(c['regression'] for c in comparisons)
+
+
+def test_compare_to_baseline_flags_regressions():
+    """처리량 하락/메모리 증가가 허용 범위를 넘으면 회귀로 표시되는지 테스트"""
+    def make(throughput, memory):
+        return {'results': [{
+            'name': 'layer/x',
+            'forward_samples_per_sec': throughput,
+            'train_samples_per_sec': throughput,
+            'forward_peak_bytes': memory,
+            'train_peak_bytes': memory
+        }]}
+
+    baseline = make(100.0, 1000)
+    ok = compare_to_baseline(make(95.0, 1050), baseline, tolerance=0.1, memory_tolerance=0.1)
+    assert not any(c['regression'] for c in ok)
+
+    bad = compare_to_baseline(make(80.0, 1200), baseline, tolerance=0.1, memory_tolerance=0.1)
+    assert {c['metric'] for c in bad if c['regression']} == {
+        'forward_samples_per_sec', 'train_samples_per_sec',
+        'forward_peak_bytes', 'train_peak_bytes'
+    }
@@ -0,0 +1,76 @@
+"""
+SCQ 추론 그래프 export 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.scq import SCQAutoencoder
+from app.scq.export import compare_with_eager, export_inference_module, quantize_conv_int8
+
+
+@pytest.mark.parametrize("backend", ["eager", "trace"])
+def test_export_matches_sparse_quantization(backend):
+    """export 모듈이 eager 희소 양자화 경로와 같은 결과를 내는지 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32).eval()
+    x = torch.randn(2, 3, 32, 32)
+
+    exported = export_inference_module(model, x, num_candidates=4, num_iters=200, backend=backend)
+
+    with torch.no_grad():
+        x_recon, indices, weights = exported(x)
+        z_q, ref_indices, _ = model.quantize_sparse(model.encode(x), num_candidates=4)
+        ref_recon = model.decode(z_q)
+
+    assert indices.shape == (2, 2, 2, 4)
+    assert torch.equal(indices, ref_indices)
+    assert torch.allclose(x_recon, ref_recon, atol=1e-4)
+
+
+def test_export_int8_hard():
+    """int8 conv + 하드 할당 export 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32).eval()
+    x = torch.randn(2, 3, 32, 32)
+
+    exported = export_inference_module(model, x, hard=True, quantize_int8=True)
+    with torch.no_grad():
+        x_recon, indices, weights = exported(x)
+
+    assert x_recon.shape == x.shape
+    assert indices.shape == (2, 2, 2, 1)
+    assert torch.all(weights == 1)
+
+
+def test_quantize_conv_int8_restores_engine(monkeypatch):
+    """int8 변환이 전역 양자화 엔진을 바꾼 채로 두지 않는지 테스트"""
+    engines = [e for e in torch.backends.quantized.supported_engines if e in ("x86", "fbgemm", "qnnpack")]
+    if len(engines) < 2:
+        pytest.skip("양자화 엔진이 2개 이상 필요")
+    model = SCQAutoencoder(latent_dim=16, num_codes=32).eval()
+    x = torch.randn(2, 3, 32, 32)
+
+    monkeypatch.setattr(torch.backends.quantized, "engine", engines[0])
+    quantize_conv_int8(model.encoder, x, backend=engines[1])
+    assert torch.backends.quantized.engine == engines[0]
+
+    with pytest.raises(ValueError):
+        quantize_conv_int8(model.encoder, x, backend="no_such_engine")
+    assert torch.backends.quantized.engine == engines[0]
+
+
+def test_compare_with_eager_reports_sparse_and_full():
+    """같은 알고리즘(quantize_sparse) 기준과 전체 코드북 기준 지연 시간을 모두 보고하는지 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32).eval()
+    x = torch.randn(2, 3, 32, 32)
+
+    calls = []
+    quantize_sparse = model.quantize_sparse
+    model.quantize_sparse = lambda z, num_candidates=8: calls.append(num_candidates) or quantize_sparse(z, num_candidates)
+
+    result = compare_with_eager(model, x, num_candidates=4, warmup=1, iters=1)
+    assert set(result) == {"eager", "eager_full", "exported", "speedup"}
+    assert set(result["speedup"]) == {"frame", "frame_vs_full"}
+    assert calls and set(calls) == {4}
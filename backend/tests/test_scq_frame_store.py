@@ -0,0 +1,101 @@
+"""
+SCQ 메모리 맵 프레임 저장소 테스트
+"""
+import json
+import threading
+import time
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from torch.utils.data import DataLoader
+
+from app.scq.frame_store import (
+    INDEX_FILENAME,
+    DevicePrefetcher,
+    MMapFrameDataset,
+    frames_to_float,
+    make_frame_loader,
+    write_frame_store
+)
+
+
+def _write_store(root, num_frames=10, shard_size=4):
+    frames = torch.randint(0, 256, (num_frames, 3, 8, 8), dtype=torch.uint8)
+    write_frame_store(root, frames.split(3), (3, 8, 8), shard_size=shard_size)
+    return frames
+
+
+def test_frame_store_sharded_roundtrip(tmp_path):
+    """샤드 분할 저장 후 인덱스로 프레임을 그대로 읽는지 테스트"""
+    frames = _write_store(tmp_path)
+
+    index = json.loads((tmp_path / INDEX_FILENAME).read_text())
+    assert [s['num_frames'] for s in index['shards']] == [4, 4, 2]
+
+    dataset = MMapFrameDataset(tmp_path)
+    assert len(dataset) == 10
+    for i in range(10):
+        assert dataset[i].dtype == torch.uint8
+        assert torch.equal(dataset[i], frames[i])
+    assert torch.equal(dataset[-1], frames[-1])
+    with pytest.raises(IndexError):
+        dataset[10]
+
+
+def test_frame_store_float_input(tmp_path):
+    """[0, 1] float 입력이 uint8로 양자화되고 frames_to_float로 복원되는지 테스트"""
+    images = torch.rand(5, 3, 8, 8)
+    write_frame_store(tmp_path, [images], (3, 8, 8))
+
+    restored = frames_to_float(MMapFrameDataset(tmp_path)[2])
+    assert torch.allclose(restored, images[2], atol=0.5 / 255 + 1e-6)
+
+
+def test_frame_loader_workers_and_prefetch(tmp_path):
+    """persistent 워커 로더와 백그라운드 프리페처가 모든 프레임을 한 번씩 내보내는지 테스트"""
+    frames = _write_store(tmp_path)
+    loader = make_frame_loader(
+        MMapFrameDataset(tmp_path), batch_size=4, shuffle=False, num_workers=2, prefetch_factor=2
+    )
+    prefetcher = DevicePrefetcher(loader, device=torch.device("cpu"))
+    assert len(prefetcher) == 3
+
+    for _ in range(2):  # 워커 재사용 (persistent_workers)
+        batches = list(prefetcher)
+        assert torch.equal(torch.cat(batches), frames)
+
+
+def test_prefetcher_early_break_does_not_hang():
+    """소비자가 중간에 멈춰도 큐가 가득 찬 프리페처 스레드가 종료되는지 테스트"""
+    loader = DataLoader(torch.arange(3), batch_size=1)
+    prefetcher = DevicePrefetcher(loader, depth=2)
+
+    result = {}
+
+    def consume():
+        for batch in prefetcher:
+            result["first"] = batch
+            time.sleep(0.5)  # 생산자가 나머지 배치와 종료 표시로 큐를 채울 때까지 대기
+            break
+        result["done"] = True
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert result.get("done") and torch.equal(result["first"], torch.tensor([0]))
+
+
+def test_train_scq_on_frame_store(tmp_path):
+    """uint8 프레임 배치로 학습 루프가 동작하는지 테스트"""
+    from app.scq import SCQAutoencoder
+    from app.scq.trainer import SCQTrainer
+
+    frames = torch.randint(0, 256, (8, 3, 32, 32), dtype=torch.uint8)
+    write_frame_store(tmp_path, [frames], (3, 32, 32))
+    loader = make_frame_loader(MMapFrameDataset(tmp_path), batch_size=4, num_workers=0)
+
+    torch.manual_seed(0)
+    trainer = SCQTrainer(SCQAutoencoder(latent_dim=16, num_codes=32), loader, device=torch.device("cpu"))
+    trainer.fit(1)
+    assert trainer.global_step == 2
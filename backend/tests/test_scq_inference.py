@@ -0,0 +1,88 @@
+"""
+SCQ 서버 추론 서비스 및 /api/v1/scq/encode 테스트
+"""
+import asyncio
+import base64
+import io
+import pytest
+
+from app.services.scq_inference import MicroBatcher, set_scq_service
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    """동시 요청이 하나의 배치로 묶이고 결과가 요청별로 돌아오는지 테스트"""
+    batch_sizes = []
+
+    def process(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=50)
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert results == [i * 2 for i in range(8)]
+    assert batch_sizes == [8]
+
+
+def test_micro_batcher_propagates_errors():
+    """배치 처리 예외가 해당 배치의 모든 요청에 전달되는지 테스트"""
+    def process(items):
+        raise ValueError("boom")
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=10)
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(i) for i in range(3)), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_scq_encode_endpoint_unavailable(client):
+    """모델이 로드되지 않았으면 503을 반환하는지 테스트"""
+    response = client.post("/api/v1/scq/encode", content=b"not-an-image")
+    assert response.status_code == 503
+
+
+def test_scq_encode_endpoint(client):
+    """JPEG 프레임을 SCQ 코드로 인코딩하는지 테스트"""
+    torch = pytest.importorskip("torch")
+    Image = pytest.importorskip("PIL.Image")
+
+    from app.scq import SCQAutoencoder
+    from app.scq.codec import unpack_codes
+    from app.services.scq_inference import SCQEncoderService
+
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    set_scq_service(SCQEncoderService(model, image_size=32, num_candidates=4, max_wait_ms=1))
+    try:
+        buffer = io.BytesIO()
+        Image.new("RGB", (48, 40), color=(120, 30, 200)).save(buffer, format="JPEG")
+
+        response = client.post(
+            "/api/v1/scq/encode",
+            content=buffer.getvalue(),
+            headers={"Content-Type": "image/jpeg"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["height"], body["width"], body["num_candidates"]) == (2, 2, 4)
+
+        indices, weights, header = unpack_codes(base64.b64decode(body["codes"]))
+        assert indices.shape == (1, 2, 2, 4)
+        assert header.num_codes == 32
+
+        bad = client.post("/api/v1/scq/encode", content=b"not-an-image")
+        assert bad.status_code == 400
+    finally:
+        set_scq_service(None)
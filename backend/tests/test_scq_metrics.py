@@ -0,0 +1,48 @@
+"""
+SCQ 학습 지표 누적기 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.scq import SCQAutoencoder
+from app.scq.scq_autoencoder import compute_loss
+from app.scq.metrics import SCQMetrics
+
+
+def test_compute_loss_return_tensors():
+    """return_tensors=True이면 손실 항목이 디바이스 텐서로 반환되는지 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    x = torch.randn(2, 3, 32, 32)
+    x_recon, z, z_q, stats = model(x)
+
+    _, tensors = compute_loss(x_recon, x, z, z_q, stats, return_tensors=True)
+    _, floats = compute_loss(x_recon, x, z, z_q, stats)
+
+    assert all(isinstance(v, torch.Tensor) for v in tensors.values())
+    assert isinstance(floats['total_loss'], float)
+    assert isinstance(floats['num_active_codes'], int)
+    assert floats['total_loss'] == pytest.approx(tensors['total_loss'].item())
+    assert stats['code_usage'].shape == (32,)
+
+
+def test_scq_metrics_flush_and_usage():
+    """주기적 flush 평균과 누적 코드 사용 히스토그램 테스트"""
+    metrics = SCQMetrics(num_codes=4, flush_every=2)
+    usage = torch.tensor([3, 0, 1, 0])
+
+    metrics.update({'total_loss': torch.tensor(1.0)}, {'code_usage': usage})
+    assert not metrics.should_flush()
+    metrics.update({'total_loss': torch.tensor(3.0)}, {'code_usage': usage})
+    assert metrics.should_flush()
+
+    logs = metrics.flush()
+    assert logs['total_loss'] == pytest.approx(2.0)
+    assert logs['num_used_codes'] == 2
+    assert logs['steps'] == 2
+
+    assert torch.equal(metrics.code_usage, torch.tensor([6.0, 0.0, 2.0, 0.0], dtype=torch.float64))
+    summary = metrics.usage_summary()
+    assert summary['num_used_codes'] == 2
+    assert summary['num_dead_codes'] == 2
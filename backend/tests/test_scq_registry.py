@@ -0,0 +1,169 @@
+"""
+SCQ 모델 레지스트리 및 모델 핫스왑 테스트
+"""
+import asyncio
+import numpy as np
+import pytest
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+torch = pytest.importorskip("torch")
+
+from app.scq import SCQAutoencoder
+from app.scq.registry import ModelRegistry
+from app.services.scq_inference import (
+    ModelUnavailableError,
+    SCQEncoderService,
+    model_loader,
+    reload_scq_model,
+    set_scq_service
+)
+
+
+def _model(seed):
+    torch.manual_seed(seed)
+    return SCQAutoencoder(latent_dim=16, num_codes=32, scq_lambda=1e-2)
+
+
+def test_register_promote_and_load(tmp_path):
+    """버전 등록/중복 제거/CURRENT 지정/메모리 맵 로드 테스트"""
+    registry = ModelRegistry(tmp_path)
+    first = registry.register("scq_nav", _model(0), metrics={"psnr": 20.5})
+    assert first.version == "v1"
+    assert first.hyperparams == {"input_channels": 3, "latent_dim": 16, "num_codes": 32, "scq_lambda": 1e-2}
+    assert first.metrics == {"psnr": 20.5}
+    assert len(first.sha256) == 64
+
+    # 같은 가중치는 새 버전을 만들지 않음
+    assert registry.register("scq_nav", _model(0)).version == "v1"
+
+    second_model = _model(1)
+    second = registry.register("scq_nav", second_model.state_dict(), hyperparams=first.hyperparams)
+    assert [v.version for v in registry.versions("scq_nav")] == ["v1", "v2"]
+    assert registry.current("scq_nav") is None and registry.get("scq_nav").version == "v2"
+
+    registry.promote("scq_nav", "v1")
+    assert registry.get("scq_nav").version == "v1"
+
+    model, entry = registry.load("scq_nav", "v2")
+    assert entry == second and not model.training
+    x = torch.rand(1, 3, 32, 32)
+    with torch.no_grad():
+        torch.testing.assert_close(model.encode(x), second_model.eval().encode(x))
+
+    with pytest.raises(KeyError):
+        registry.get("scq_nav", "v9")
+
+    # 버전은 경로로 쓰이므로 vN 형식만 허용
+    registry.register("scq_other", _model(2))
+    for version in ("../scq_other/v1", "v1/../v2", "latest"):
+        with pytest.raises(KeyError):
+            registry.get("scq_nav", version)
+
+
+def test_load_rejects_corrupted_weights(tmp_path):
+    """가중치 파일이 바뀌면 해시 검증에서 실패하는지 테스트"""
+    registry = ModelRegistry(tmp_path)
+    entry = registry.register("scq_nav", _model(0))
+    with open(entry.weights_path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        registry.load("scq_nav", verify=True)
+
+    with pytest.raises(ValueError):
+        registry.register("scq_food", _model(0).state_dict())
+
+
+def test_lazy_load_and_hot_swap(tmp_path):
+    """첫 사용 시 지연 로드되고 reload로 새 버전에 원자적으로 교체되는지 테스트"""
+    registry = ModelRegistry(tmp_path)
+    registry.register("scq_nav", _model(0), promote=True)
+    registry.register("scq_nav", _model(1))
+    settings = SimpleNamespace(scq_registry_dir=str(tmp_path), scq_model_name="scq_nav", scq_model_version=None)
+
+    service = SCQEncoderService(image_size=32, num_candidates=4, max_wait_ms=1, loader=model_loader(settings))
+    assert not service.loaded
+
+    async def run():
+        frame = torch.rand(3, 32, 32)
+        before = await service.batcher.submit(frame)
+        with pytest.raises(KeyError):
+            await reload_scq_model(settings, "../other/v1")
+        version = await reload_scq_model(settings, "v2")
+        after = await service.batcher.submit(frame)
+        await service.stop()
+        return before, version, after
+
+    set_scq_service(service)
+    try:
+        before, version, after = asyncio.run(run())
+    finally:
+        set_scq_service(None)
+    assert before.model_version == "scq_nav@v1"
+    assert version == after.model_version == "scq_nav@v2"
+    assert service.loaded_state[1] == "scq_nav@v2"
+
+
+def test_model_unavailable(tmp_path):
+    """레지스트리에 모델이 없으면 ModelUnavailableError인지 테스트"""
+    settings = SimpleNamespace(scq_registry_dir=str(tmp_path), scq_model_name="missing", scq_model_version=None)
+
+    service = SCQEncoderService(loader=model_loader(settings))
+    with pytest.raises(ModelUnavailableError):
+        service.encode_batch([torch.rand(3, 64, 64)])
+
+
+def test_startup_uses_codebook_as_coarse_quantizer(db_session, tmp_path, monkeypatch):
+    """서버 시작 인덱스 준비가 모델을 로드하지 않고 SCQ 코드북을 IVF 중심으로 쓰고, 모델 교체 시 갱신하는지 테스트"""
+    import app.main as main
+    import app.services.vector_index as vector_index
+    from app.models.poi import POI
+    from app.services.vector_index import get_feature_index, set_feature_index
+
+    registry = ModelRegistry(tmp_path / "registry")
+    first = registry.register("scq_nav", _model(0), promote=True)
+    second = registry.register("scq_nav", _model(1).state_dict(), hyperparams=first.hyperparams)
+
+    db_session.add_all([
+        POI(
+            id=uuid4(), name=f"POI {i}", poi_type="store",
+            latitude=Decimal("37.5"), longitude=Decimal("127.0"),
+            features={"vector": np.random.default_rng(i).normal(size=16).tolist()}
+        )
+        for i in range(4)
+    ])
+    db_session.commit()
+
+    for key, value in {
+        "scq_registry_dir": str(tmp_path / "registry"), "scq_model_name": "scq_nav",
+        "scq_model_version": None, "vector_index_dir": str(tmp_path / "indexes")
+    }.items():
+        monkeypatch.setattr(main.settings, key, value)
+    monkeypatch.setattr(main, "SessionLocal", lambda: type(db_session)(bind=db_session.get_bind()))
+    monkeypatch.setattr(main, "get_relocalization_engine", lambda: SimpleNamespace(
+        warm=lambda db: None, watch_landmarks=lambda: None
+    ))
+    monkeypatch.setattr(vector_index, "FeatureIndexSync", lambda index, model: None)
+    monkeypatch.setattr(ModelRegistry, "load", lambda *args, **kwargs: pytest.fail("model loaded during warm-up"))
+
+    try:
+        main._warm_feature_indexes()
+        index = get_feature_index("poi")
+        codebook = _model(0).scq_layer.codebook.detach().numpy()
+        assert index.uses_coarse_quantizer(codebook)
+        np.testing.assert_allclose(
+            index.centroids, codebook / np.linalg.norm(codebook, axis=1, keepdims=True), rtol=1e-6
+        )
+        monkeypatch.undo()
+
+        # 모델 교체 시 새 코드북으로 다시 할당
+        settings = SimpleNamespace(
+            scq_registry_dir=str(tmp_path / "registry"), scq_model_name="scq_nav", scq_model_version=None
+        )
+        set_scq_service(SCQEncoderService(loader=model_loader(settings)))
+        asyncio.run(reload_scq_model(settings, second.version))
+        assert index.uses_coarse_quantizer(_model(1).scq_layer.codebook.detach().numpy())
+    finally:
+        set_scq_service(None)
+        set_feature_index("poi", None)
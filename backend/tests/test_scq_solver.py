@@ -0,0 +1,172 @@
+"""
+SCQ 배치 심플렉스 QP 솔버 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.scq.scq_layer import SCQLayer
+from app.scq.simplex_solver import project_simplex, solve_simplex_qp
+
+
+def test_project_simplex():
+    """심플렉스 투영 결과가 제약 조건을 만족하는지 테스트"""
+    v = torch.randn(8, 16)
+    p = project_simplex(v)
+    assert torch.all(p >= 0)
+    assert torch.allclose(p.sum(dim=-1), torch.ones(8), atol=1e-6)
+
+    # 이미 심플렉스 위의 점은 그대로 유지
+    q = torch.softmax(torch.randn(4, 16), dim=-1)
+    assert torch.allclose(project_simplex(q), q, atol=1e-6)
+
+
+def test_solve_simplex_qp_gradient():
+    """암시적 미분 gradient를 수치 미분과 비교"""
+    torch.manual_seed(0)
+    z = torch.randn(3, 6, dtype=torch.double, requires_grad=True)
+    codebook = torch.randn(10, 6, dtype=torch.double, requires_grad=True)
+
+    def fn(z, codebook):
+        return solve_simplex_qp(z, codebook, 1e-2, num_iters=5000, tol=1e-14)
+
+    assert torch.autograd.gradcheck(fn, (z, codebook), eps=1e-6, atol=1e-5)
+
+
+def test_scq_layer_batched_shapes():
+    """배치 솔버 기반 SCQ 레이어 forward/backward 테스트"""
+    layer = SCQLayer(codebook_dim=8, num_codes=16)
+    z = torch.randn(2, 3, 3, 8, requires_grad=True)
+
+    z_q, alpha, stats = layer(z)
+
+    assert z_q.shape == (2, 3, 3, 8)
+    assert alpha.shape == (2, 3, 3, 16)
+    assert torch.allclose(alpha.sum(dim=-1), torch.ones(2, 3, 3), atol=1e-5)
+
+    z_q.sum().backward()
+    assert z.grad is not None
+    assert layer.codebook.grad is not None
+
+
+def test_scq_layer_invalid_solver():
+    """지원하지 않는 솔버 지정 시 오류"""
+    with pytest.raises(ValueError):
+        SCQLayer(codebook_dim=8, num_codes=16, solver="unknown")
+
+
+def test_solve_simplex_qp_dense_support_gradient():
+    """support가 전체인 경우 캐시된 분해 경로의 gradient 테스트"""
+    torch.manual_seed(0)
+    z = torch.randn(3, 6, dtype=torch.double, requires_grad=True) * 0.1
+    codebook = torch.randn(10, 6, dtype=torch.double, requires_grad=True)
+
+    alpha = solve_simplex_qp(z, codebook, 10.0)
+    assert torch.all(alpha > 0)
+
+    def fn(z, codebook):
+        return solve_simplex_qp(z, codebook, 10.0)
+
+    assert torch.autograd.gradcheck(fn, (z, codebook), eps=1e-6, atol=1e-5)
+
+
+def test_scq_layer_qp_factor_cache():
+    """코드북 변경 시에만 QP 분해 캐시가 갱신되는지 테스트"""
+    layer = SCQLayer(codebook_dim=8, num_codes=16)
+    factors = layer.get_qp_factors()
+    assert layer.get_qp_factors() is factors
+
+    # 옵티마이저 스텝 후에는 다시 계산
+    optimizer = torch.optim.SGD(layer.parameters(), lr=0.1)
+    z_q, _, _ = layer(torch.randn(4, 8))
+    z_q.sum().backward()
+    optimizer.step()
+    assert layer.get_qp_factors() is not factors
+
+    # EMA 업데이트 후에도 다시 계산
+    factors = layer.get_qp_factors()
+    z = torch.randn(4, 8)
+    _, alpha, _ = layer(z)
+    layer.update_codebook_ema(z, alpha.detach())
+    assert layer.get_qp_factors() is not factors
+
+
+def test_update_codebook_ema_vectorized():
+    """벡터화된 EMA 업데이트가 코드별 가중 평균과 일치하는지 테스트"""
+    torch.manual_seed(0)
+    layer = SCQLayer(codebook_dim=8, num_codes=16)
+    z = torch.randn(20, 8)
+    alpha = torch.softmax(torch.randn(20, 16), dim=-1)
+    alpha[:, 0] = 0.0
+
+    expected = layer.codebook.data.clone()
+    for k in range(1, 16):
+        weights = alpha[:, k]
+        weighted_z = (z * weights.unsqueeze(1)).sum(dim=0) / weights.sum()
+        expected[k] = 0.9 * expected[k] + 0.1 * weighted_z
+
+    layer.update_codebook_ema(z, alpha, decay=0.9)
+    assert torch.allclose(layer.codebook.data, expected, atol=1e-6)
+
+
+def test_update_codebook_ema_reinit_dead_codes():
+    """사용되지 않는 코드가 입력 샘플로 재초기화되는지 테스트"""
+    torch.manual_seed(0)
+    layer = SCQLayer(codebook_dim=8, num_codes=16)
+    z = torch.randn(20, 8)
+    alpha = torch.softmax(torch.randn(20, 16), dim=-1)
+    alpha[:, 0] = 0.0
+    layer.ema_usage[0] = 0.0
+
+    layer.update_codebook_ema(z, alpha, reinit_dead_codes=True)
+
+    distances = ((z - layer.codebook.data[0]) ** 2).sum(dim=-1)
+    assert distances.min() < 1e-10
+
+
+def test_scq_layer_quantize_topk():
+    """후보 수가 K이면 top-k 희소 양자화가 전체 풀이와 일치하는지 테스트"""
+    torch.manual_seed(0)
+    layer = SCQLayer(codebook_dim=8, num_codes=16, num_iters=500, tol=1e-10)
+    z = torch.randn(2, 3, 3, 8)
+
+    with torch.no_grad():
+        z_q, alpha, _ = layer(z)
+        z_q_sparse, indices, weights = layer.quantize_topk(z, num_candidates=16)
+
+    assert indices.shape == (2, 3, 3, 16)
+    assert weights.shape == (2, 3, 3, 16)
+    assert torch.allclose(z_q_sparse, z_q, atol=1e-4)
+    assert torch.allclose(layer.sparse_to_dense(indices, weights), alpha, atol=1e-4)
+
+    _, indices, weights = layer.quantize_topk(z, num_candidates=4)
+    assert indices.shape == (2, 3, 3, 4)
+    assert torch.allclose(weights.sum(dim=-1), torch.ones(2, 3, 3), atol=1e-5)
+
+
+def test_scq_layer_tiled_matches_untiled():
+    """타일 단위 양자화가 전체 한 번에 처리한 결과와 일치하는지 테스트"""
+    torch.manual_seed(0)
+    full = SCQLayer(codebook_dim=8, num_codes=16)
+    tiled = SCQLayer(codebook_dim=8, num_codes=16, max_rows=5)
+    tiled.load_state_dict(full.state_dict())
+
+    z = torch.randn(2, 3, 3, 8)
+    z_full = z.clone().requires_grad_()
+    z_tiled = z.clone().requires_grad_()
+
+    z_q_full, alpha_full, _ = full(z_full)
+    z_q_tiled, alpha_tiled, _ = tiled(z_tiled)
+    assert torch.allclose(alpha_tiled, alpha_full, atol=1e-6)
+    assert torch.allclose(z_q_tiled, z_q_full, atol=1e-6)
+
+    z_q_full.pow(2).sum().backward()
+    z_q_tiled.pow(2).sum().backward()
+    assert torch.allclose(z_tiled.grad, z_full.grad, atol=1e-5)
+    assert torch.allclose(tiled.codebook.grad, full.codebook.grad, atol=1e-5)
+
+    with torch.no_grad():
+        z_q_sparse, indices, _ = tiled.quantize_topk(z, num_candidates=4)
+        z_q_ref, indices_ref, _ = full.quantize_topk(z, num_candidates=4)
+    assert torch.equal(indices, indices_ref)
+    assert torch.allclose(z_q_sparse, z_q_ref, atol=1e-6)
@@ -0,0 +1,139 @@
+"""
+SCQ 공용 학습 루프 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from torch.utils.data import DataLoader
+
+from app.scq import SCQAutoencoder
+from app.scq.trainer import AsyncCheckpointWriter, SCQTrainer, train_scq
+from experiments.nav_ar.train_scq_nav import SimpleImageDataset
+
+
+def _make_loader():
+    images = torch.randn(8, 3, 32, 32)
+    return DataLoader(SimpleImageDataset(images), batch_size=4)
+
+
+def test_train_scq_single_process(tmp_path):
+    """단일 프로세스 학습 및 체크포인트 저장 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    codebook = model.scq_layer.codebook.detach().clone()
+
+    train_scq(
+        model, _make_loader(), num_epochs=1,
+        device=torch.device("cpu"), save_dir=tmp_path,
+        checkpoint_prefix="scq_test", ema_decay=0.99
+    )
+
+    assert (tmp_path / "scq_test_epoch_1.pth").exists()
+    assert not torch.equal(model.scq_layer.codebook.detach(), codebook)
+
+
+@pytest.mark.slow
+def test_train_scq_distributed(tmp_path):
+    """gloo DDP 2 워커 학습 후 rank 0 가중치가 부모 모델로 복원되는지 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    codebook = model.scq_layer.codebook.detach().clone()
+
+    train_scq(
+        model, _make_loader(), num_epochs=1,
+        save_dir=tmp_path, checkpoint_prefix="scq_ddp",
+        ema_decay=0.99, world_size=2
+    )
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["scq_ddp_epoch_1.pth", "scq_ddp_resume.pth"]
+    assert not torch.equal(model.scq_layer.codebook.detach(), codebook)
+
+
+def test_trainer_resume_restores_state(tmp_path):
+    """재개용 체크포인트에서 옵티마이저/스케줄러/스텝이 복원되는지 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    scheduler_fn = lambda opt: torch.optim.lr_scheduler.StepLR(opt, step_size=1, gamma=0.5)
+
+    train_scq(
+        model, _make_loader(), num_epochs=1,
+        device=torch.device("cpu"), save_dir=tmp_path,
+        checkpoint_prefix="scq_resume", scheduler_fn=scheduler_fn
+    )
+    state = torch.load(tmp_path / "scq_resume_resume.pth", weights_only=False)
+    assert state['epoch'] == 1
+    assert state['global_step'] == 2
+    assert state['scheduler']['last_epoch'] == 2
+
+    resumed = SCQAutoencoder(latent_dim=16, num_codes=32)
+    trainer = SCQTrainer(
+        resumed, _make_loader(), device=torch.device("cpu"),
+        save_dir=tmp_path, checkpoint_prefix="scq_resume", scheduler_fn=scheduler_fn
+    )
+    assert trainer.resume()
+    assert trainer.global_step == 2
+    assert trainer.optimizer.param_groups[0]['lr'] == pytest.approx(1e-4 * 0.25)
+    for key, value in model.state_dict().items():
+        assert torch.equal(resumed.state_dict()[key], value)
+
+    # 이미 끝난 에폭은 건너뛰고 남은 에폭만 학습
+    trainer.fit(2)
+    assert trainer.epoch == 2
+    assert trainer.global_step == 4
+    assert (tmp_path / "scq_resume_epoch_2.pth").exists()
+    assert not any(p.name.endswith(".tmp") for p in tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("device", [
+    "cpu",
+    pytest.param("cuda", marks=pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA 필요"))
+])
+def test_trainer_resume_restores_rng(tmp_path, device):
+    """재개 시 CPU/CUDA RNG 상태가 저장 시점으로 복원되는지 테스트 (cuda는 map_location=cuda로 로드)"""
+    device = torch.device(device)
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    train_scq(
+        model, _make_loader(), num_epochs=1,
+        device=device, save_dir=tmp_path, checkpoint_prefix="scq_rng"
+    )
+    expected = torch.rand(4)
+    expected_cuda = torch.rand(4, device=device) if device.type == "cuda" else None
+
+    trainer = SCQTrainer(
+        SCQAutoencoder(latent_dim=16, num_codes=32), _make_loader(), device=device,
+        save_dir=tmp_path, checkpoint_prefix="scq_rng"
+    )
+    assert trainer.resume()
+    assert torch.equal(torch.rand(4), expected)
+    if expected_cuda is not None:
+        assert torch.equal(torch.rand(4, device=device), expected_cuda)
+
+
+def test_trainer_accumulation_bf16(tmp_path):
+    """gradient accumulation과 bf16 autocast 학습 테스트"""
+    torch.manual_seed(0)
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    trainer = SCQTrainer(
+        model, _make_loader(), device=torch.device("cpu"),
+        accumulation_steps=2, use_bf16=True, ema_decay=0.99
+    )
+    trainer.fit(1)
+
+    # 배치 2개 → 옵티마이저 스텝 1회
+    assert trainer.global_step == 1
+    assert model.scq_layer.codebook.dtype == torch.float32
+    assert all(torch.isfinite(p).all() for p in model.parameters())
+
+
+def test_async_checkpoint_writer_atomic(tmp_path):
+    """비동기 저장 후 파일이 원자적으로 교체되는지 테스트"""
+    writer = AsyncCheckpointWriter()
+    tensor = torch.ones(3)
+    writer.save({'value': tensor}, tmp_path / "ckpt.pth")
+    tensor.add_(1)  # 저장 요청 이후의 변경은 반영되지 않아야 함
+    writer.close()
+
+    assert torch.equal(torch.load(tmp_path / "ckpt.pth")['value'], torch.ones(3))
+    assert [p.name for p in tmp_path.iterdir()] == ["ckpt.pth"]
@@ -0,0 +1,122 @@
+"""
+SCQ 유틸리티 테스트
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.scq import SCQAutoencoder
+from app.scq.utils import (
+    ImageQualityMeter,
+    compute_psnr,
+    evaluate_reconstruction,
+    gaussian_window,
+    initialize_codebook_streaming,
+    iter_latent_batches,
+    psnr_per_image,
+    ssim_per_image
+)
+
+
+def test_initialize_codebook_streaming_recovers_clusters():
+    """스트리밍 k-means가 잘 분리된 클러스터 중심을 찾는지 테스트"""
+    torch.manual_seed(0)
+    centers = torch.randn(8, 4) * 10
+    data = centers[torch.randint(8, (4000,))] + 0.05 * torch.randn(4000, 4)
+
+    codebook = initialize_codebook_streaming(
+        iter(data.split(256)), num_codes=8, reservoir_size=500
+    )
+
+    assert codebook.shape == (8, 4)
+    # 모든 실제 중심 근처에 코드가 하나씩 존재
+    assert torch.cdist(centers, codebook).min(dim=-1).values.max() < 0.5
+
+
+def test_initialize_codebook_streaming_keeps_seed_weight():
+    """시딩 전 샘플이 이후 mini-batch 업데이트에서도 가중치를 유지하는지 테스트 (스트림 평균과 일치)"""
+    torch.manual_seed(0)
+    data = torch.cat([torch.randn(1000, 2), torch.randn(10, 2) + 10])
+
+    codebook = initialize_codebook_streaming(
+        iter(data.split([1000, 10])), num_codes=1, reservoir_size=1000
+    )
+    assert torch.allclose(codebook[0], data.mean(dim=0), atol=1e-4)
+
+
+def test_initialize_codebook_streaming_from_model():
+    """SCQAutoencoder.encode 잠재 벡터 스트림으로 초기화"""
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    loader = [torch.randn(4, 3, 32, 32) for _ in range(3)]
+
+    codebook = initialize_codebook_streaming(
+        lambda: iter_latent_batches(model, loader),
+        num_codes=8, reservoir_size=16, num_passes=2
+    )
+    assert codebook.shape == (8, 16)
+
+    with pytest.raises(ValueError):
+        initialize_codebook_streaming(iter(loader), num_codes=8, num_passes=2)
+
+
+def _reference_ssim(img1, img2, window_size=11, sigma=1.5):
+    """2차원 가우시안 윈도우를 직접 적용한 참조 SSIM (이미지별)"""
+    C = img1.shape[1]
+    g = gaussian_window(window_size, sigma, dtype=torch.float64)
+    window = torch.outer(g, g).expand(C, 1, window_size, window_size)
+    filt = lambda t: torch.nn.functional.conv2d(t, window, groups=C)
+    mu1, mu2 = filt(img1), filt(img2)
+    s11 = filt(img1 * img1) - mu1 ** 2
+    s22 = filt(img2 * img2) - mu2 ** 2
+    s12 = filt(img1 * img2) - mu1 * mu2
+    C1, C2 = 0.01 ** 2, 0.03 ** 2
+    ssim_map = ((2 * mu1 * mu2 + C1) * (2 * s12 + C2)) / ((mu1 ** 2 + mu2 ** 2 + C1) * (s11 + s22 + C2))
+    return ssim_map.flatten(1).mean(dim=1)
+
+
+def test_ssim_per_image_matches_reference():
+    """분리형 depthwise SSIM이 2차원 윈도우 참조 구현과 일치하는지 테스트"""
+    torch.manual_seed(0)
+    img1 = torch.rand(4, 3, 24, 24, dtype=torch.float64)
+    img2 = (img1 + 0.1 * torch.randn_like(img1)).clamp(0, 1)
+
+    ssim = ssim_per_image(img1, img2)
+    assert ssim.shape == (4,)
+    assert torch.allclose(ssim.double(), _reference_ssim(img1, img2), atol=1e-5)
+    assert torch.allclose(ssim_per_image(img1, img1), torch.ones(4), atol=1e-5)
+
+
+def test_psnr_per_image():
+    """이미지별 PSNR이 배치 내 다른 이미지의 영향을 받지 않는지 테스트"""
+    img = torch.full((2, 3, 8, 8), 0.5)
+    noisy = img.clone()
+    noisy[0] += 0.1  # MSE 0.01 -> 20 dB
+    noisy[1] += 0.01  # MSE 1e-4 -> 40 dB
+
+    assert torch.allclose(psnr_per_image(noisy, img), torch.tensor([20.0, 40.0]), atol=1e-3)
+
+    # compute_psnr는 배치 전체 MSE 기준: (0.01 + 1e-4) / 2 -> 약 22.97 dB
+    assert compute_psnr(noisy, img) == pytest.approx(22.967, abs=1e-2)
+    assert compute_psnr(img, img) == float('inf')
+
+
+def test_image_quality_meter_streaming():
+    """스트리밍 누적 평균이 전체 배치 계산과 일치하는지 테스트"""
+    torch.manual_seed(0)
+    img1 = torch.rand(6, 3, 16, 16)
+    img2 = (img1 + 0.05 * torch.randn_like(img1)).clamp(0, 1)
+
+    meter = ImageQualityMeter(keep_per_image=True)
+    for a, b in zip(img1.split(4), img2.split(4)):
+        meter.update(a, b)
+    result = meter.compute()
+
+    assert result['num_images'] == 6
+    assert result['psnr'] == pytest.approx(psnr_per_image(img1, img2).mean().item(), rel=1e-5)
+    assert result['ssim'] == pytest.approx(ssim_per_image(img1, img2).mean().item(), rel=1e-5)
+    assert torch.allclose(result['ssim_per_image'], ssim_per_image(img1, img2))
+
+    model = SCQAutoencoder(latent_dim=16, num_codes=32)
+    report = evaluate_reconstruction(model, img1.split(3), window_size=7)
+    assert report['num_images'] == 6
+    assert model.training
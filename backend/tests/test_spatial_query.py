@@ -0,0 +1,92 @@
+"""
+반경 검색 공간 쿼리 테스트 (SQLite는 bbox 경로, PostGIS는 컴파일된 SQL 확인)
+"""
+import math
+from decimal import Decimal
+from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app import models
+from app.services.spatial_query import METERS_PER_DEGREE, bounding_box, nearby
+
+
+def _offset(lat, lng, north_m, east_m):
+    """(lat, lng)에서 북쪽/동쪽으로 미터만큼 이동한 좌표"""
+    return (
+        lat + north_m / METERS_PER_DEGREE,
+        lng + east_m / (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+    )
+
+
+def test_bounding_box_contains_radius():
+    """경계 상자가 반경 원을 감싸는지 테스트"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(37.5, 127.0, 1000)
+    assert min_lat < _offset(37.5, 127.0, -1000, 0)[0] + 1e-9
+    assert max_lng > _offset(37.5, 127.0, 0, 999)[1]
+    assert bounding_box(89.9999, 0.0, 1000)[2:] == (-180.0, 180.0)
+
+
+def test_postgis_query_uses_dwithin_and_knn():
+    """PostGIS 경로가 ST_DWithin 필터와 <-> 정렬을 만드는지 테스트"""
+    spatial = nearby(models.Building.latitude, models.Building.longitude, 37.5, 127.0, 500, postgis=True)
+    sql = str(
+        select(models.Building).filter(*spatial.where).order_by(spatial.distance)
+        .compile(dialect=postgresql.dialect())
+    )
+    assert "ST_DWithin(geography(ST_SetSRID(ST_MakePoint(CAST(buildings.longitude AS FLOAT)" in sql
+    assert "ORDER BY geography(ST_SetSRID(ST_MakePoint(CAST(buildings.longitude AS FLOAT)" in sql
+    assert "<->" in sql
+
+
+def test_get_buildings_nearby_paginated(client, db_session):
+    """반경 내 건물만 가까운 순으로 DB에서 페이지네이션되는지 테스트"""
+    for name, north in [("b300", 300), ("b100", 100), ("b980", 980), ("b1020", 1020)]:
+        lat, lng = _offset(37.5, 127.0, north, 0)
+        db_session.add(models.Building(
+            id=uuid4(), name=name, latitude=Decimal(f"{lat:.8f}"), longitude=Decimal(f"{lng:.8f}")
+        ))
+    # 경계 상자 모서리 (대각선 거리 약 1131m) 는 원 밖
+    lat, lng = _offset(37.5, 127.0, 800, 800)
+    db_session.add(models.Building(id=uuid4(), name="corner", latitude=Decimal(f"{lat:.8f}"), longitude=Decimal(f"{lng:.8f}")))
+    db_session.commit()
+
+    params = {"lat": 37.5, "lng": 127.0, "radius": 1000}
+    response = client.get("/api/v1/buildings/", params=params)
+    assert response.status_code == 200
+    assert [b["name"] for b in response.json()] == ["b100", "b300", "b980"]
+
+    response = client.get("/api/v1/buildings/", params={**params, "skip": 1, "limit": 1})
+    assert [b["name"] for b in response.json()] == ["b300"]
+
+
+def test_get_nearby_indoor_pois_sorted(client, db_session):
+    """실내 POI 근처 검색이 반경 필터와 거리 정렬을 DB에서 하는지 테스트"""
+    indoor_map_id = uuid4()
+    for name, x, y in [("far", 30, 0), ("near", 3, 4), ("outside", 40, 40)]:
+        db_session.add(models.POI(
+            id=uuid4(), name=name, poi_type="store", indoor_map_id=indoor_map_id,
+            position_x=Decimal(x), position_y=Decimal(y), floor=1
+        ))
+    db_session.commit()
+
+    response = client.get(
+        f"/api/v1/pois/indoor/{indoor_map_id}/nearby", params={"x": 0, "y": 0, "radius": 50}
+    )
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == ["near", "far"]
+
+
+def test_get_destinations_nearby(client, db_session, test_user_id):
+    """근처 목적지 검색 테스트"""
+    for name, north in [("먼 곳", 4000), ("가까운 곳", 200), ("범위 밖", 6000)]:
+        lat, lng = _offset(37.5, 127.0, north, 0)
+        db_session.add(models.Destination(
+            id=uuid4(), name=name, latitude=Decimal(f"{lat:.8f}"), longitude=Decimal(f"{lng:.8f}"),
+            created_by=test_user_id
+        ))
+    db_session.commit()
+
+    response = client.get("/api/v1/destinations/", params={"lat": 37.5, "lng": 127.0})
+    assert response.status_code == 200
+    assert [d["name"] for d in response.json()] == ["가까운 곳", "먼 곳"]
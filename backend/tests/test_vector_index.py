@@ -0,0 +1,184 @@
+"""
+특징 벡터 검색 인덱스 테스트
+"""
+import numpy as np
+import pytest
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.poi import POI
+from app.services.vector_index import (
+    FeatureIndexSync,
+    VectorIndex,
+    build_feature_index,
+    extract_feature_vector,
+    kmeans,
+    set_feature_index,
+    warm_feature_indexes
+)
+
+
+def _random_index(n=500, dim=16, metric="cosine", seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    index = VectorIndex(dim, metric=metric, capacity=8)
+    index.upsert([f"id{i}" for i in range(n)], vectors)
+    return index, vectors
+
+
+@pytest.mark.parametrize("metric", ["cosine", "l2"])
+def test_flat_search_matches_brute_force(metric):
+    """Flat 검색이 전수 계산과 일치하는지 테스트"""
+    index, vectors = _random_index(metric=metric)
+    query = np.random.default_rng(1).standard_normal(16).astype(np.float32)
+
+    if metric == "cosine":
+        normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = normed @ (query / np.linalg.norm(query))
+    else:
+        scores = -((vectors - query) ** 2).sum(axis=1)
+    expected = [f"id{i}" for i in np.argsort(-scores)[:5]]
+
+    result = index.search(query, k=5)[0]
+    assert result.ids == expected
+    assert np.allclose(result.scores, np.sort(scores)[::-1][:5], atol=1e-4)
+
+
+def test_ivf_and_pq_search():
+    """IVF(전체 probe)는 Flat과 같고, PQ 재정렬은 높은 recall을 유지하는지 테스트"""
+    index, vectors = _random_index()
+    queries = np.random.default_rng(2).standard_normal((20, 16)).astype(np.float32)
+    flat = index.search(queries, k=10)
+
+    # SCQ 코드북 대신 k-means 중심을 coarse quantizer로 사용
+    index.set_coarse_quantizer(kmeans(vectors, 16), nprobe=16)
+    ivf = index.search(queries, k=10)
+    assert [r.ids for r in ivf] == [r.ids for r in flat]
+
+    index.train_pq(num_subspaces=4)
+    pq = index.search(queries, k=10, rerank=10)
+    recall = np.mean([len(set(a.ids) & set(b.ids)) / 10 for a, b in zip(pq, flat)])
+    assert recall > 0.8
+
+    # 일부 리스트만 탐색해도 결과가 나옴
+    assert len(index.search(queries[0], k=10, nprobe=2)[0].ids) > 0
+
+
+def test_incremental_update_and_mmap_roundtrip(tmp_path):
+    """upsert/remove 증분 갱신과 메모리 맵 저장/로드 테스트"""
+    index, vectors = _random_index(n=50)
+    index.set_coarse_quantizer(kmeans(vectors, 4), nprobe=4)
+    index.train_pq(num_subspaces=4)
+
+    assert index.remove(["id3", "missing"]) == 1
+    assert "id3" not in index and len(index) == 49
+    index.upsert(["id10"], -vectors[10])
+    assert index.search(-vectors[10], k=1)[0].ids == ["id10"]
+
+    index.save(tmp_path / "poi")
+    loaded = VectorIndex.load(tmp_path / "poi")
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.ids == index.ids
+    assert loaded.search(vectors[20], k=3)[0].ids == index.search(vectors[20], k=3)[0].ids
+
+    # 로드 후에도 증분 갱신 가능 (원본 파일은 변경되지 않음)
+    loaded.upsert(["new"], vectors[0] + 100)
+    assert "new" in loaded
+    assert "new" not in VectorIndex.load(tmp_path / "poi")
+
+
+def test_extract_feature_vector():
+    """features JSONB 형식별 벡터 추출 테스트"""
+    assert extract_feature_vector([1, 2]).tolist() == [1.0, 2.0]
+    assert extract_feature_vector({"embedding": [0.5]}).tolist() == [0.5]
+    assert extract_feature_vector({"color": "red"}) is None
+    assert extract_feature_vector([[1, 2]]) is None
+    assert extract_feature_vector(None) is None
+
+
+def _poi(features, **kwargs):
+    return POI(
+        id=uuid4(), name="POI", poi_type="store",
+        latitude=Decimal("37.5"), longitude=Decimal("127.0"),
+        features=features, **kwargs
+    )
+
+
+def test_build_index_and_sync_with_orm(db_session):
+    """DB features로 인덱스를 만들고 커밋된 변경만 증분 반영되는지 테스트"""
+    pois = [_poi({"vector": [1.0, 0.0, 0.0]}), _poi({"vector": [0.0, 1.0, 0.0]}), _poi(None)]
+    db_session.add_all(pois)
+    db_session.commit()
+
+    index = build_feature_index(db_session, POI)
+    assert index.dim == 3 and len(index) == 2
+
+    sync = FeatureIndexSync(index, POI)
+    try:
+        new_poi = _poi({"vector": [0.0, 0.0, 1.0]})
+        db_session.add(new_poi)
+        db_session.flush()
+        db_session.rollback()
+        assert len(index) == 2
+
+        db_session.add(new_poi)
+        db_session.commit()
+        assert index.search([0.0, 0.1, 1.0], k=1)[0].ids == [str(new_poi.id)]
+
+        pois[0].is_active = False
+        db_session.commit()
+        assert str(pois[0].id) not in index
+
+        db_session.delete(new_poi)
+        db_session.commit()
+        assert len(index) == 1
+    finally:
+        sync.close()
+
+
+def test_warm_rebuilds_stale_saved_index(db_session, tmp_path, monkeypatch):
+    """저장된 인덱스가 DB와 다르면(재시작 전/다른 워커의 변경) 다시 생성하는지 테스트"""
+    import app.services.vector_index as vector_index
+
+    monkeypatch.setattr(vector_index, "FeatureIndexSync", lambda index, model: None)
+    session_factory = lambda: type(db_session)(bind=db_session.get_bind())
+
+    first = _poi({"vector": [1.0, 0.0, 0.0]})
+    db_session.add(first)
+    db_session.commit()
+    try:
+        index = warm_feature_indexes(session_factory, {"poi": POI}, index_dir=tmp_path)["poi"]
+        assert index.ids == [str(first.id)] and index.source["count"] == 1
+
+        # 변경이 없으면 저장된 인덱스를 메모리 맵으로 로드
+        index = warm_feature_indexes(session_factory, {"poi": POI}, index_dir=tmp_path)["poi"]
+        assert isinstance(index.vectors, np.memmap)
+
+        second = _poi({"vector": [0.0, 1.0, 0.0]})
+        db_session.add(second)
+        db_session.commit()
+        index = warm_feature_indexes(session_factory, {"poi": POI}, index_dir=tmp_path)["poi"]
+        assert sorted(index.ids) == sorted([str(first.id), str(second.id)])
+        assert VectorIndex.load(tmp_path / "poi").source == index.source
+    finally:
+        set_feature_index("poi", None)
+
+
+def test_unit4_poi_recognition_uses_visual_index(client):
+    """카메라 특징 벡터와 가장 유사한 POI가 우선순위 상위로 오는지 테스트"""
+    index = VectorIndex(3)
+    index.upsert(["a", "b"], np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32))
+    set_feature_index("poi", index)
+    try:
+        response = client.post("/api/v1/scq/unit4/poi-recognition", json={
+            "camera_frame": {"features": [0.0, 1.0, 0.0]},
+            "poi_database": [
+                {"id": "a", "name": "A", "type": "store", "position": {}, "priority": 0.5},
+                {"id": "b", "name": "B", "type": "store", "position": {}, "priority": 0.5}
+            ],
+            "top_k": 2
+        })
+        assert response.status_code == 200
+        assert response.json()["top_pois"][0]["id"] == "b"
+    finally:
+        set_feature_index("poi", None)
@@ -0,0 +1,34 @@
+-- 근처 검색(POI/건물/목적지)용 공간 인덱스 생성 SQL
+-- Supabase Dashboard > SQL Editor에서 실행하세요 (CREATE_TABLES.sql, CREATE_SCQ_TABLES.sql 이후)
+--
+-- PostGIS가 설치되면 API가 자동으로 ST_DWithin 반경 필터와 <-> KNN 정렬을 사용합니다 (SPATIAL_BACKEND=auto).
+-- 인덱스 식은 app/services/spatial_query.py의 geography_point()와 같아야 사용됩니다.
+
+-- 경계 상자 검색용 B-tree 인덱스 (PostGIS가 없을 때 사용)
+CREATE INDEX IF NOT EXISTS idx_destinations_location ON destinations(latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_buildings_location ON buildings(latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_pois_location ON pois(latitude, longitude);
+
+-- PostGIS (Supabase: Database > Extensions에서 postgis 활성화와 동일)
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+-- geography 식 GiST 인덱스
+CREATE INDEX IF NOT EXISTS idx_pois_geog ON pois USING GIST (
+    geography(ST_SetSRID(ST_MakePoint(CAST(longitude AS FLOAT), CAST(latitude AS FLOAT)), 4326))
+);
+CREATE INDEX IF NOT EXISTS idx_buildings_geog ON buildings USING GIST (
+    geography(ST_SetSRID(ST_MakePoint(CAST(longitude AS FLOAT), CAST(latitude AS FLOAT)), 4326))
+);
+CREATE INDEX IF NOT EXISTS idx_destinations_geog ON destinations USING GIST (
+    geography(ST_SetSRID(ST_MakePoint(CAST(longitude AS FLOAT), CAST(latitude AS FLOAT)), 4326))
+);
+
+ANALYZE pois;
+ANALYZE buildings;
+ANALYZE destinations;
+
+-- 완료 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '공간 인덱스가 성공적으로 생성되었습니다!';
+END $$;